@@ -0,0 +1,102 @@
+"""
+Micro-benchmark: table rendering in format_table_output versus the previous
+DataFrame.to_markdown / to_csv / to_dict(orient="records") path.
+
+Run from the repository root:
+
+    python benchmarks/bench_formatting.py [--repeat 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.formatting.markdown_formatter import format_table_output  # noqa: E402
+
+SIZES = [250, 2500, 25000]
+FORMATS = ["markdown", "csv", "json", "json_compact"]
+
+
+def make_kline_frame(rows: int, seed: int = 7) -> pd.DataFrame:
+    """Daily bars with the dtypes Baostock results get after typed ingest."""
+    rng = np.random.default_rng(seed)
+    close = 10 * np.cumprod(1 + rng.normal(0, 0.02, rows))
+    return pd.DataFrame({
+        "date": pd.bdate_range("2000-01-03", periods=rows),
+        "code": "sh.600000",
+        "open": np.round(close * (1 + rng.normal(0, 0.005, rows)), 2),
+        "high": np.round(close * 1.01, 2),
+        "low": np.round(close * 0.99, 2),
+        "close": np.round(close, 2),
+        "volume": rng.integers(1_000_000, 50_000_000, rows),
+        "amount": np.round(close * rng.integers(1_000_000, 50_000_000, rows), 4),
+        "adjustflag": pd.Categorical(["3"] * rows),
+        "turn": np.round(rng.uniform(0.1, 3, rows), 6),
+        "tradestatus": pd.Categorical(["1"] * rows),
+        "pctChg": np.round(rng.normal(0, 2, rows), 6),
+        "peTTM": np.where(rng.random(rows) < 0.05, np.nan, np.round(rng.uniform(5, 30, rows), 6)),
+        "isST": pd.Categorical(["0"] * rows),
+    })
+
+
+# --- Previous implementation, kept here as the baseline ---
+
+def _legacy_display_frame(df: pd.DataFrame) -> pd.DataFrame:
+    display = df.copy()
+    for col in display.columns:
+        series = display[col]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            has_time = (series.dropna() != series.dropna().dt.normalize()).any()
+            display[col] = series.dt.strftime("%Y-%m-%d %H:%M:%S" if has_time else "%Y-%m-%d")
+    display = display.astype(object)
+    return display.where(display.notna(), None)
+
+
+def legacy_format(df: pd.DataFrame, fmt: str) -> str:
+    if fmt == "markdown":
+        return _legacy_display_frame(df).to_markdown(index=False)
+    if fmt == "csv":
+        return _legacy_display_frame(df).to_csv(index=False)
+    if fmt == "json":
+        return json.dumps({"data": _legacy_display_frame(df).to_dict(orient="records")}, ensure_ascii=False)
+    return None
+
+
+def _median_ms(fn, repeat: int) -> float:
+    fn()  # warm-up
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case (median is reported)")
+    args = parser.parse_args()
+
+    print(f"{'rows':>6}  {'format':<13}{'before ms':>10}{'after ms':>10}{'speedup':>9}{'after bytes':>13}")
+    for rows in SIZES:
+        df = make_kline_frame(rows)
+        for fmt in FORMATS:
+            after = _median_ms(lambda: format_table_output(df, format=fmt, max_rows=rows), args.repeat)
+            size = len(format_table_output(df, format=fmt, max_rows=rows).encode("utf-8"))
+            if legacy_format(df.head(1), fmt) is None:
+                before_text, speedup = "-", "-"
+            else:
+                before = _median_ms(lambda: legacy_format(df, fmt), args.repeat)
+                before_text, speedup = f"{before:.1f}", f"{before / after:.1f}x"
+            print(f"{rows:>6}  {fmt:<13}{before_text:>10}{after:>10.1f}{speedup:>9}{size:>13}")
+
+
+if __name__ == "__main__":
+    main()
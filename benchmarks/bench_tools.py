@@ -0,0 +1,311 @@
+"""
+End-to-end benchmark of every MCP tool, with a JSON baseline and regression check.
+
+benchmarks/fake_baostock.py is started in a subprocess (deterministic data,
+no network), the server is pointed at it, and every tool registered by the
+register_*_tools functions is called in process through FastMCP.call_tool,
+exactly as the stdio transport would dispatch it. Per case it records
+p50/p95/p99 latency, the bytes returned, error replies and the peak RSS of
+the process.
+
+Under pytest (the run fails when a case regresses past the threshold):
+
+    python -m pytest benchmarks/bench_tools.py
+
+or as a script, which also prints the table:
+
+    python benchmarks/bench_tools.py [--update-baseline] [--threshold 25]
+
+Pytest takes its settings from A_SHARE_MCP_BENCH_BASELINE (baseline file),
+A_SHARE_MCP_BENCH_THRESHOLD (percent), A_SHARE_MCP_BENCH_ITERATIONS and
+A_SHARE_MCP_BENCH_UPDATE=1. Without a baseline file the run fails (there is
+nothing to compare against) unless it is asked to write one with
+--update-baseline / A_SHARE_MCP_BENCH_UPDATE=1; benchmarks/results/ is not
+versioned, since timings only compare on the same machine. Latency only counts as a regression when it is also more than
+--min-delta-ms slower, so sub-millisecond tools don't fail on noise.
+
+The response and snapshot caches are off by default so every call reaches
+the data source; other A_SHARE_MCP_* variables apply as usual, and the
+K-line cache lives in a throwaway directory.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from src.baostock_session import get_default_session_manager  # noqa: E402
+from src.config import ServerSettings  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "results", "tools_baseline.json")
+DEFAULT_THRESHOLD_PCT = 25.0
+DEFAULT_MIN_DELTA_MS = 5.0
+DEFAULT_ITERATIONS = 15
+
+CODE = "sh.600000"
+
+# One case per tool (plus a few variants); "name" defaults to the tool name.
+# Every registered tool must appear here, so new tools can't slip past the benchmark.
+CASES: List[dict] = [
+    {"tool": "get_historical_k_data",
+     "args": {"code": CODE, "start_date": "2024-01-01", "end_date": "2024-12-31"}},
+    {"name": "get_historical_k_data[5m,json]", "tool": "get_historical_k_data",
+     "args": {"code": CODE, "start_date": "2024-06-03", "end_date": "2024-06-28", "frequency": "5",
+              "limit": 1000, "format": "json"}},
+    {"tool": "get_historical_k_data_batch",
+     "args": {"codes": ["sh.600000", "sz.000001", "sh.600001", "sz.000002"],
+              "start_date": "2024-01-01", "end_date": "2024-03-31", "view": "summary"}},
+    {"tool": "get_stock_basic_info", "args": {"code": CODE}},
+    {"tool": "get_dividend_data", "args": {"code": CODE, "year": "2023"}},
+    {"tool": "get_adjust_factor_data", "args": {"code": CODE, "start_date": "2015-01-01", "end_date": "2024-12-31"}},
+    {"tool": "get_profit_data", "args": {"code": CODE, "year": "2024", "quarter": 2}},
+    {"tool": "get_operation_data", "args": {"code": CODE, "year": "2024", "quarter": 2}},
+    {"tool": "get_growth_data", "args": {"code": CODE, "year": "2024", "quarter": 2}},
+    {"tool": "get_balance_data", "args": {"code": CODE, "year": "2024", "quarter": 2}},
+    {"tool": "get_cash_flow_data", "args": {"code": CODE, "year": "2024", "quarter": 2}},
+    {"tool": "get_dupont_data", "args": {"code": CODE, "year": "2024", "quarter": 2}},
+    {"tool": "get_performance_express_report",
+     "args": {"code": CODE, "start_date": "2020-01-01", "end_date": "2024-12-31"}},
+    {"tool": "get_forecast_report", "args": {"code": CODE, "start_date": "2020-01-01", "end_date": "2024-12-31"}},
+    {"tool": "get_fina_indicator", "args": {"code": CODE, "start_date": "2023-01-01", "end_date": "2024-06-30"}},
+    {"tool": "get_stock_industry", "args": {"code": CODE, "date": "2024-06-28"}},
+    {"tool": "get_sz50_stocks", "args": {"date": "2024-06-28"}},
+    {"tool": "get_hs300_stocks", "args": {"date": "2024-06-28"}},
+    {"tool": "get_zz500_stocks", "args": {"date": "2024-06-28"}},
+    {"tool": "get_index_constituents", "args": {"index": "hs300", "date": "2024-06-28", "limit": 300}},
+    {"tool": "list_industries", "args": {"date": "2024-06-28"}},
+    {"tool": "get_industry_members", "args": {"industry": "J66货币金融服务", "date": "2024-06-28"}},
+    {"tool": "get_trade_dates", "args": {"start_date": "2024-01-01", "end_date": "2024-12-31"}},
+    {"tool": "get_all_stock", "args": {"date": "2024-06-28", "limit": 1000}},
+    {"tool": "search_stocks", "args": {"keyword": "样本沪00", "date": "2024-06-28"}},
+    {"tool": "get_suspensions", "args": {"date": "2024-06-28"}},
+    {"tool": "get_deposit_rate_data", "args": {"start_date": "2010-01-01", "end_date": "2024-12-31"}},
+    {"tool": "get_loan_rate_data", "args": {"start_date": "2010-01-01", "end_date": "2024-12-31"}},
+    {"tool": "get_required_reserve_ratio_data", "args": {"start_date": "2010-01-01", "end_date": "2024-12-31"}},
+    {"tool": "get_money_supply_data_month", "args": {"start_date": "2020-01", "end_date": "2024-12"}},
+    {"tool": "get_money_supply_data_year", "args": {"start_date": "2010", "end_date": "2024"}},
+    {"tool": "get_latest_trading_date", "args": {}},
+    {"tool": "get_market_analysis_timeframe", "args": {"period": "recent"}},
+    {"tool": "is_trading_day", "args": {"date": "2024-06-28"}},
+    {"tool": "previous_trading_day", "args": {"date": "2024-06-28"}},
+    {"tool": "next_trading_day", "args": {"date": "2024-06-28"}},
+    {"tool": "get_last_n_trading_days", "args": {"days": 20}},
+    {"tool": "get_recent_trading_range", "args": {"days": 20}},
+    {"tool": "get_month_end_trading_dates", "args": {"year": 2024}},
+    {"tool": "get_stock_analysis", "args": {"code": CODE, "analysis_type": "fundamental"}},
+    {"name": "get_stock_analysis[comprehensive]", "tool": "get_stock_analysis",
+     "args": {"code": CODE, "analysis_type": "comprehensive"}},
+    {"tool": "get_portfolio_analysis", "args": {"codes": [CODE, "sz.000001", "sh.600004", "sz.000002"]}},
+    {"name": "get_portfolio_analysis[industry]", "tool": "get_portfolio_analysis",
+     "args": {"industry": "J66货币金融服务", "analysis_type": "technical"}},
+    {"tool": "normalize_stock_code", "args": {"code": "600000"}},
+    {"tool": "normalize_index_code", "args": {"code": "hs300"}},
+    {"tool": "list_tool_constants", "args": {}},
+    {"tool": "get_kline_cache_status", "args": {}},
+    {"tool": "invalidate_kline_cache", "args": {"code": "sz.300999"}},
+    {"tool": "get_server_stats", "args": {}},
+]
+
+
+def case_name(case: dict) -> str:
+    return case.get("name", case["tool"])
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), math.ceil(q / 100 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def peak_rss_kb() -> Optional[int]:
+    """High-water mark of this process's resident set, in KiB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _report(line: str) -> None:
+    # mcp_server routes print() to the log; sys.stdout.buffer still reaches the terminal
+    sys.stdout.buffer.write((line + "\n").encode("utf-8"))
+    sys.stdout.buffer.flush()
+
+
+def start_fake_server(stocks: int, latency_ms: float) -> Tuple[subprocess.Popen, str]:
+    """Starts fake_baostock.py on a free port and returns the process and its "host:port"."""
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(BENCH_DIR, "fake_baostock.py"), "--port", "0",
+         "--stocks", str(stocks), "--latency-ms", str(latency_ms)],
+        stdout=subprocess.PIPE, text=True)
+    banner = process.stdout.readline()
+    # "Fake Baostock server on 127.0.0.1:40123 (...)"
+    if not banner.startswith("Fake Baostock server on "):
+        process.kill()
+        raise RuntimeError(f"fake_baostock.py did not start: {banner!r}")
+    return process, banner.split()[4]
+
+
+def load_server(server_address: str):
+    """Builds the mcp_server app configured for the benchmark."""
+    os.environ["A_SHARE_MCP_BAOSTOCK_SERVER"] = server_address
+    os.environ.setdefault("A_SHARE_MCP_RESPONSE_CACHE", "0")
+    os.environ.setdefault("A_SHARE_MCP_SNAPSHOT_CACHE_ENTRIES", "0")
+    os.environ.setdefault("A_SHARE_MCP_KLINE_CACHE_DIR", tempfile.mkdtemp(prefix="bench-kline-"))
+    import mcp_server
+    return mcp_server.create_server(ServerSettings.from_env())
+
+
+async def measure(app, cases: List[dict], iterations: int) -> Dict[str, dict]:
+    """Calls each case once to warm up, then `iterations` times in a row."""
+    registered = {tool.name for tool in await app.list_tools()}
+    covered = {case["tool"] for case in cases}
+    if registered - covered:
+        raise AssertionError(f"Tools without a benchmark case: {sorted(registered - covered)}")
+    if covered - registered:
+        raise AssertionError(f"Benchmark cases for unknown tools: {sorted(covered - registered)}")
+
+    results: Dict[str, dict] = {}
+    for case in cases:
+        await app.call_tool(case["tool"], case["args"])
+        rss_before = peak_rss_kb()
+        timings: List[float] = []
+        errors = 0
+        text = ""
+        for _ in range(iterations):
+            started = time.perf_counter()
+            reply = await app.call_tool(case["tool"], case["args"])
+            timings.append((time.perf_counter() - started) * 1000)
+            text = reply[0].text if reply else ""
+            errors += text.startswith("Error:")
+        rss_after = peak_rss_kb()
+        results[case_name(case)] = {
+            "calls": iterations,
+            "p50_ms": round(percentile(timings, 50), 3),
+            "p95_ms": round(percentile(timings, 95), 3),
+            "p99_ms": round(percentile(timings, 99), 3),
+            "bytes": len(text.encode("utf-8")),
+            "errors": errors,
+            "peak_rss_kb": rss_after,
+            "rss_growth_kb": rss_after - rss_before if rss_after is not None else None,
+        }
+    return results
+
+
+def compare(baseline: Dict[str, dict], results: Dict[str, dict],
+            threshold_pct: float, min_delta_ms: float) -> List[str]:
+    """Returns one line per case that got slower, bigger or started failing."""
+    regressions = []
+    limit = 1 + threshold_pct / 100
+    for name, current in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            if current[metric] > before[metric] * limit and current[metric] - before[metric] > min_delta_ms:
+                regressions.append(f"{name}: {metric} {before[metric]:.1f} -> {current[metric]:.1f}")
+        if current["bytes"] > before["bytes"] * limit:
+            regressions.append(f"{name}: bytes {before['bytes']} -> {current['bytes']}")
+        if current["errors"] / current["calls"] > before["errors"] / before["calls"]:
+            regressions.append(f"{name}: errors {before['errors']}/{before['calls']} -> "
+                               f"{current['errors']}/{current['calls']}")
+    return regressions
+
+
+def load_baseline(path: str) -> Optional[Dict[str, dict]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["tools"]
+
+
+def save_baseline(path: str, results: Dict[str, dict], iterations: int) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "iterations": iterations,
+            "tools": results,
+        }, f, ensure_ascii=False, indent=1, sort_keys=True)
+
+
+def run(baseline_path: str, threshold_pct: float, min_delta_ms: float, iterations: int,
+        update_baseline: bool, stocks: int = 5000, latency_ms: float = 0.0) -> List[str]:
+    """Benchmarks every tool, prints the table and returns the regressions against the baseline."""
+    process, address = start_fake_server(stocks, latency_ms)
+    try:
+        server = load_server(address)
+        results = asyncio.run(measure(server.app, CASES, iterations))
+    finally:
+        # Log out while the fake is still up; the baostock client spins on a closed socket
+        get_default_session_manager().close()
+        process.terminate()
+        process.wait()
+
+    baseline = load_baseline(baseline_path)
+    _report(f"{'case':<36}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'bytes':>10}{'errors':>8}"
+            f"{'peak RSS MB':>13}{'vs p95':>9}")
+    for name, r in results.items():
+        before = (baseline or {}).get(name)
+        change = f"{(r['p95_ms'] / before['p95_ms'] - 1) * 100:+.0f}%" if before and before["p95_ms"] else "-"
+        rss = f"{r['peak_rss_kb'] / 1024:.0f}" if r["peak_rss_kb"] is not None else "-"
+        _report(f"{name:<36}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['bytes']:>10}"
+                f"{r['errors']:>8}{rss:>13}{change:>9}")
+
+    regressions = compare(baseline, results, threshold_pct, min_delta_ms) if baseline else []
+    if update_baseline:
+        save_baseline(baseline_path, results, iterations)
+        _report(f"Baseline written to {baseline_path}")
+    elif baseline is None:
+        regressions.append(f"no baseline at {baseline_path}; record one with --update-baseline "
+                           f"(A_SHARE_MCP_BENCH_UPDATE=1 under pytest)")
+    for line in regressions:
+        _report(f"REGRESSION {line}")
+    return regressions
+
+
+def test_tool_benchmarks():
+    env = os.environ.get
+    regressions = run(
+        baseline_path=env("A_SHARE_MCP_BENCH_BASELINE", DEFAULT_BASELINE),
+        threshold_pct=float(env("A_SHARE_MCP_BENCH_THRESHOLD", DEFAULT_THRESHOLD_PCT)),
+        min_delta_ms=float(env("A_SHARE_MCP_BENCH_MIN_DELTA_MS", DEFAULT_MIN_DELTA_MS)),
+        iterations=int(env("A_SHARE_MCP_BENCH_ITERATIONS", DEFAULT_ITERATIONS)),
+        update_baseline=env("A_SHARE_MCP_BENCH_UPDATE", "") == "1",
+    )
+    assert not regressions, "Tool benchmark check failed:\n" + "\n".join(regressions)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD_PCT,
+                        help="allowed slowdown / growth in percent")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="latency changes below this never count as regressions")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS, help="timed calls per case")
+    parser.add_argument("--update-baseline", action="store_true", help="overwrite the baseline with this run")
+    parser.add_argument("--stocks", type=int, default=5000, help="size of the synthetic market")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated upstream latency per query")
+    args = parser.parse_args()
+    regressions = run(args.baseline, args.threshold, args.min_delta_ms, args.iterations,
+                      args.update_baseline, args.stocks, args.latency_ms)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+# Everything under benchmarks/ starts a fake Baostock server and takes tens of seconds
+import pytest
+
+
+def pytest_collection_modifyitems(config, items):
+    for item in items:
+        if "benchmarks" in item.path.parts:
+            item.add_marker(pytest.mark.slow)
@@ -0,0 +1,953 @@
+"""
+Local stand-in for the Baostock server, speaking the same socket protocol.
+
+The unmodified `baostock` client (and so BaostockDataSource, the worker pool
+and every cache above them) talks to it as it would to www.baostock.com.
+Everything it serves is synthetic but deterministic for a given seed and
+as-of date:
+
+- a trading calendar (weekdays minus fixed holidays),
+- a universe of stocks plus the main indices, with listing dates, names,
+  industries and HS300 / SZ50 / ZZ500 membership,
+- daily bars built from a random walk, with yearly ex-dividend events, so
+  raw, forward and backward adjusted prices and the adjust factors agree;
+  5-minute bars that add up to the daily bar, and 15/30/60-minute, weekly
+  and monthly bars aggregated from those,
+- quarterly reports that only appear once their publication date has
+  passed, express and forecast reports, dividends and the macro series.
+
+Latency, jitter, injected error codes, connection resets and session expiry
+are set with a FaultProfile.
+
+Start it next to a benchmark:
+
+    with FakeBaostockServer(faults=FaultProfile(latency_ms=20, jitter_ms=5)) as server:
+        with patch_baostock(server.address):
+            ...  # BaostockDataSource in this process now talks to the fake
+
+or run it standalone and point the MCP server at it:
+
+    python benchmarks/fake_baostock.py --port 10030 --latency-ms 20
+    A_SHARE_MCP_BAOSTOCK_SERVER=127.0.0.1:10030 python mcp_server.py
+"""
+import argparse
+import json
+import random
+import socket
+import socketserver
+import struct
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import baostock.common.contants as bs_cons
+
+SPLIT = "\1"
+HEADER_LENGTH = 21
+CLIENT_VERSION = "00.8.90"
+MESSAGE_END = b"<![CDATA[]]>\n"
+# Response types whose body the client expects zlib-compressed (K-data only)
+COMPRESSED_TYPES = ("96",)
+
+SUCCESS = "0"
+NO_LOGIN = "10001001"
+PARAM_ERROR = "10004006"
+MESSAGE_TYPE_ERROR = "10004020"
+ERROR_MESSAGES = {
+    NO_LOGIN: "用户未登录",
+    PARAM_ERROR: "参数错误",
+    MESSAGE_TYPE_ERROR: "错误的消息类型",
+    "10002007": "网络接收错误",
+    "10005001": "系统级别错误",
+}
+
+FIRST_DAY = date(1990, 12, 19)
+# (month, day) closures every year; enough to make the calendar non-trivial
+HOLIDAYS = {(1, 1), (5, 1), (5, 2), (5, 3)} | {(10, d) for d in range(1, 8)}
+
+INDICES = [
+    ("sh.000001", "上证综合指数"),
+    ("sh.000016", "上证50指数"),
+    ("sh.000300", "沪深300指数"),
+    ("sh.000905", "中证500指数"),
+    ("sz.399001", "深证成份指数"),
+    ("sz.399006", "创业板指数"),
+]
+
+INDUSTRIES = [
+    "C39计算机、通信和其他电子设备制造业", "C27医药制造业", "J66货币金融服务", "K70房地产业",
+    "C26化学原料和化学制品制造业", "I65软件和信息技术服务业", "C38电气机械和器材制造业",
+    "C15酒、饮料和精制茶制造业", "D44电力、热力生产和供应业", "C36汽车制造业",
+    "F51批发业", "E48土木工程建筑业", "B06煤炭开采和洗选业", "G54道路运输业",
+    "C34通用设备制造业", "J67资本市场服务", "C35专用设备制造业", "R86广播、电视、电影和录音制作业",
+]
+
+PRICE_FIELDS = ("open", "high", "low", "close", "preclose")
+
+REPORT_FIELDS = {
+    "query_profit_data": ["code", "pubDate", "statDate", "roeAvg", "npMargin", "gpMargin", "netProfit",
+                          "epsTTM", "MBRevenue", "totalShare", "liqaShare"],
+    "query_operation_data": ["code", "pubDate", "statDate", "NRTurnRatio", "NRTurnDays", "INVTurnRatio",
+                             "INVTurnDays", "CATurnRatio", "AssetTurnRatio"],
+    "query_growth_data": ["code", "pubDate", "statDate", "YOYEquity", "YOYAsset", "YOYNI", "YOYEPSBasic", "YOYPNI"],
+    "query_balance_data": ["code", "pubDate", "statDate", "currentRatio", "quickRatio", "cashRatio",
+                           "YOYLiability", "liabilityToAsset", "assetToEquity"],
+    "query_cash_flow_data": ["code", "pubDate", "statDate", "CAToAsset", "NCAToAsset", "tangibleAssetToAsset",
+                             "ebitToInterest", "CFOToOR", "CFOToNP", "CFOToGr"],
+    "query_dupont_data": ["code", "pubDate", "statDate", "dupontROE", "dupontAssetStoEquity", "dupontAssetTurn",
+                          "dupontPnitoni", "dupontNitogr", "dupontTaxBurden", "dupontIntburden", "dupontEbittogr"],
+}
+# Fields whose synthetic values are absolute amounts rather than ratios
+REPORT_SCALES = {"netProfit": 1e9, "MBRevenue": 1e10, "totalShare": 1e10, "liqaShare": 1e10,
+                 "NRTurnDays": 100.0, "INVTurnDays": 200.0, "ebitToInterest": 50.0, "epsTTM": 3.0}
+
+EXPRESS_FIELDS = ["code", "performanceExpPubDate", "performanceExpStatDate", "performanceExpUpdateDate",
+                  "performanceExpressTotalAsset", "performanceExpressNetAsset", "performanceExpressEPSChgPct",
+                  "performanceExpressROEWa", "performanceExpressEPSDiluted", "performanceExpressGRYOY",
+                  "performanceExpressOPYOY"]
+FORECAST_FIELDS = ["code", "profitForcastExpPubDate", "profitForcastExpStatDate", "profitForcastType",
+                   "profitForcastAbstract", "profitForcastChgPctUp", "profitForcastChgPctDwn"]
+FORECAST_TYPES = ["预增", "略增", "续盈", "扭亏", "预减", "略减"]
+DIVIDEND_FIELDS = ["code", "dividPreNoticeDate", "dividAgmPumDate", "dividPlanAnnounceDate", "dividPlanDate",
+                   "dividRegistDate", "dividOperateDate", "dividPayDate", "dividStockMarketDate",
+                   "dividCashPsBeforeTax", "dividCashPsAfterTax", "dividStocksPs", "dividCashStock",
+                   "dividReserveToStockPs"]
+ADJUST_FACTOR_FIELDS = ["code", "dividOperateDate", "foreAdjustFactor", "backAdjustFactor", "adjustFactor"]
+
+# Policy rate changes: (date, deposit rates, loan rates, reserve ratios big/medium)
+RATE_CHANGES = [
+    ("2008-12-23", 0.36, 2.25, 5.31, 23.0, 13.5),
+    ("2010-10-20", 0.36, 2.50, 5.56, 17.0, 13.5),
+    ("2011-07-07", 0.50, 3.50, 6.56, 21.5, 19.5),
+    ("2012-07-06", 0.35, 3.00, 6.00, 20.0, 18.0),
+    ("2014-11-22", 0.35, 2.75, 5.60, 20.0, 18.0),
+    ("2015-10-24", 0.35, 1.50, 4.35, 17.5, 15.5),
+    ("2019-09-16", 0.35, 1.50, 4.35, 13.0, 11.0),
+    ("2022-12-05", 0.35, 1.50, 4.35, 10.75, 8.75),
+    ("2024-09-27", 0.35, 1.50, 4.35, 9.5, 7.5),
+]
+
+
+def _hash(*parts) -> int:
+    """Stable 32-bit hash, independent of PYTHONHASHSEED."""
+    return zlib.crc32("|".join(map(str, parts)).encode("utf-8"))
+
+
+def _unit(*parts) -> float:
+    """Deterministic value in [0, 1) for the given key."""
+    return _hash(*parts) / 2 ** 32
+
+
+def _parse_date(text: str, default: date) -> date:
+    return date.fromisoformat(text) if text else default
+
+
+def _fmt(values: np.ndarray, digits: int) -> List[str]:
+    return [f"{v:.{digits}f}" for v in values.tolist()]
+
+
+@dataclass(frozen=True)
+class Security:
+    code: str
+    name: str
+    ipo: date
+    kind: str  # "1" stock, "2" index
+    industry: str
+    weight: float  # stands in for market cap when picking index members
+    base_price: float
+    float_shares: float
+
+
+class SyntheticMarket:
+    """Deterministic market data for a universe of `stocks` stocks plus the main indices."""
+
+    def __init__(self, stocks: int = 5000, seed: int = 7, as_of: Optional[date] = None):
+        self.seed = seed
+        self.as_of = as_of or date.today()
+        self.calendar_end = date(self.as_of.year, 12, 31)
+
+        days = np.arange(np.datetime64(FIRST_DAY), np.datetime64(self.calendar_end + timedelta(days=1)))
+        months = days.astype("datetime64[M]").astype(int) % 12 + 1
+        day_of_month = (days - days.astype("datetime64[M]")).astype(int) + 1
+        weekday = (days.astype(int) + 3) % 7  # 1970-01-01 was a Thursday
+        holiday = np.zeros(len(days), dtype=bool)
+        for month, day in HOLIDAYS:
+            holiday |= (months == month) & (day_of_month == day)
+        self.calendar_days = days
+        self.is_trading = (weekday < 5) & ~holiday
+        trading = days[self.is_trading]
+        self.trading_days = trading[trading <= np.datetime64(self.as_of)]
+
+        self.securities: Dict[str, Security] = {}
+        listable = self.trading_days[(self.trading_days >= np.datetime64("1995-01-03"))
+                                     & (self.trading_days <= np.datetime64("2019-12-31"))]
+        for i in range(stocks):
+            code = f"sh.{600000 + i // 2}" if i % 2 == 0 else f"sz.{i // 2 + 1:06d}"
+            h = _hash(seed, code)
+            self.securities[code] = Security(
+                code=code,
+                name=f"样本{'沪' if i % 2 == 0 else '深'}{i:04d}",
+                ipo=listable[h % len(listable)].astype(date),
+                kind="1",
+                industry="" if h % 40 == 0 else INDUSTRIES[h % len(INDUSTRIES)],
+                weight=_unit(seed, code, "weight"),
+                base_price=3 + 57 * _unit(seed, code, "price"),
+                float_shares=1e8 * (1 + 49 * _unit(seed, code, "shares")),
+            )
+        for code, name in INDICES:
+            self.securities[code] = Security(
+                code=code, name=name, ipo=date(2000, 1, 4), kind="2", industry="", weight=0.0,
+                base_price=1000 + 3000 * _unit(seed, code, "price"), float_shares=1e12)
+
+    # --- Calendar ---
+
+    def is_trading_day(self, day: date) -> bool:
+        offset = (day - FIRST_DAY).days
+        return 0 <= offset < len(self.is_trading) and bool(self.is_trading[offset])
+
+    def trade_dates(self, start: date, end: date) -> List[List[str]]:
+        mask = (self.calendar_days >= np.datetime64(start)) & (self.calendar_days <= np.datetime64(end))
+        dates = np.datetime_as_string(self.calendar_days[mask], unit="D").tolist()
+        flags = np.where(self.is_trading[mask], "1", "0").tolist()
+        return [list(row) for row in zip(dates, flags)]
+
+    def _first_trading_on_or_after(self, day: date) -> Optional[date]:
+        i = int(np.searchsorted(self.trading_days, np.datetime64(day)))
+        return self.trading_days[i].astype(date) if i < len(self.trading_days) else None
+
+    def _last_trading_on_or_before(self, day: date) -> Optional[date]:
+        i = int(np.searchsorted(self.trading_days, np.datetime64(day), side="right")) - 1
+        return self.trading_days[i].astype(date) if i >= 0 else None
+
+    # --- Securities ---
+
+    def listed(self, day: date) -> List[Security]:
+        return [s for s in self.securities.values() if s.ipo <= day]
+
+    def constituents(self, index: str, day: date) -> Tuple[date, List[Security]]:
+        """Members of hs300 / sz50 / zz500 as of `day` and the date of the last rebalance."""
+        stocks = sorted((s for s in self.listed(day) if s.kind == "1"), key=lambda s: -s.weight)
+        if index == "sz50":
+            members = [s for s in stocks if s.code.startswith("sh.")][:50]
+        elif index == "hs300":
+            members = stocks[:300]
+        else:
+            members = stocks[300:800]
+        rebalance = date(day.year, 12, 10) if day >= date(day.year, 12, 10) else (
+            date(day.year, 6, 10) if day >= date(day.year, 6, 10) else date(day.year - 1, 12, 10))
+        return self._first_trading_on_or_after(rebalance) or rebalance, sorted(members, key=lambda s: s.code)
+
+    # --- Daily bars and corporate actions ---
+
+    @lru_cache(maxsize=512)
+    def daily(self, code: str) -> Optional[Dict[str, np.ndarray]]:
+        """Raw daily bars since listing plus the backward adjust factor of each day."""
+        sec = self.securities.get(code)
+        if sec is None:
+            return None
+        dates = self.trading_days[self.trading_days >= np.datetime64(sec.ipo)]
+        n = len(dates)
+        if n == 0:
+            return None
+        rng = np.random.default_rng([self.seed, _hash(code)])
+        returns = rng.normal(0.0003, 0.012 if sec.kind == "2" else 0.021, n)
+        returns[0] = 0.0
+        adjusted_close = sec.base_price * np.cumprod(1 + returns)
+
+        # One ex-dividend day a year for stocks, in June or July
+        step = np.ones(n)
+        events = []
+        if sec.kind == "1":
+            for year in range(sec.ipo.year + 1, self.as_of.year + 1):
+                ex_date = self._first_trading_on_or_after(date(year, 6, 10) + timedelta(days=_hash(code, year) % 30))
+                if ex_date is None:
+                    continue
+                i = int(np.searchsorted(dates, np.datetime64(ex_date)))
+                if 0 < i < n:
+                    step[i] = 1 + 0.005 + 0.035 * _unit(self.seed, code, year, "dividend")
+                    events.append(i)
+        back = np.round(np.cumprod(step), 6)
+
+        close = np.maximum(np.round(adjusted_close / back, 2), 0.01)
+        preclose = np.empty(n)
+        preclose[0] = round(close[0] / (1 + 0.2 * rng.random()), 2)
+        preclose[1:] = np.round(close[:-1] * back[:-1] / back[1:], 2)
+        open_ = np.maximum(np.round(preclose * (1 + rng.normal(0, 0.006, n)), 2), 0.01)
+        high = np.round(np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.008, n))), 2)
+        low = np.maximum(np.round(np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.008, n))), 2), 0.01)
+        volume = (rng.lognormal(16 if sec.kind == "1" else 20, 0.5, n) // 100 * 100).astype(np.int64) + 100
+        amount = np.round(volume * (open_ + high + low + close) / 4, 4)
+        eps = 0.05 + 2 * _unit(self.seed, code, "eps")
+        return {
+            "dates": dates,
+            "open": open_, "high": high, "low": low, "close": close, "preclose": preclose,
+            "volume": volume, "amount": amount,
+            "turn": volume / sec.float_shares * 100,
+            "pctChg": (close / preclose - 1) * 100,
+            "peTTM": close / eps,
+            "pbMRQ": close / (eps * 8),
+            "psTTM": close / (eps * 5),
+            "pcfNcfTTM": close / (eps * 1.5),
+            "back": back,
+            "events": np.array(events, dtype=np.int64),
+        }
+
+    def adjust_factor_rows(self, code: str, start: date, end: date) -> List[List[str]]:
+        bars = self.daily(code)
+        if bars is None:
+            return []
+        latest = bars["back"][-1]
+        rows = []
+        for i in bars["events"].tolist():
+            day = bars["dates"][i].astype(date)
+            if start <= day <= end:
+                back = bars["back"][i]
+                rows.append([code, day.isoformat(), f"{back / latest:.6f}", f"{back:.6f}", f"{back:.6f}"])
+        return rows
+
+    def dividend_rows(self, code: str, year: int, year_type: str) -> List[List[str]]:
+        bars = self.daily(code)
+        if bars is None:
+            return []
+        rows = []
+        for i in bars["events"].tolist():
+            ex_date = bars["dates"][i].astype(date)
+            plan = ex_date - timedelta(days=40 + _hash(code, ex_date) % 20)
+            if (ex_date if year_type == "operate" else plan).year != year:
+                continue
+            ratio = bars["back"][i] / bars["back"][i - 1]
+            cash = round(bars["close"][i - 1] * (1 - 1 / ratio), 4)
+            regist = bars["dates"][i - 1].astype(date)
+            rows.append([
+                code, (plan - timedelta(days=60)).isoformat(), (plan - timedelta(days=20)).isoformat(),
+                plan.isoformat(), plan.isoformat(), regist.isoformat(), ex_date.isoformat(),
+                ex_date.isoformat(), "", f"{cash:.4f}", f"{cash * 0.9:.4f}", "", f"10派{cash * 10:.2f}元(含税)", "",
+            ])
+        return rows
+
+    # --- K-data ---
+
+    def _adjusted(self, bars: Dict[str, np.ndarray], adjustflag: str) -> np.ndarray:
+        if adjustflag == "1":
+            return bars["back"]
+        if adjustflag == "2":
+            return np.round(bars["back"] / bars["back"][-1], 6)
+        return np.ones(len(bars["dates"]))
+
+    def k_data(self, code: str, fields: Sequence[str], start: date, end: date,
+               frequency: str, adjustflag: str) -> List[list]:
+        bars = self.daily(code)
+        if bars is None:
+            return []
+        lo = int(np.searchsorted(bars["dates"], np.datetime64(start)))
+        hi = int(np.searchsorted(bars["dates"], np.datetime64(end), side="right"))
+        factor = self._adjusted(bars, adjustflag)
+        if frequency in ("5", "15", "30", "60"):
+            columns = self._minute_columns(code, bars, factor, lo, hi, int(frequency))
+        elif frequency in ("w", "m"):
+            columns = self._period_columns(bars, factor, lo, hi, frequency)
+        else:
+            columns = self._daily_columns(bars, factor, lo, hi)
+        n = len(columns["date"])
+        columns["code"] = [code] * n
+        columns["adjustflag"] = [adjustflag] * n
+        blank = [""] * n
+        return [list(row) for row in zip(*(columns.get(f, blank) for f in fields))]
+
+    def _daily_columns(self, bars, factor, lo, hi) -> Dict[str, list]:
+        columns = {"date": np.datetime_as_string(bars["dates"][lo:hi], unit="D").tolist()}
+        adjusted = factor[lo:hi]
+        digits = 2 if np.all(adjusted == 1) else 6
+        for f in PRICE_FIELDS:
+            columns[f] = _fmt(bars[f][lo:hi] * adjusted, digits)
+        columns["volume"] = list(map(str, bars["volume"][lo:hi].tolist()))
+        columns["amount"] = _fmt(bars["amount"][lo:hi], 4)
+        for f in ("turn", "pctChg", "peTTM", "pbMRQ", "psTTM", "pcfNcfTTM"):
+            columns[f] = _fmt(bars[f][lo:hi], 6)
+        columns["tradestatus"] = ["1"] * (hi - lo)
+        columns["isST"] = ["0"] * (hi - lo)
+        return columns
+
+    def _period_columns(self, bars, factor, lo, hi, frequency) -> Dict[str, list]:
+        # Whole periods are aggregated first, then the ones ending inside the range are kept
+        days = bars["dates"]
+        if frequency == "w":
+            keys = (days.astype(int) + 3) // 7  # Monday-based week number
+        else:
+            keys = days.astype("datetime64[M]").astype(int)
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        ends = np.r_[starts[1:], len(days)] - 1
+        keep = (ends >= lo) & (ends < hi)
+        starts, ends = starts[keep], ends[keep]
+        spans = list(zip(starts.tolist(), (ends + 1).tolist()))
+        high = np.array([(bars["high"][a:b] * factor[a:b]).max() for a, b in spans])
+        low = np.array([(bars["low"][a:b] * factor[a:b]).min() for a, b in spans])
+        close = bars["close"][ends] * factor[ends]
+        prev_close = np.where(starts > 0, bars["close"][starts - 1] * factor[starts - 1],
+                              bars["preclose"][starts] * factor[starts])
+        volume = np.array([bars["volume"][a:b].sum() for a, b in spans], dtype=np.int64)
+        amount = np.array([bars["amount"][a:b].sum() for a, b in spans])
+        turn = np.array([bars["turn"][a:b].sum() for a, b in spans])
+        digits = 2 if np.all(factor == 1) else 6
+        return {
+            "date": np.datetime_as_string(days[ends], unit="D").tolist(),
+            "open": _fmt(bars["open"][starts] * factor[starts], digits),
+            "high": _fmt(high, digits), "low": _fmt(low, digits), "close": _fmt(close, digits),
+            "volume": list(map(str, volume.tolist())), "amount": _fmt(amount, 4),
+            "turn": _fmt(turn, 6), "pctChg": _fmt((close / prev_close - 1) * 100, 6),
+        }
+
+    def _minute_columns(self, code, bars, factor, lo, hi, minutes) -> Dict[str, list]:
+        """
+        5-minute bars fitted inside each daily bar (same open, close, high, low
+        and volume), summed into 15/30/60-minute bars per trading session.
+        """
+        days = hi - lo
+        if days <= 0:
+            return {"date": []}
+        per_day = 48
+        o, c = bars["open"][lo:hi, None], bars["close"][lo:hi, None]
+        h, l = bars["high"][lo:hi, None], bars["low"][lo:hi, None]
+        ordinal = bars["dates"][lo:hi].astype(np.int64)[:, None]
+        slot = np.arange(1, per_day + 1)[None, :]
+        # Cheap vectorized pseudo-random numbers keyed by (code, day, slot)
+        key = (_hash(self.seed, code) % 9973) + ordinal * 12.9898 + slot * 78.233
+        noise = np.modf(np.sin(key) * 43758.5453)[0]  # in (-1, 1)
+        path = o + (c - o) * slot / per_day + (h - l) * 0.5 * noise * np.sin(np.pi * slot / per_day)
+        close5 = np.clip(np.round(path, 2), l, h)
+        close5[:, -1] = c[:, 0]
+        open5 = np.concatenate([o, close5[:, :-1]], axis=1)
+        wiggle = np.abs(np.modf(np.sin(key * 1.7) * 24634.6345)[0])
+        high5 = np.minimum(np.round(np.maximum(open5, close5) + (h - l) * 0.1 * wiggle, 2), h)
+        low5 = np.maximum(np.round(np.minimum(open5, close5) - (h - l) * 0.1 * wiggle, 2), l)
+        rows = np.arange(days)
+        high5[rows, _hash(code, "high") % per_day] = h[:, 0]
+        low5[rows, _hash(code, "low") % per_day] = l[:, 0]
+        high5 = np.maximum.reduce([high5, open5, close5])
+        low5 = np.minimum.reduce([low5, open5, close5])
+        # U-shaped intraday volume, in lots of 100, adding up to the daily volume
+        weights = 1 + 0.8 * np.cos(np.pi * (slot - 0.5) / 24) ** 2 + 0.3 * wiggle
+        weights /= weights.sum(axis=1, keepdims=True)
+        volume5 = (bars["volume"][lo:hi, None] * weights // 100 * 100).astype(np.int64)
+        volume5[:, -1] += bars["volume"][lo:hi] - volume5.sum(axis=1)
+
+        group = minutes // 5
+        shape = (days, per_day // group, group)
+        open_ = open5.reshape(shape)[:, :, 0]
+        close = close5.reshape(shape)[:, :, -1]
+        high = high5.reshape(shape).max(axis=2)
+        low = low5.reshape(shape).min(axis=2)
+        volume = volume5.reshape(shape).sum(axis=2)
+        amount = np.round(volume * (open_ + high + low + close) / 4, 4)
+
+        # Bar end times: 09:30-11:30 and 13:00-15:00
+        ends = [570 + minutes * (j + 1) for j in range(120 // minutes)] + \
+               [780 + minutes * (j + 1) for j in range(120 // minutes)]
+        stamps = [f"{m // 60:02d}{m % 60:02d}00000" for m in ends]
+        day_text = np.datetime_as_string(bars["dates"][lo:hi], unit="D").tolist()
+        bars_per_day = len(ends)
+        f = np.repeat(factor[lo:hi], bars_per_day)
+        digits = 2 if np.all(f == 1) else 6
+        return {
+            "date": [d for d in day_text for _ in range(bars_per_day)],
+            "time": [d.replace("-", "") + s for d in day_text for s in stamps],
+            "open": _fmt(open_.ravel() * f, digits), "high": _fmt(high.ravel() * f, digits),
+            "low": _fmt(low.ravel() * f, digits), "close": _fmt(close.ravel() * f, digits),
+            "volume": list(map(str, volume.ravel().tolist())), "amount": _fmt(amount.ravel(), 4),
+        }
+
+    # --- Reports ---
+
+    def _publication_date(self, code: str, year: int, quarter: int) -> date:
+        h = _hash(self.seed, code, year, quarter, "pub")
+        if quarter == 1:
+            return date(year, 4, 10 + h % 20)
+        if quarter == 2:
+            return date(year, 8, 5 + h % 25)
+        if quarter == 3:
+            return date(year, 10, 10 + h % 20)
+        return date(year + 1, 3, 10) + timedelta(days=h % 50)
+
+    def report_rows(self, method: str, code: str, year: int, quarter: int) -> List[List[str]]:
+        sec = self.securities.get(code)
+        if sec is None or sec.kind != "1" or year < sec.ipo.year or not 1 <= quarter <= 4:
+            return []
+        published = self._publication_date(code, year, quarter)
+        if published > self.as_of:
+            return []
+        stat = date(year, 3 * quarter, 30 if quarter in (2, 3) else 31)
+        row = [code, published.isoformat(), stat.isoformat()]
+        for field in REPORT_FIELDS[method][3:]:
+            value = (0.02 + 0.5 * _unit(self.seed, code, year, quarter, field)) * REPORT_SCALES.get(field, 1.0)
+            if field.startswith("YOY"):
+                value -= 0.2
+            row.append(f"{value:.6f}")
+        return [row]
+
+    def express_rows(self, code: str, start: date, end: date) -> List[List[str]]:
+        sec = self.securities.get(code)
+        if sec is None or sec.kind != "1":
+            return []
+        rows = []
+        for year in range(max(sec.ipo.year, start.year - 1), end.year):
+            if _hash(self.seed, code, year, "express") % 2:
+                continue
+            published = date(year + 1, 1, 5 + _hash(code, year) % 25)
+            if not start <= published <= min(end, self.as_of):
+                continue
+            values = [(0.02 + _unit(self.seed, code, year, i)) for i in range(6)]
+            rows.append([code, published.isoformat(), f"{year}-12-31", published.isoformat(),
+                         f"{values[0] * 1e11:.2f}", f"{values[1] * 1e10:.2f}", f"{values[2] * 50 - 20:.6f}",
+                         f"{values[3] * 20:.6f}", f"{values[4] * 3:.6f}", f"{values[5] * 60 - 20:.6f}",
+                         f"{values[0] * 60 - 25:.6f}"])
+        return rows
+
+    def forecast_rows(self, code: str, start: date, end: date) -> List[List[str]]:
+        sec = self.securities.get(code)
+        if sec is None or sec.kind != "1":
+            return []
+        rows = []
+        for year in range(max(sec.ipo.year, start.year - 1), end.year + 1):
+            for quarter in range(1, 5):
+                h = _hash(self.seed, code, year, quarter, "forecast")
+                if h % 3:
+                    continue
+                stat = date(year, 3 * quarter, 30 if quarter in (2, 3) else 31)
+                published = stat + timedelta(days=10 + h % 30)
+                if not start <= published <= min(end, self.as_of):
+                    continue
+                up = (h % 200) - 50
+                kind = FORECAST_TYPES[h % len(FORECAST_TYPES)]
+                rows.append([code, published.isoformat(), stat.isoformat(), kind,
+                             f"预计净利润同比变动{up - 20}%至{up}%", f"{up:.2f}", f"{up - 20:.2f}"])
+        return rows
+
+    # --- Macro ---
+
+    def rate_rows(self, method: str, start: str, end: str, year_type: str = "0") -> Tuple[List[str], List[List[str]]]:
+        rows = []
+        for day, demand, one_year_deposit, one_year_loan, big, medium in RATE_CHANGES:
+            if start and day < start or end and day > end or day > self.as_of.isoformat():
+                continue
+            if method == "query_deposit_rate_data":
+                rows.append([day, f"{demand:.2f}", f"{one_year_deposit - 0.6:.2f}", f"{one_year_deposit - 0.3:.2f}",
+                             f"{one_year_deposit:.2f}", f"{one_year_deposit + 0.6:.2f}",
+                             f"{one_year_deposit + 1.25:.2f}", f"{one_year_deposit + 1.3:.2f}",
+                             f"{one_year_deposit - 0.2:.2f}", f"{one_year_deposit + 0.1:.2f}",
+                             f"{one_year_deposit + 0.3:.2f}"])
+            elif method == "query_loan_rate_data":
+                rows.append([day, f"{one_year_loan - 0.25:.2f}", f"{one_year_loan:.2f}",
+                             f"{one_year_loan + 0.4:.2f}", f"{one_year_loan + 0.4:.2f}",
+                             f"{one_year_loan + 0.55:.2f}", f"{one_year_loan - 1.6:.2f}",
+                             f"{one_year_loan - 1.1:.2f}"])
+            else:
+                effective = (date.fromisoformat(day) + timedelta(days=10)).isoformat()
+                rows.append([day, effective, f"{big + 0.5:.2f}", f"{big:.2f}", f"{medium + 0.5:.2f}", f"{medium:.2f}"])
+        if method == "query_deposit_rate_data":
+            fields = ["pubDate", "demandDepositRate", "fixedDepositRate3Month", "fixedDepositRate6Month",
+                      "fixedDepositRate1Year", "fixedDepositRate2Year", "fixedDepositRate3Year",
+                      "fixedDepositRate5Year", "installmentFixedDepositRate1Year",
+                      "installmentFixedDepositRate3Year", "installmentFixedDepositRate5Year"]
+        elif method == "query_loan_rate_data":
+            fields = ["pubDate", "loanRate6Month", "loanRate6MonthTo1Year", "loanRate1YearTo3Year",
+                      "loanRate3YearTo5Year", "loanRateAbove5Year", "mortgateRateBelow5Year",
+                      "mortgateRateAbove5Year"]
+        else:
+            fields = ["pubDate", "effectiveDate", "bigInstitutionsRatioPre", "bigInstitutionsRatioAfter",
+                      "mediumInstitutionsRatioPre", "mediumInstitutionsRatioAfter"]
+        return fields, rows
+
+    def money_supply_rows(self, monthly: bool, start: str, end: str) -> Tuple[List[str], List[List[str]]]:
+        rows = []
+        last = (self.as_of.replace(day=1) - timedelta(days=1))
+        for year in range(2000, last.year + 1):
+            for month in (range(1, 13) if monthly else [12]):
+                if date(year, month, 1) > last:
+                    break
+                key = f"{year}-{month:02d}" if monthly else str(year)
+                if start and key < start[:len(key)] or end and key > end[:len(key)]:
+                    continue
+                growth = (year - 2000) * 12 + month
+                base = [1.4e4 * 1.06 ** (growth / 12), 5.3e4 * 1.11 ** (growth / 12), 1.3e5 * 1.13 ** (growth / 12)]
+                yoy = [3 + 10 * _unit(self.seed, year, month, i) for i in range(3)]
+                if monthly:
+                    row = [str(year), str(month)]
+                    for amount, pct in zip(base, yoy):
+                        row += [f"{amount:.2f}", f"{pct:.2f}", f"{pct / 12 - 0.2:.2f}"]
+                else:
+                    row = [str(year)]
+                    for amount, pct in zip(base, yoy):
+                        row += [f"{amount:.2f}", f"{pct:.2f}"]
+                rows.append(row)
+        if monthly:
+            fields = ["statYear", "statMonth", "m0Month", "m0YOY", "m0ChainRelative", "m1Month", "m1YOY",
+                      "m1ChainRelative", "m2Month", "m2YOY", "m2ChainRelative"]
+        else:
+            fields = ["statYear", "m0Year", "m0YearYOY", "m1Year", "m1YearYOY", "m2Year", "m2YearYOY"]
+        return fields, rows
+
+
+@dataclass(frozen=True)
+class FaultProfile:
+    """
+    What the fake server does to each query besides answering it.
+
+    Latency is applied to every response, including login. Errors, resets and
+    session expiry only hit queries: `error_rate` answers with one of
+    `error_codes`, `reset_rate` drops the connection with a TCP reset (the
+    client sees a network receive error), and after `session_ttl` seconds a
+    login stops being accepted (error 10001001, as when the real server drops
+    an idle session).
+    """
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_codes: Tuple[str, ...] = ("10005001",)
+    reset_rate: float = 0.0
+    session_ttl: float = 0.0
+    seed: int = 0
+
+
+class _Connection:
+    def __init__(self):
+        self.user_id: Optional[str] = None
+        self.logged_in_at = 0.0
+
+
+class FakeBaostockServer:
+    """
+    Threaded TCP server answering Baostock protocol messages from a SyntheticMarket.
+
+    `port=0` picks a free port; the bound address is in `address`. Usable as a
+    context manager, which starts it in a background thread and stops it on exit.
+    """
+
+    def __init__(self, market: Optional[SyntheticMarket] = None, faults: Optional[FaultProfile] = None,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.market = market or SyntheticMarket()
+        self.faults = faults or FaultProfile()
+        self._random = random.Random(self.faults.seed)
+        self._random_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, int] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._handlers: Dict[str, Callable[[List[str]], Tuple[List[str], List[list], List[str]]]] = {
+            "query_history_k_data_plus": self._k_data,
+            "query_trade_dates": self._trade_dates,
+            "query_all_stock": self._all_stock,
+            "query_stock_basic": self._stock_basic,
+            "query_stock_industry": self._stock_industry,
+            "query_hs300_stocks": self._constituents,
+            "query_sz50_stocks": self._constituents,
+            "query_zz500_stocks": self._constituents,
+            "query_dividend_data": self._dividends,
+            "query_adjust_factor": self._adjust_factor,
+            "query_performance_express_report": self._express,
+            "query_forecast_report": self._forecast,
+            "query_deposit_rate_data": self._rates,
+            "query_loan_rate_data": self._rates,
+            "query_required_reserve_ratio_data": self._rates,
+            "query_money_supply_data_month": self._money_supply,
+            "query_money_supply_data_year": self._money_supply,
+        }
+        for method in REPORT_FIELDS:
+            self._handlers[method] = self._report
+
+        outer = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                outer._serve_connection(self.request)
+
+        class Server(socketserver.ThreadingTCPServer):
+            allow_reuse_address = True
+            daemon_threads = True
+
+        self._server = Server((host, port), Handler)
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._server.server_address[:2]
+
+    def start(self) -> "FakeBaostockServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-baostock", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "FakeBaostockServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, int]:
+        """Counters: connections, messages per method, rows and bytes sent, injected faults."""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self._stats.clear()
+
+    def _count(self, **increments: int) -> None:
+        with self._stats_lock:
+            for key, value in increments.items():
+                self._stats[key] = self._stats.get(key, 0) + value
+
+    # --- Connection handling ---
+
+    def _serve_connection(self, sock: socket.socket) -> None:
+        self._count(connections=1)
+        connection = _Connection()
+        buffer = b""
+        while True:
+            try:
+                chunk = sock.recv(65536)
+            except OSError:
+                return
+            if not chunk:
+                return
+            buffer += chunk
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                reply = self._answer(connection, line.decode("utf-8"))
+                if reply is None:
+                    # Reset instead of closing cleanly, so the client's recv fails
+                    # rather than waiting for a terminator that never comes
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+                    sock.close()
+                    return
+                sock.sendall(reply)
+
+    def _delay(self) -> None:
+        faults = self.faults
+        if faults.latency_ms <= 0 and faults.jitter_ms <= 0:
+            return
+        with self._random_lock:
+            jitter = self._random.uniform(-faults.jitter_ms, faults.jitter_ms)
+        time.sleep(max(0.0, faults.latency_ms + jitter) / 1000)
+
+    def _roll(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self._random_lock:
+            return self._random.random() < rate
+
+    def _answer(self, connection: _Connection, message: str) -> Optional[bytes]:
+        msg_type = message[:HEADER_LENGTH].split(SPLIT)[1]
+        # The body is followed by SPLIT and a CRC32 of header + body
+        body = message[HEADER_LENGTH:].rsplit(SPLIT, 1)[0].split(SPLIT)
+        method = body[0]
+        reply_type = f"{int(msg_type) + 1:02d}"
+        self._count(**{f"calls.{method}": 1})
+        self._delay()
+
+        if method == "login":
+            connection.user_id = body[1] or "anonymous"
+            connection.logged_in_at = time.monotonic()
+            self._count(logins=1)
+            return self._encode(reply_type, [SUCCESS, "success", "login", connection.user_id])
+        if method == "logout":
+            connection.user_id = None
+            return self._encode(reply_type, [SUCCESS, "success", "logout", body[1]])
+
+        user_id = body[1] if len(body) > 1 else ""
+        if connection.user_id is None or (
+                self.faults.session_ttl > 0
+                and time.monotonic() - connection.logged_in_at > self.faults.session_ttl):
+            connection.user_id = None
+            self._count(errors_no_login=1)
+            return self._error(reply_type, NO_LOGIN, method, user_id)
+        if self._roll(self.faults.reset_rate):
+            self._count(injected_resets=1)
+            return None
+        if self._roll(self.faults.error_rate):
+            with self._random_lock:
+                code = self._random.choice(self.faults.error_codes)
+            self._count(injected_errors=1)
+            return self._error(reply_type, code, method, user_id)
+
+        handler = self._handlers.get(method)
+        if handler is None or len(body) < 4:
+            return self._error(reply_type, MESSAGE_TYPE_ERROR, method, user_id)
+        page, per_page, params = body[2], body[3], body[4:]
+        try:
+            echo, rows, fields = handler([method] + params)
+        except (ValueError, IndexError):
+            return self._error(reply_type, PARAM_ERROR, method, user_id)
+        # Pages are 1-based and each holds per_page rows; past the end the record list is empty
+        size = int(per_page)
+        first = (int(page) - 1) * size
+        rows = rows[first:first + size]
+        self._count(rows=len(rows))
+        record = json.dumps({"record": rows}, ensure_ascii=False, separators=(",", ":"))
+        return self._encode(reply_type, [SUCCESS, "success", method, user_id, page, per_page, record] + echo
+                            + ([",".join(fields)] if fields else []))
+
+    def _error(self, reply_type: str, code: str, method: str, user_id: str) -> bytes:
+        return self._encode(reply_type, [code, ERROR_MESSAGES.get(code, "error"), method, user_id])
+
+    def _encode(self, reply_type: str, fields: List[str]) -> bytes:
+        body = SPLIT.join(fields)
+        if reply_type in COMPRESSED_TYPES:
+            # The client decompresses the declared length, then drops the last character
+            payload = zlib.compress((body + "\n").encode("utf-8"))
+            tail = MESSAGE_END
+        else:
+            # The client drops the final "\n"; the terminator goes after one more field
+            payload = body.encode("utf-8")
+            tail = SPLIT.encode() + MESSAGE_END
+        header = f"{CLIENT_VERSION}{SPLIT}{reply_type}{SPLIT}{len(payload):010d}".encode()
+        reply = header + payload + tail
+        self._count(bytes_sent=len(reply))
+        return reply
+
+    # --- Query handlers: (params echoed back, rows, fields) ---
+
+    def _k_data(self, params):
+        _, code, fields, start, end, frequency, adjustflag = params
+        market = self.market
+        rows = market.k_data(code, fields.split(","), _parse_date(start, date(2015, 1, 1)),
+                             _parse_date(end, market.as_of), frequency, adjustflag)
+        # The requested fields are already part of the echo
+        return params[1:], rows, []
+
+    def _trade_dates(self, params):
+        _, start, end = params
+        market = self.market
+        rows = market.trade_dates(_parse_date(start, date(2015, 1, 1)), _parse_date(end, market.calendar_end))
+        return params[1:], rows, ["calendar_date", "is_trading_day"]
+
+    def _all_stock(self, params):
+        _, day = params
+        market = self.market
+        on = _parse_date(day, market.as_of)
+        rows = []
+        if market.is_trading_day(on) and on <= market.as_of:
+            for sec in market.listed(on):
+                suspended = sec.kind == "1" and _hash(market.seed, sec.code, on) % 97 == 0
+                rows.append([sec.code, "0" if suspended else "1", sec.name])
+        return params[1:], rows, ["code", "tradeStatus", "code_name"]
+
+    def _stock_basic(self, params):
+        _, code, code_name = params
+        matches = [s for s in self.market.securities.values()
+                   if (code and s.code == code) or (not code and code_name and code_name in s.name)]
+        rows = [[s.code, s.name, s.ipo.isoformat(), "", s.kind, "1"] for s in matches]
+        return params[1:], rows, ["code", "code_name", "ipoDate", "outDate", "type", "status"]
+
+    def _stock_industry(self, params):
+        _, code, day = params
+        market = self.market
+        on = _parse_date(day, market.as_of)
+        updated = market._last_trading_on_or_before(on - timedelta(days=on.weekday())) or on
+        rows = [[updated.isoformat(), s.code, s.name, s.industry, "证监会行业分类" if s.industry else ""]
+                for s in market.listed(on) if s.kind == "1" and (not code or s.code == code)]
+        return params[1:], rows, ["updateDate", "code", "code_name", "industry", "industryClassification"]
+
+    def _constituents(self, params):
+        method, day = params
+        market = self.market
+        updated, members = market.constituents(method.split("_")[1], _parse_date(day, market.as_of))
+        rows = [[updated.isoformat(), s.code, s.name] for s in members]
+        return params[1:], rows, ["updateDate", "code", "code_name"]
+
+    def _report(self, params):
+        method, code, year, quarter = params
+        rows = self.market.report_rows(method, code, int(year), int(quarter))
+        return params[1:], rows, REPORT_FIELDS[method]
+
+    def _dividends(self, params):
+        _, code, year, year_type = params
+        return params[1:], self.market.dividend_rows(code, int(year), year_type), DIVIDEND_FIELDS
+
+    def _adjust_factor(self, params):
+        _, code, start, end = params
+        market = self.market
+        rows = market.adjust_factor_rows(code, _parse_date(start, FIRST_DAY), _parse_date(end, market.as_of))
+        return params[1:], rows, ADJUST_FACTOR_FIELDS
+
+    def _express(self, params):
+        _, code, start, end = params
+        market = self.market
+        rows = market.express_rows(code, _parse_date(start, date(2015, 1, 1)), _parse_date(end, market.as_of))
+        return params[1:], rows, EXPRESS_FIELDS
+
+    def _forecast(self, params):
+        _, code, start, end = params
+        market = self.market
+        rows = market.forecast_rows(code, _parse_date(start, date(2015, 1, 1)), _parse_date(end, market.as_of))
+        return params[1:], rows, FORECAST_FIELDS
+
+    def _rates(self, params):
+        method, start, end = params[:3]
+        fields, rows = self.market.rate_rows(method, start, end, params[3] if len(params) > 3 else "0")
+        return params[1:], rows, fields
+
+    def _money_supply(self, params):
+        method, start, end = params
+        fields, rows = self.market.money_supply_rows(method.endswith("month"), start, end)
+        return params[1:], rows, fields
+
+
+@contextmanager
+def patch_baostock(address: Tuple[str, int]):
+    """Points the `baostock` client in this process at `address` for the duration of the block."""
+    saved = bs_cons.BAOSTOCK_SERVER_IP, bs_cons.BAOSTOCK_SERVER_PORT
+    bs_cons.BAOSTOCK_SERVER_IP, bs_cons.BAOSTOCK_SERVER_PORT = address
+    try:
+        yield
+    finally:
+        bs_cons.BAOSTOCK_SERVER_IP, bs_cons.BAOSTOCK_SERVER_PORT = saved
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=10030)
+    parser.add_argument("--stocks", type=int, default=5000, help="number of synthetic stocks")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--as-of", default="", help="last date with data, YYYY-MM-DD (default today)")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of queries answered with an error code")
+    parser.add_argument("--error-codes", default="10005001", help="comma-separated codes to inject")
+    parser.add_argument("--reset-rate", type=float, default=0.0, help="share of queries answered with a TCP reset")
+    parser.add_argument("--session-ttl", type=float, default=0.0, help="seconds before a login expires (0 = never)")
+    args = parser.parse_args()
+
+    market = SyntheticMarket(stocks=args.stocks, seed=args.seed,
+                             as_of=date.fromisoformat(args.as_of) if args.as_of else None)
+    faults = FaultProfile(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        error_codes=tuple(c.strip() for c in args.error_codes.split(",") if c.strip()),
+        reset_rate=args.reset_rate, session_ttl=args.session_ttl, seed=args.seed)
+    server = FakeBaostockServer(market, faults, host=args.host, port=args.port)
+    host, port = server.address
+    print(f"Fake Baostock server on {host}:{port} ({args.stocks} stocks, data up to {market.as_of})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Load test of the MCP tool, use-case and formatting layers from a recorded session.
+
+First record the upstream calls of a scenario (a JSON list of
+{"tool": name, "args": {...}} objects, e.g. the tool calls of an agent
+session; a built-in mix is used without --scenario). This needs a reachable
+Baostock server, real or benchmarks/fake_baostock.py:
+
+    A_SHARE_MCP_BAOSTOCK_SERVER=127.0.0.1:10030 \\
+        python benchmarks/replay_load.py record --archive session.zip
+
+Then replay the scenario against the recording, many copies at once:
+
+    python benchmarks/replay_load.py replay --archive session.zip --concurrency 100 --rounds 5
+
+Tools are called in process through FastMCP.call_tool, exactly as the stdio
+transport would dispatch them. Other A_SHARE_MCP_* variables apply as usual;
+the K-line cache defaults to a throwaway directory.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import ServerSettings  # noqa: E402
+
+DEFAULT_SCENARIO = [
+    {"tool": "get_latest_trading_date", "args": {}},
+    {"tool": "get_market_analysis_timeframe", "args": {"period": "recent"}},
+    {"tool": "get_historical_k_data", "args": {"code": "sh.600000", "start_date": "2024-01-01",
+                                               "end_date": "2024-12-31", "limit": 60, "order": "latest"}},
+    {"tool": "get_stock_basic_info", "args": {"code": "sh.600000"}},
+    {"tool": "get_profit_data", "args": {"code": "sh.600000", "year": "2024", "quarter": 2}},
+    {"tool": "get_fina_indicator", "args": {"code": "sh.600000", "start_date": "2023-01-01", "end_date": "2024-06-30"}},
+    {"tool": "get_hs300_stocks", "args": {"limit": 50}},
+    {"tool": "get_stock_industry", "args": {"code": "sh.600000"}},
+    {"tool": "get_dividend_data", "args": {"code": "sh.600000", "year": "2024"}},
+    {"tool": "get_money_supply_data_month", "args": {"start_date": "2024-01", "end_date": "2024-06"}},
+]
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), math.ceil(q / 100 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def _report(line: str) -> None:
+    # mcp_server routes print() to the log; sys.stdout.buffer still reaches the terminal
+    sys.stdout.buffer.write((line + "\n").encode("utf-8"))
+    sys.stdout.buffer.flush()
+
+
+def _load_app(env: Dict[str, str]):
+    for key, value in env.items():
+        os.environ.setdefault(key, value)
+    os.environ.setdefault("A_SHARE_MCP_KLINE_CACHE_DIR", tempfile.mkdtemp(prefix="replay-kline-"))
+    import mcp_server
+    return mcp_server.create_server(ServerSettings.from_env())
+
+
+async def _call(app, call: dict, timings: Dict[str, List[float]], errors: Dict[str, int]) -> None:
+    started = time.perf_counter()
+    result = await app.call_tool(call["tool"], call.get("args", {}))
+    timings.setdefault(call["tool"], []).append((time.perf_counter() - started) * 1000)
+    if result and result[0].text.startswith("Error:"):
+        errors[call["tool"]] = errors.get(call["tool"], 0) + 1
+
+
+async def _record(args, scenario: List[dict]) -> None:
+    server = _load_app({"A_SHARE_MCP_RECORD_PATH": args.archive})
+    timings: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    for call in scenario:
+        await _call(server.app, call, timings, errors)
+    _report(f"Recorded {len(scenario)} tool calls ({sum(errors.values())} returned errors) to {args.archive}")
+
+
+async def _replay(args, scenario: List[dict]) -> None:
+    server = _load_app({
+        "A_SHARE_MCP_REPLAY_PATH": args.archive,
+        "A_SHARE_MCP_REPLAY_LATENCY_SCALE": str(args.latency_scale),
+        "A_SHARE_MCP_DATA_WORKERS": str(args.workers),
+    })
+    app = server.app
+    timings: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    # Warm-up pass, so the numbers below are steady state
+    for call in scenario:
+        await _call(app, call, {}, {})
+
+    limiter = asyncio.Semaphore(args.concurrency)
+
+    async def session() -> None:
+        async with limiter:
+            for call in scenario:
+                await _call(app, call, timings, errors)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(session() for _ in range(args.concurrency * args.rounds)))
+    elapsed = time.perf_counter() - started
+
+    total = sum(len(v) for v in timings.values())
+    everything = [t for v in timings.values() for t in v]
+    _report(f"{total} tool calls in {elapsed:.2f}s: {total / elapsed:.1f} calls/s at concurrency {args.concurrency}")
+    _report(f"{'tool':<34}{'calls':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    for tool, values in sorted(timings.items()) + [("(all)", everything)]:
+        errs = errors.get(tool, 0) if tool != "(all)" else sum(errors.values())
+        _report(f"{tool:<34}{len(values):>7}{percentile(values, 50):>9.1f}{percentile(values, 95):>9.1f}"
+              f"{percentile(values, 99):>9.1f}{errs:>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("--archive", required=True, help="recording archive (.zip)")
+    parser.add_argument("--scenario", help="JSON file with the tool calls of one session")
+    parser.add_argument("--concurrency", type=int, default=10, help="sessions replayed at once")
+    parser.add_argument("--rounds", type=int, default=3, help="batches of `concurrency` sessions")
+    parser.add_argument("--workers", type=int, default=16, help="data executor threads")
+    parser.add_argument("--latency-scale", type=float, default=0.0,
+                        help="replayed calls sleep this multiple of their recorded duration")
+    args = parser.parse_args()
+
+    scenario = DEFAULT_SCENARIO
+    if args.scenario:
+        with open(args.scenario, encoding="utf-8") as f:
+            scenario = json.load(f)
+    asyncio.run(_record(args, scenario) if args.mode == "record" else _replay(args, scenario))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,30 @@
 # Main MCP server file
+import atexit
 import logging
+import threading
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional
 
+import uvicorn
 from mcp.server.fastmcp import FastMCP
+from starlette.responses import PlainTextResponse
 
 # Import the interface and the concrete implementation
 from src.data_source_interface import FinancialDataSource
 from src.baostock_data_source import BaostockDataSource
-from src.utils import setup_logging
+from src.baostock_session import configure_server_address, get_default_session_manager
+from src.caching import CachedKLineDataSource, KLineCache, ResponseCacheDataSource, SnapshotDataSource
+from src.config import ServerSettings
+from src.pooled_data_source import PooledDataSource
+from src.profiling import configure_profiling
+from src.recording_data_source import RecordingDataSource, ReplayDataSource
+from src.services.server_stats import collect_server_stats, render_prometheus
+from src.services.report_periods import ReportPeriodIndex
+from src.services.tool_runner import configure_data_executor
+from src.services.trading_calendar import TradingCalendar
+from src.tracing import configure_tracing
+from src.utils import isolate_stdout, setup_logging
 
 # 导入各模块工具的注册函数
 from src.tools.stock_market import register_stock_market_tools
@@ -18,24 +35,100 @@ from src.tools.macroeconomic import register_macroeconomic_tools
 from src.tools.date_utils import register_date_utils_tools
 from src.tools.analysis import register_analysis_tools
 from src.tools.helpers import register_helpers_tools
+from src.tools.cache import register_cache_tools
+from src.tools.server_stats import register_server_stats_tools
 
-# --- Logging Setup ---
-# Call the setup function from utils
-# You can control the default level here (e.g., logging.DEBUG for more verbose logs)
-setup_logging(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# --- Dependency Injection ---
-# Instantiate the data source - easy to swap later if needed
-active_data_source: FinancialDataSource = BaostockDataSource()
+# The server is built on first use, never at import: pool workers are started
+# with spawn and import this file again, and must not rebuild the data source
+# chain and calendar. `app` is still looked up lazily as a module attribute
+# (see __getattr__) for `mcp dev` / `mcp install`.
+_default_server: Optional["Server"] = None
+_default_server_lock = threading.Lock()
 
-# --- Get current date for system prompt ---
-current_date = datetime.now().strftime("%Y-%m-%d")
 
-# --- FastMCP App Initialization ---
-app = FastMCP(
-    name="a_share_data_provider",
-    instructions=f"""今天是{current_date}。提供中国A股市场数据分析工具。此服务提供客观数据分析，用户需自行做出投资决策。数据分析基于公开市场信息，不构成投资建议，仅供参考。
+def build_data_source(settings: ServerSettings) -> FinancialDataSource:
+    """Instantiates the upstream data source described by the settings."""
+    if settings.replay_path:
+        return ReplayDataSource(settings.replay_path, latency_scale=settings.replay_latency_scale)
+    configure_server_address(settings.baostock_server)
+    if settings.pool_size > 1:
+        pool = PooledDataSource(
+            pool_size=settings.pool_size,
+            max_pending=settings.pool_max_pending or None,
+            queue_timeout=settings.pool_queue_timeout,
+            heartbeat_interval=settings.heartbeat_interval,
+            fina_concurrency=settings.fina_concurrency,
+            server_address=settings.baostock_server or None,
+        )
+        atexit.register(pool.close)
+        return pool
+    return BaostockDataSource(
+        get_default_session_manager(settings.heartbeat_interval),
+        fina_concurrency=settings.fina_concurrency,
+    )
+
+
+@dataclass
+class Server:
+    """The FastMCP app and the shared objects its tools were registered with."""
+    app: FastMCP
+    settings: ServerSettings
+    data_source: FinancialDataSource
+    trading_calendar: TradingCalendar
+    kline_cache: Optional[KLineCache]
+
+
+def create_server(settings: ServerSettings) -> Server:
+    """Wires the data source chain, caches and tools described by the settings into a FastMCP app."""
+    # --- Stdout Isolation ---
+    # stdout carries the JSON-RPC stream; move it out of print()'s reach once,
+    # before the stdio transport grabs it, so Baostock's prints end up in the log.
+    isolate_stdout()
+
+    if settings.trace or settings.trace_file:
+        configure_tracing(True, settings.trace_buffer_spans, settings.trace_file or None)
+    configure_profiling(settings.profile_tools, settings.profile_dir, settings.profile_top)
+
+    # --- Dependency Injection ---
+    active_data_source: FinancialDataSource = build_data_source(settings)
+    if settings.record_path:
+        # Recorded below the caches, so the archive holds what the upstream returned
+        active_data_source = RecordingDataSource(active_data_source, settings.record_path)
+        atexit.register(active_data_source.close)
+    if settings.response_cache:
+        active_data_source = ResponseCacheDataSource(
+            active_data_source,
+            memory_budget_bytes=settings.response_cache_memory_mb * 1024 * 1024,
+            disk_dir=settings.response_cache_dir or None,
+            max_negative_entries=settings.response_cache_negative_entries,
+        )
+    kline_cache = KLineCache(settings.kline_cache_dir) if settings.kline_cache else None
+    if kline_cache is not None:
+        active_data_source = CachedKLineDataSource(active_data_source, kline_cache)
+    if settings.snapshot_cache_entries > 0:
+        active_data_source = SnapshotDataSource(
+            active_data_source,
+            max_entries=settings.snapshot_cache_entries,
+            current_ttl=settings.snapshot_ttl,
+        )
+
+    # One trading calendar shared by the date tools and the analysis report
+    trading_calendar = TradingCalendar(active_data_source)
+    # Latest published report quarter per stock, for the reports built from quarterly data
+    report_periods = ReportPeriodIndex()
+
+    # Enough executor threads to keep every pool worker busy
+    configure_data_executor(max(settings.data_workers, settings.pool_size))
+
+    # --- Get current date for system prompt ---
+    current_date = datetime.now().strftime("%Y-%m-%d")
+
+    # --- FastMCP App Initialization ---
+    app = FastMCP(
+        name="a_share_data_provider",
+        instructions=f"""今天是{current_date}。提供中国A股市场数据分析工具。此服务提供客观数据分析，用户需自行做出投资决策。数据分析基于公开市场信息，不构成投资建议，仅供参考。
 
 ⚠️ 重要说明:
 1. 最新交易日不一定是今天，需要从 get_latest_trading_date() 获取
@@ -43,23 +136,78 @@ app = FastMCP(
 3. 当分析"最近"或"近期"市场情况时，必须首先调用 get_market_analysis_timeframe() 工具确定实际的分析时间范围
 4. 任何涉及日期的分析必须基于工具返回的实际数据，不得使用过时或假设的日期
 """,
-    # Specify dependencies for installation if needed (e.g., when using `mcp install`)
-    # dependencies=["baostock", "pandas"]
-)
-
-# --- 注册各模块的工具 ---
-register_stock_market_tools(app, active_data_source)
-register_financial_report_tools(app, active_data_source)
-register_index_tools(app, active_data_source)
-register_market_overview_tools(app, active_data_source)
-register_macroeconomic_tools(app, active_data_source)
-register_date_utils_tools(app, active_data_source)
-register_analysis_tools(app, active_data_source)
-register_helpers_tools(app)
+        # Specify dependencies for installation if needed (e.g., when using `mcp install`)
+        # dependencies=["baostock", "pandas"]
+    )
+
+    # --- 注册各模块的工具 ---
+    register_stock_market_tools(app, active_data_source, trading_calendar, settings.batch_concurrency)
+    register_financial_report_tools(app, active_data_source)
+    register_index_tools(app, active_data_source)
+    register_market_overview_tools(app, active_data_source)
+    register_macroeconomic_tools(app, active_data_source)
+    register_date_utils_tools(app, active_data_source, trading_calendar)
+    register_analysis_tools(app, active_data_source, trading_calendar, report_periods, settings.batch_concurrency)
+    register_helpers_tools(app)
+    register_cache_tools(app, kline_cache)
+    register_server_stats_tools(app, active_data_source, trading_calendar)
+
+    return Server(app, settings, active_data_source, trading_calendar, kline_cache)
+
+
+def get_default_server() -> Server:
+    """The server described by the environment, created on first use."""
+    global _default_server
+    with _default_server_lock:
+        if _default_server is None:
+            # --- Logging Setup ---
+            # You can control the default level here (e.g., logging.DEBUG for more verbose logs)
+            setup_logging(level=logging.INFO)
+            _default_server = create_server(ServerSettings.from_env())
+        return _default_server
+
+
+def __getattr__(name: str):
+    # `mcp dev mcp_server.py` / `mcp install` import this file and look for `app`
+    if name == "app":
+        return get_default_server().app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def run_sse(server: Server) -> None:
+    """Serves the MCP SSE transport over HTTP, plus the metrics endpoint if configured."""
+    app = server.app
+
+    async def metrics_endpoint(request):
+        """Prometheus text exposition of the same counters get_server_stats reports."""
+        stats = collect_server_stats(server.data_source, server.trading_calendar)
+        return PlainTextResponse(render_prometheus(stats), media_type="text/plain; version=0.0.4")
+
+    http_app = app.sse_app()
+    if server.settings.metrics_path:
+        http_app.add_route(server.settings.metrics_path, metrics_endpoint, methods=["GET"])
+    uvicorn.run(http_app, host=app.settings.host, port=app.settings.port,
+                log_level=app.settings.log_level.lower())
+
+
+def main() -> None:
+    server = get_default_server()
+    settings = server.settings
+    app = server.app
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    if settings.transport == "sse":
+        logger.info(
+            f"Starting A-Share MCP Server via SSE on {app.settings.host}:{app.settings.port}... Today is {current_date}")
+        run_sse(server)
+    elif settings.transport == "stdio":
+        logger.info(
+            f"Starting A-Share MCP Server via stdio... Today is {current_date}")
+        # Run the server using stdio transport, suitable for MCP Hosts like Claude Desktop
+        app.run(transport='stdio')
+    else:
+        raise ValueError(f"Unknown transport '{settings.transport}'. Valid options are: ['stdio', 'sse']")
+
 
 # --- Main Execution Block ---
 if __name__ == "__main__":
-    logger.info(
-        f"Starting A-Share MCP Server via stdio... Today is {current_date}")
-    # Run the server using stdio transport, suitable for MCP Hosts like Claude Desktop
-    app.run(transport='stdio')
+    main()
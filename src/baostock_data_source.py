@@ -4,7 +4,10 @@ import pandas as pd
 from typing import List, Optional
 import logging
 from .data_source_interface import FinancialDataSource, DataSourceError, NoDataFoundError, LoginError
-from .utils import baostock_login_context
+from .baostock_session import BaostockSessionManager, get_default_session_manager
+from .fina_indicator import DEFAULT_FINA_CONCURRENCY, aggregate_fina_indicator
+from .ingest import read_result_set
+from .tracing import traced
 
 # Get a logger instance for this module
 logger = logging.getLogger(__name__)
@@ -24,18 +27,19 @@ DEFAULT_BASIC_FIELDS = [
 
 
 def _fetch_financial_data(
+    session: BaostockSessionManager,
     bs_query_func,
     data_type_name: str,
     code: str,
     year: str,
     quarter: int
 ) -> pd.DataFrame:
-    logger.info(
+    logger.debug(
         f"Fetching {data_type_name} data for {code}, year={year}, quarter={quarter}")
     try:
-        with baostock_login_context():
+        with session.acquire():
             # Assuming all these functions take code, year, quarter
-            rs = bs_query_func(code=code, year=year, quarter=quarter)
+            rs = session.query(bs_query_func, code=code, year=year, quarter=quarter)
 
             if rs.error_code != '0':
                 logger.error(
@@ -47,23 +51,20 @@ def _fetch_financial_data(
                     raise DataSourceError(
                         f"Baostock API error fetching {data_type_name} data: {rs.error_msg} (code: {rs.error_code})")
 
-            data_list = []
-            while rs.next():
-                data_list.append(rs.get_row_data())
+            result_df = read_result_set(rs, "financial", bs_query_func.__name__)
 
-            if not data_list:
+            if result_df.empty:
                 logger.warning(
                     f"No {data_type_name} data found for {code}, {year}Q{quarter} (empty result set from Baostock).")
                 raise NoDataFoundError(
                     f"No {data_type_name} data found for {code}, {year}Q{quarter} (empty result set).")
 
-            result_df = pd.DataFrame(data_list, columns=rs.fields)
-            logger.info(
+            logger.debug(
                 f"Retrieved {len(result_df)} {data_type_name} records for {code}, {year}Q{quarter}.")
             return result_df
 
     except (LoginError, NoDataFoundError, DataSourceError, ValueError) as e:
-        logger.warning(
+        logger.debug(
             f"Caught known error fetching {data_type_name} data for {code}: {type(e).__name__}")
         raise e
     except Exception as e:
@@ -76,16 +77,17 @@ def _fetch_financial_data(
 
 
 def _fetch_index_constituent_data(
+    session: BaostockSessionManager,
     bs_query_func,
     index_name: str,
     date: Optional[str] = None
 ) -> pd.DataFrame:
-    logger.info(
+    logger.debug(
         f"Fetching {index_name} constituents for date={date or 'latest'}")
     try:
-        with baostock_login_context():
+        with session.acquire():
             # date is optional, defaults to latest
-            rs = bs_query_func(date=date)
+            rs = session.query(bs_query_func, date=date)
 
             if rs.error_code != '0':
                 logger.error(
@@ -97,23 +99,20 @@ def _fetch_index_constituent_data(
                     raise DataSourceError(
                         f"Baostock API error fetching {index_name} constituents: {rs.error_msg} (code: {rs.error_code})")
 
-            data_list = []
-            while rs.next():
-                data_list.append(rs.get_row_data())
+            result_df = read_result_set(rs, "constituents", bs_query_func.__name__)
 
-            if not data_list:
+            if result_df.empty:
                 logger.warning(
                     f"No {index_name} constituent data found for date {date} (empty result set).")
                 raise NoDataFoundError(
                     f"No {index_name} constituent data found for date {date} (empty result set).")
 
-            result_df = pd.DataFrame(data_list, columns=rs.fields)
-            logger.info(
+            logger.debug(
                 f"Retrieved {len(result_df)} {index_name} constituents for date {date or 'latest'}.")
             return result_df
 
     except (LoginError, NoDataFoundError, DataSourceError, ValueError) as e:
-        logger.warning(
+        logger.debug(
             f"Caught known error fetching {index_name} constituents for date {date}: {type(e).__name__}")
         raise e
     except Exception as e:
@@ -126,6 +125,7 @@ def _fetch_index_constituent_data(
 
 
 def _fetch_macro_data(
+    session: BaostockSessionManager,
     bs_query_func,
     data_type_name: str,
     start_date: Optional[str] = None,
@@ -134,10 +134,10 @@ def _fetch_macro_data(
 ) -> pd.DataFrame:
     date_range_log = f"from {start_date or 'default'} to {end_date or 'default'}"
     kwargs_log = f", extra_args={kwargs}" if kwargs else ""
-    logger.info(f"Fetching {data_type_name} data {date_range_log}{kwargs_log}")
+    logger.debug(f"Fetching {data_type_name} data {date_range_log}{kwargs_log}")
     try:
-        with baostock_login_context():
-            rs = bs_query_func(start_date=start_date,
+        with session.acquire():
+            rs = session.query(bs_query_func, start_date=start_date,
                                end_date=end_date, **kwargs)
 
             if rs.error_code != '0':
@@ -150,23 +150,20 @@ def _fetch_macro_data(
                     raise DataSourceError(
                         f"Baostock API error fetching {data_type_name} data: {rs.error_msg} (code: {rs.error_code})")
 
-            data_list = []
-            while rs.next():
-                data_list.append(rs.get_row_data())
+            result_df = read_result_set(rs, "macro", bs_query_func.__name__)
 
-            if not data_list:
+            if result_df.empty:
                 logger.warning(
                     f"No {data_type_name} data found for the specified criteria (empty result set).")
                 raise NoDataFoundError(
                     f"No {data_type_name} data found for the specified criteria (empty result set).")
 
-            result_df = pd.DataFrame(data_list, columns=rs.fields)
-            logger.info(
+            logger.debug(
                 f"Retrieved {len(result_df)} {data_type_name} records.")
             return result_df
 
     except (LoginError, NoDataFoundError, DataSourceError, ValueError) as e:
-        logger.warning(
+        logger.debug(
             f"Caught known error fetching {data_type_name} data: {type(e).__name__}")
         raise e
     except Exception as e:
@@ -179,8 +176,24 @@ def _fetch_macro_data(
 class BaostockDataSource(FinancialDataSource):
     """
     Concrete implementation of FinancialDataSource using the Baostock library.
+
+    All queries share one long-lived Baostock login managed by a
+    BaostockSessionManager instead of logging in and out around every call.
     """
 
+    def __init__(
+        self,
+        session: Optional[BaostockSessionManager] = None,
+        fina_concurrency: int = DEFAULT_FINA_CONCURRENCY,
+    ):
+        self._session = session or get_default_session_manager()
+        self._fina_concurrency = fina_concurrency
+
+    @property
+    def session(self) -> BaostockSessionManager:
+        """The Baostock session manager backing this data source."""
+        return self._session
+
     def _format_fields(self, fields: Optional[List[str]], default_fields: List[str]) -> str:
         """Formats the list of fields into a comma-separated string for Baostock."""
         if fields is None or not fields:
@@ -193,6 +206,7 @@ class BaostockDataSource(FinancialDataSource):
         logger.debug(f"Using requested fields: {fields}")
         return ",".join(fields)
 
+    @traced("data_source")
     def get_historical_k_data(
         self,
         code: str,
@@ -201,17 +215,20 @@ class BaostockDataSource(FinancialDataSource):
         frequency: str = "d",
         adjust_flag: str = "3",
         fields: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        order: str = "first",
     ) -> pd.DataFrame:
         """Fetches historical K-line data using Baostock."""
-        logger.info(
+        logger.debug(
             f"Fetching K-data for {code} ({start_date} to {end_date}), freq={frequency}, adjust={adjust_flag}")
         try:
             formatted_fields = self._format_fields(fields, DEFAULT_K_FIELDS)
             logger.debug(
                 f"Requesting fields from Baostock: {formatted_fields}")
 
-            with baostock_login_context():
-                rs = bs.query_history_k_data_plus(
+            with self._session.acquire():
+                rs = self._session.query(
+                    bs.query_history_k_data_plus,
                     code,
                     formatted_fields,
                     start_date=start_date,
@@ -231,24 +248,20 @@ class BaostockDataSource(FinancialDataSource):
                         raise DataSourceError(
                             f"Baostock API error fetching K-data: {rs.error_msg} (code: {rs.error_code})")
 
-                data_list = []
-                while rs.next():
-                    data_list.append(rs.get_row_data())
+                result_df = read_result_set(rs, "k_data", "query_history_k_data_plus", limit=limit, order=order)
 
-                if not data_list:
+                if result_df.empty:
                     logger.warning(
                         f"No historical data found for {code} in range (empty result set from Baostock).")
                     raise NoDataFoundError(
                         f"No historical data found for {code} in the specified range (empty result set).")
 
-                # Crucial: Use rs.fields for column names
-                result_df = pd.DataFrame(data_list, columns=rs.fields)
-                logger.info(f"Retrieved {len(result_df)} records for {code}.")
+                logger.debug(f"Retrieved {len(result_df)} records for {code}.")
                 return result_df
 
         except (LoginError, NoDataFoundError, DataSourceError, ValueError) as e:
             # Re-raise known errors
-            logger.warning(
+            logger.debug(
                 f"Caught known error fetching K-data for {code}: {type(e).__name__}")
             raise e
         except Exception as e:
@@ -259,9 +272,10 @@ class BaostockDataSource(FinancialDataSource):
             raise DataSourceError(
                 f"Unexpected error fetching K-data for {code}: {e}")
 
+    @traced("data_source")
     def get_stock_basic_info(self, code: str, fields: Optional[List[str]] = None) -> pd.DataFrame:
         """Fetches basic stock information using Baostock."""
-        logger.info(f"Fetching basic info for {code}")
+        logger.debug(f"Fetching basic info for {code}")
         try:
             # Note: query_stock_basic doesn't seem to have a fields parameter in docs,
             # but we keep the signature consistent. It returns a fixed set.
@@ -269,10 +283,10 @@ class BaostockDataSource(FinancialDataSource):
             logger.debug(
                 f"Requesting basic info for {code}. Optional fields requested: {fields}")
 
-            with baostock_login_context():
+            with self._session.acquire():
                 # Example: Fetch basic info; adjust API call if needed based on baostock docs
                 # rs = bs.query_stock_basic(code=code, code_name=code_name) # If supporting name lookup
-                rs = bs.query_stock_basic(code=code)
+                rs = self._session.query(bs.query_stock_basic, code=code)
 
                 if rs.error_code != '0':
                     logger.error(
@@ -284,19 +298,15 @@ class BaostockDataSource(FinancialDataSource):
                         raise DataSourceError(
                             f"Baostock API error fetching basic info: {rs.error_msg} (code: {rs.error_code})")
 
-                data_list = []
-                while rs.next():
-                    data_list.append(rs.get_row_data())
+                result_df = read_result_set(rs, "basic", "query_stock_basic")
 
-                if not data_list:
+                if result_df.empty:
                     logger.warning(
                         f"No basic info found for {code} (empty result set from Baostock).")
                     raise NoDataFoundError(
                         f"No basic info found for {code} (empty result set).")
 
-                # Crucial: Use rs.fields for column names
-                result_df = pd.DataFrame(data_list, columns=rs.fields)
-                logger.info(
+                logger.debug(
                     f"Retrieved basic info for {code}. Columns: {result_df.columns.tolist()}")
 
                 # Optional: Select subset of columns if `fields` argument was provided
@@ -313,7 +323,7 @@ class BaostockDataSource(FinancialDataSource):
                 return result_df
 
         except (LoginError, NoDataFoundError, DataSourceError, ValueError) as e:
-            logger.warning(
+            logger.debug(
                 f"Caught known error fetching basic info for {code}: {type(e).__name__}")
             raise e
         except Exception as e:
@@ -322,14 +332,15 @@ class BaostockDataSource(FinancialDataSource):
             raise DataSourceError(
                 f"Unexpected error fetching basic info for {code}: {e}")
 
+    @traced("data_source")
     def get_dividend_data(self, code: str, year: str, year_type: str = "report") -> pd.DataFrame:
         """Fetches dividend information using Baostock."""
-        logger.info(
+        logger.debug(
             f"Fetching dividend data for {code}, year={year}, year_type={year_type}")
         try:
-            with baostock_login_context():
-                rs = bs.query_dividend_data(
-                    code=code, year=year, yearType=year_type)
+            with self._session.acquire():
+                rs = self._session.query(
+                    bs.query_dividend_data, code=code, year=year, yearType=year_type)
 
                 if rs.error_code != '0':
                     logger.error(
@@ -341,23 +352,20 @@ class BaostockDataSource(FinancialDataSource):
                         raise DataSourceError(
                             f"Baostock API error fetching dividend data: {rs.error_msg} (code: {rs.error_code})")
 
-                data_list = []
-                while rs.next():
-                    data_list.append(rs.get_row_data())
+                result_df = read_result_set(rs, "dividend", "query_dividend_data")
 
-                if not data_list:
+                if result_df.empty:
                     logger.warning(
                         f"No dividend data found for {code}, year {year} (empty result set from Baostock).")
                     raise NoDataFoundError(
                         f"No dividend data found for {code}, year {year} (empty result set).")
 
-                result_df = pd.DataFrame(data_list, columns=rs.fields)
-                logger.info(
+                logger.debug(
                     f"Retrieved {len(result_df)} dividend records for {code}, year {year}.")
                 return result_df
 
         except (LoginError, NoDataFoundError, DataSourceError, ValueError) as e:
-            logger.warning(
+            logger.debug(
                 f"Caught known error fetching dividend data for {code}: {type(e).__name__}")
             raise e
         except Exception as e:
@@ -366,14 +374,15 @@ class BaostockDataSource(FinancialDataSource):
             raise DataSourceError(
                 f"Unexpected error fetching dividend data for {code}: {e}")
 
+    @traced("data_source")
     def get_adjust_factor_data(self, code: str, start_date: str, end_date: str) -> pd.DataFrame:
         """Fetches adjustment factor data using Baostock."""
-        logger.info(
+        logger.debug(
             f"Fetching adjustment factor data for {code} ({start_date} to {end_date})")
         try:
-            with baostock_login_context():
-                rs = bs.query_adjust_factor(
-                    code=code, start_date=start_date, end_date=end_date)
+            with self._session.acquire():
+                rs = self._session.query(
+                    bs.query_adjust_factor, code=code, start_date=start_date, end_date=end_date)
 
                 if rs.error_code != '0':
                     logger.error(
@@ -385,23 +394,20 @@ class BaostockDataSource(FinancialDataSource):
                         raise DataSourceError(
                             f"Baostock API error fetching adjust factor data: {rs.error_msg} (code: {rs.error_code})")
 
-                data_list = []
-                while rs.next():
-                    data_list.append(rs.get_row_data())
+                result_df = read_result_set(rs, "adjust_factor", "query_adjust_factor")
 
-                if not data_list:
+                if result_df.empty:
                     logger.warning(
                         f"No adjustment factor data found for {code} in range (empty result set from Baostock).")
                     raise NoDataFoundError(
                         f"No adjustment factor data found for {code} in the specified range (empty result set).")
 
-                result_df = pd.DataFrame(data_list, columns=rs.fields)
-                logger.info(
+                logger.debug(
                     f"Retrieved {len(result_df)} adjustment factor records for {code}.")
                 return result_df
 
         except (LoginError, NoDataFoundError, DataSourceError, ValueError) as e:
-            logger.warning(
+            logger.debug(
                 f"Caught known error fetching adjust factor data for {code}: {type(e).__name__}")
             raise e
         except Exception as e:
@@ -410,38 +416,45 @@ class BaostockDataSource(FinancialDataSource):
             raise DataSourceError(
                 f"Unexpected error fetching adjust factor data for {code}: {e}")
 
+    @traced("data_source")
     def get_profit_data(self, code: str, year: str, quarter: int) -> pd.DataFrame:
         """Fetches quarterly profitability data using Baostock."""
-        return _fetch_financial_data(bs.query_profit_data, "Profitability", code, year, quarter)
+        return _fetch_financial_data(self._session, bs.query_profit_data, "Profitability", code, year, quarter)
 
+    @traced("data_source")
     def get_operation_data(self, code: str, year: str, quarter: int) -> pd.DataFrame:
         """Fetches quarterly operation capability data using Baostock."""
-        return _fetch_financial_data(bs.query_operation_data, "Operation Capability", code, year, quarter)
+        return _fetch_financial_data(self._session, bs.query_operation_data, "Operation Capability", code, year, quarter)
 
+    @traced("data_source")
     def get_growth_data(self, code: str, year: str, quarter: int) -> pd.DataFrame:
         """Fetches quarterly growth capability data using Baostock."""
-        return _fetch_financial_data(bs.query_growth_data, "Growth Capability", code, year, quarter)
+        return _fetch_financial_data(self._session, bs.query_growth_data, "Growth Capability", code, year, quarter)
 
+    @traced("data_source")
     def get_balance_data(self, code: str, year: str, quarter: int) -> pd.DataFrame:
         """Fetches quarterly balance sheet data (solvency) using Baostock."""
-        return _fetch_financial_data(bs.query_balance_data, "Balance Sheet", code, year, quarter)
+        return _fetch_financial_data(self._session, bs.query_balance_data, "Balance Sheet", code, year, quarter)
 
+    @traced("data_source")
     def get_cash_flow_data(self, code: str, year: str, quarter: int) -> pd.DataFrame:
         """Fetches quarterly cash flow data using Baostock."""
-        return _fetch_financial_data(bs.query_cash_flow_data, "Cash Flow", code, year, quarter)
+        return _fetch_financial_data(self._session, bs.query_cash_flow_data, "Cash Flow", code, year, quarter)
 
+    @traced("data_source")
     def get_dupont_data(self, code: str, year: str, quarter: int) -> pd.DataFrame:
         """Fetches quarterly DuPont analysis data using Baostock."""
-        return _fetch_financial_data(bs.query_dupont_data, "DuPont Analysis", code, year, quarter)
+        return _fetch_financial_data(self._session, bs.query_dupont_data, "DuPont Analysis", code, year, quarter)
 
+    @traced("data_source")
     def get_performance_express_report(self, code: str, start_date: str, end_date: str) -> pd.DataFrame:
         """Fetches performance express reports (业绩快报) using Baostock."""
-        logger.info(
+        logger.debug(
             f"Fetching Performance Express Report for {code} ({start_date} to {end_date})")
         try:
-            with baostock_login_context():
-                rs = bs.query_performance_express_report(
-                    code=code, start_date=start_date, end_date=end_date)
+            with self._session.acquire():
+                rs = self._session.query(
+                    bs.query_performance_express_report, code=code, start_date=start_date, end_date=end_date)
 
                 if rs.error_code != '0':
                     logger.error(
@@ -453,23 +466,20 @@ class BaostockDataSource(FinancialDataSource):
                         raise DataSourceError(
                             f"Baostock API error fetching performance express report: {rs.error_msg} (code: {rs.error_code})")
 
-                data_list = []
-                while rs.next():
-                    data_list.append(rs.get_row_data())
+                result_df = read_result_set(rs, "performance_express", "query_performance_express_report")
 
-                if not data_list:
+                if result_df.empty:
                     logger.warning(
                         f"No performance express report found for {code} in range {start_date}-{end_date} (empty result set).")
                     raise NoDataFoundError(
                         f"No performance express report found for {code} in range {start_date}-{end_date} (empty result set).")
 
-                result_df = pd.DataFrame(data_list, columns=rs.fields)
-                logger.info(
+                logger.debug(
                     f"Retrieved {len(result_df)} performance express report records for {code}.")
                 return result_df
 
         except (LoginError, NoDataFoundError, DataSourceError, ValueError) as e:
-            logger.warning(
+            logger.debug(
                 f"Caught known error fetching performance express report for {code}: {type(e).__name__}")
             raise e
         except Exception as e:
@@ -478,14 +488,15 @@ class BaostockDataSource(FinancialDataSource):
             raise DataSourceError(
                 f"Unexpected error fetching performance express report for {code}: {e}")
 
+    @traced("data_source")
     def get_forecast_report(self, code: str, start_date: str, end_date: str) -> pd.DataFrame:
         """Fetches performance forecast reports (业绩预告) using Baostock."""
-        logger.info(
+        logger.debug(
             f"Fetching Performance Forecast Report for {code} ({start_date} to {end_date})")
         try:
-            with baostock_login_context():
-                rs = bs.query_forecast_report(
-                    code=code, start_date=start_date, end_date=end_date)
+            with self._session.acquire():
+                rs = self._session.query(
+                    bs.query_forecast_report, code=code, start_date=start_date, end_date=end_date)
                 # Note: Baostock docs mention pagination for this, but the Python API doesn't seem to expose it directly.
                 # We fetch all available pages in the loop below.
 
@@ -499,23 +510,20 @@ class BaostockDataSource(FinancialDataSource):
                         raise DataSourceError(
                             f"Baostock API error fetching performance forecast report: {rs.error_msg} (code: {rs.error_code})")
 
-                data_list = []
-                while rs.next():  # Loop should handle pagination implicitly if rs manages it
-                    data_list.append(rs.get_row_data())
+                result_df = read_result_set(rs, "forecast", "query_forecast_report")
 
-                if not data_list:
+                if result_df.empty:
                     logger.warning(
                         f"No performance forecast report found for {code} in range {start_date}-{end_date} (empty result set).")
                     raise NoDataFoundError(
                         f"No performance forecast report found for {code} in range {start_date}-{end_date} (empty result set).")
 
-                result_df = pd.DataFrame(data_list, columns=rs.fields)
-                logger.info(
+                logger.debug(
                     f"Retrieved {len(result_df)} performance forecast report records for {code}.")
                 return result_df
 
         except (LoginError, NoDataFoundError, DataSourceError, ValueError) as e:
-            logger.warning(
+            logger.debug(
                 f"Caught known error fetching performance forecast report for {code}: {type(e).__name__}")
             raise e
         except Exception as e:
@@ -524,13 +532,20 @@ class BaostockDataSource(FinancialDataSource):
             raise DataSourceError(
                 f"Unexpected error fetching performance forecast report for {code}: {e}")
 
-    def get_stock_industry(self, code: Optional[str] = None, date: Optional[str] = None) -> pd.DataFrame:
+    @traced("data_source")
+    def get_stock_industry(
+        self,
+        code: Optional[str] = None,
+        date: Optional[str] = None,
+        limit: Optional[int] = None,
+        order: str = "first",
+    ) -> pd.DataFrame:
         """Fetches industry classification using Baostock."""
         log_msg = f"Fetching industry data for code={code or 'all'}, date={date or 'latest'}"
-        logger.info(log_msg)
+        logger.debug(log_msg)
         try:
-            with baostock_login_context():
-                rs = bs.query_stock_industry(code=code, date=date)
+            with self._session.acquire():
+                rs = self._session.query(bs.query_stock_industry, code=code, date=date)
 
                 if rs.error_code != '0':
                     logger.error(
@@ -542,23 +557,20 @@ class BaostockDataSource(FinancialDataSource):
                         raise DataSourceError(
                             f"Baostock API error fetching industry data: {rs.error_msg} (code: {rs.error_code})")
 
-                data_list = []
-                while rs.next():
-                    data_list.append(rs.get_row_data())
+                result_df = read_result_set(rs, "industry", "query_stock_industry", limit=limit, order=order)
 
-                if not data_list:
+                if result_df.empty:
                     logger.warning(
                         f"No industry data found for {code}, {date} (empty result set).")
                     raise NoDataFoundError(
                         f"No industry data found for {code}, {date} (empty result set).")
 
-                result_df = pd.DataFrame(data_list, columns=rs.fields)
-                logger.info(
+                logger.debug(
                     f"Retrieved {len(result_df)} industry records for {code or 'all'}, {date or 'latest'}.")
                 return result_df
 
         except (LoginError, NoDataFoundError, DataSourceError, ValueError) as e:
-            logger.warning(
+            logger.debug(
                 f"Caught known error fetching industry data for {code}, {date}: {type(e).__name__}")
             raise e
         except Exception as e:
@@ -567,26 +579,30 @@ class BaostockDataSource(FinancialDataSource):
             raise DataSourceError(
                 f"Unexpected error fetching industry data for {code}, {date}: {e}")
 
+    @traced("data_source")
     def get_sz50_stocks(self, date: Optional[str] = None) -> pd.DataFrame:
         """Fetches SZSE 50 index constituents using Baostock."""
-        return _fetch_index_constituent_data(bs.query_sz50_stocks, "SZSE 50", date)
+        return _fetch_index_constituent_data(self._session, bs.query_sz50_stocks, "SZSE 50", date)
 
+    @traced("data_source")
     def get_hs300_stocks(self, date: Optional[str] = None) -> pd.DataFrame:
         """Fetches CSI 300 index constituents using Baostock."""
-        return _fetch_index_constituent_data(bs.query_hs300_stocks, "CSI 300", date)
+        return _fetch_index_constituent_data(self._session, bs.query_hs300_stocks, "CSI 300", date)
 
+    @traced("data_source")
     def get_zz500_stocks(self, date: Optional[str] = None) -> pd.DataFrame:
         """Fetches CSI 500 index constituents using Baostock."""
-        return _fetch_index_constituent_data(bs.query_zz500_stocks, "CSI 500", date)
+        return _fetch_index_constituent_data(self._session, bs.query_zz500_stocks, "CSI 500", date)
 
+    @traced("data_source")
     def get_trade_dates(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
         """Fetches trading dates using Baostock."""
-        logger.info(
+        logger.debug(
             f"Fetching trade dates from {start_date or 'default'} to {end_date or 'default'}")
         try:
-            with baostock_login_context():  # Login might not be strictly needed for this, but keeping consistent
-                rs = bs.query_trade_dates(
-                    start_date=start_date, end_date=end_date)
+            with self._session.acquire():
+                rs = self._session.query(
+                    bs.query_trade_dates, start_date=start_date, end_date=end_date)
 
                 if rs.error_code != '0':
                     logger.error(
@@ -595,23 +611,20 @@ class BaostockDataSource(FinancialDataSource):
                     raise DataSourceError(
                         f"Baostock API error fetching trade dates: {rs.error_msg} (code: {rs.error_code})")
 
-                data_list = []
-                while rs.next():
-                    data_list.append(rs.get_row_data())
+                result_df = read_result_set(rs, "trade_dates", "query_trade_dates")
 
-                if not data_list:
+                if result_df.empty:
                     # This case should ideally not happen if the API returns a valid range
                     logger.warning(
                         f"No trade dates returned for range {start_date}-{end_date} (empty result set).")
                     raise NoDataFoundError(
                         f"No trade dates found for range {start_date}-{end_date} (empty result set).")
 
-                result_df = pd.DataFrame(data_list, columns=rs.fields)
-                logger.info(f"Retrieved {len(result_df)} trade date records.")
+                logger.debug(f"Retrieved {len(result_df)} trade date records.")
                 return result_df
 
         except (LoginError, NoDataFoundError, DataSourceError, ValueError) as e:
-            logger.warning(
+            logger.debug(
                 f"Caught known error fetching trade dates: {type(e).__name__}")
             raise e
         except Exception as e:
@@ -619,12 +632,13 @@ class BaostockDataSource(FinancialDataSource):
             raise DataSourceError(
                 f"Unexpected error fetching trade dates: {e}")
 
-    def get_all_stock(self, date: Optional[str] = None) -> pd.DataFrame:
+    @traced("data_source")
+    def get_all_stock(self, date: Optional[str] = None, limit: Optional[int] = None, order: str = "first") -> pd.DataFrame:
         """Fetches all stock list for a given date using Baostock."""
-        logger.info(f"Fetching all stock list for date={date or 'default'}")
+        logger.debug(f"Fetching all stock list for date={date or 'default'}")
         try:
-            with baostock_login_context():
-                rs = bs.query_all_stock(day=date)
+            with self._session.acquire():
+                rs = self._session.query(bs.query_all_stock, day=date)
 
                 if rs.error_code != '0':
                     logger.error(
@@ -636,23 +650,20 @@ class BaostockDataSource(FinancialDataSource):
                         raise DataSourceError(
                             f"Baostock API error fetching all stock list: {rs.error_msg} (code: {rs.error_code})")
 
-                data_list = []
-                while rs.next():
-                    data_list.append(rs.get_row_data())
+                result_df = read_result_set(rs, "all_stock", "query_all_stock", limit=limit, order=order)
 
-                if not data_list:
+                if result_df.empty:
                     logger.warning(
                         f"No stock list returned for date {date} (empty result set).")
                     raise NoDataFoundError(
                         f"No stock list found for date {date} (empty result set).")
 
-                result_df = pd.DataFrame(data_list, columns=rs.fields)
-                logger.info(
+                logger.debug(
                     f"Retrieved {len(result_df)} stock records for date {date or 'default'}.")
                 return result_df
 
         except (LoginError, NoDataFoundError, DataSourceError, ValueError) as e:
-            logger.warning(
+            logger.debug(
                 f"Caught known error fetching all stock list for date {date}: {type(e).__name__}")
             raise e
         except Exception as e:
@@ -661,29 +672,35 @@ class BaostockDataSource(FinancialDataSource):
             raise DataSourceError(
                 f"Unexpected error fetching all stock list for date {date}: {e}")
 
+    @traced("data_source")
     def get_deposit_rate_data(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
         """Fetches benchmark deposit rates using Baostock."""
-        return _fetch_macro_data(bs.query_deposit_rate_data, "Deposit Rate", start_date, end_date)
+        return _fetch_macro_data(self._session, bs.query_deposit_rate_data, "Deposit Rate", start_date, end_date)
 
+    @traced("data_source")
     def get_loan_rate_data(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
         """Fetches benchmark loan rates using Baostock."""
-        return _fetch_macro_data(bs.query_loan_rate_data, "Loan Rate", start_date, end_date)
+        return _fetch_macro_data(self._session, bs.query_loan_rate_data, "Loan Rate", start_date, end_date)
 
+    @traced("data_source")
     def get_required_reserve_ratio_data(self, start_date: Optional[str] = None, end_date: Optional[str] = None, year_type: str = '0') -> pd.DataFrame:
         """Fetches required reserve ratio data using Baostock."""
         # Note the extra yearType parameter handled by kwargs
-        return _fetch_macro_data(bs.query_required_reserve_ratio_data, "Required Reserve Ratio", start_date, end_date, yearType=year_type)
+        return _fetch_macro_data(self._session, bs.query_required_reserve_ratio_data, "Required Reserve Ratio", start_date, end_date, yearType=year_type)
 
+    @traced("data_source")
     def get_money_supply_data_month(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
         """Fetches monthly money supply data (M0, M1, M2) using Baostock."""
         # Baostock expects YYYY-MM format for dates here
-        return _fetch_macro_data(bs.query_money_supply_data_month, "Monthly Money Supply", start_date, end_date)
+        return _fetch_macro_data(self._session, bs.query_money_supply_data_month, "Monthly Money Supply", start_date, end_date)
 
+    @traced("data_source")
     def get_money_supply_data_year(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
         """Fetches yearly money supply data (M0, M1, M2 - year end balance) using Baostock."""
         # Baostock expects YYYY format for dates here
-        return _fetch_macro_data(bs.query_money_supply_data_year, "Yearly Money Supply", start_date, end_date)
+        return _fetch_macro_data(self._session, bs.query_money_supply_data_year, "Yearly Money Supply", start_date, end_date)
 
+    @traced("data_source")
     def get_fina_indicator(self, code: str, start_date: str, end_date: str) -> pd.DataFrame:
         """
         Fetches comprehensive financial indicators by aggregating multiple Baostock APIs.
@@ -695,105 +712,17 @@ class BaostockDataSource(FinancialDataSource):
         - Balance Sheet/Solvency (偿债能力)
         - Cash Flow (现金流量)
         - DuPont Analysis (杜邦分析)
-        """
-        logger.info(f"Fetching aggregated financial indicators for {code} ({start_date} to {end_date})")
-
-        # 解析日期范围，获取年份列表
-        from datetime import datetime
-        try:
-            start = datetime.strptime(start_date, "%Y-%m-%d")
-            end = datetime.strptime(end_date, "%Y-%m-%d")
-        except ValueError:
-            raise ValueError(f"Invalid date format. Expected YYYY-MM-DD, got {start_date} to {end_date}")
-
-        years = set(str(y) for y in range(start.year, end.year + 1))
-
-        all_results = []
 
+        The per-quarter queries are fanned out (see fina_indicator.py), but they
+        share this source's single session, so they still reach the server one at
+        a time. PooledDataSource spreads them over its workers instead.
+        """
+        logger.debug(f"Fetching aggregated financial indicators for {code} ({start_date} to {end_date})")
         try:
-            with baostock_login_context():
-                for year in years:
-                    for quarter in [1, 2, 3, 4]:
-                        # 检查季度是否在日期范围内
-                        quarter_start_month = (quarter - 1) * 3
-                        quarter_start = datetime(int(year), quarter_start_month + 1, 1)
-                        if quarter_start > end:
-                            continue
-
-                        record = {"code": code, "year": year, "quarter": quarter}
-
-                        # 1. 盈利能力
-                        try:
-                            rs = bs.query_profit_data(code=code, year=year, quarter=quarter)
-                            if rs.error_code == '0' and rs.next():
-                                row = rs.get_row_data()
-                                for i, field in enumerate(rs.fields):
-                                    record[f"profit_{field}"] = row[i] if i < len(row) else None
-                        except Exception as e:
-                            logger.debug(f"Failed to fetch profit data for {code} {year}Q{quarter}: {e}")
-
-                        # 2. 营运能力
-                        try:
-                            rs = bs.query_operation_data(code=code, year=year, quarter=quarter)
-                            if rs.error_code == '0' and rs.next():
-                                row = rs.get_row_data()
-                                for i, field in enumerate(rs.fields):
-                                    record[f"operation_{field}"] = row[i] if i < len(row) else None
-                        except Exception as e:
-                            logger.debug(f"Failed to fetch operation data for {code} {year}Q{quarter}: {e}")
-
-                        # 3. 成长能力
-                        try:
-                            rs = bs.query_growth_data(code=code, year=year, quarter=quarter)
-                            if rs.error_code == '0' and rs.next():
-                                row = rs.get_row_data()
-                                for i, field in enumerate(rs.fields):
-                                    record[f"growth_{field}"] = row[i] if i < len(row) else None
-                        except Exception as e:
-                            logger.debug(f"Failed to fetch growth data for {code} {year}Q{quarter}: {e}")
-
-                        # 4. 偿债能力
-                        try:
-                            rs = bs.query_balance_data(code=code, year=year, quarter=quarter)
-                            if rs.error_code == '0' and rs.next():
-                                row = rs.get_row_data()
-                                for i, field in enumerate(rs.fields):
-                                    record[f"balance_{field}"] = row[i] if i < len(row) else None
-                        except Exception as e:
-                            logger.debug(f"Failed to fetch balance data for {code} {year}Q{quarter}: {e}")
-
-                        # 5. 现金流量
-                        try:
-                            rs = bs.query_cash_flow_data(code=code, year=year, quarter=quarter)
-                            if rs.error_code == '0' and rs.next():
-                                row = rs.get_row_data()
-                                for i, field in enumerate(rs.fields):
-                                    record[f"cashflow_{field}"] = row[i] if i < len(row) else None
-                        except Exception as e:
-                            logger.debug(f"Failed to fetch cash flow data for {code} {year}Q{quarter}: {e}")
-
-                        # 6. 杜邦分析
-                        try:
-                            rs = bs.query_dupont_data(code=code, year=year, quarter=quarter)
-                            if rs.error_code == '0' and rs.next():
-                                row = rs.get_row_data()
-                                for i, field in enumerate(rs.fields):
-                                    record[f"dupont_{field}"] = row[i] if i < len(row) else None
-                        except Exception as e:
-                            logger.debug(f"Failed to fetch dupont data for {code} {year}Q{quarter}: {e}")
-
-                        # 只有当有数据时才添加记录
-                        if len(record) > 3:  # code + year + quarter + at least one data field
-                            all_results.append(record)
-
-                if not all_results:
-                    raise NoDataFoundError(
-                        f"No financial indicator data found for {code} in range {start_date}-{end_date}")
-
-                result_df = pd.DataFrame(all_results)
-                logger.info(f"Retrieved {len(result_df)} aggregated financial indicator records for {code}.")
-                return result_df
-
+            result_df = aggregate_fina_indicator(
+                self, code, start_date, end_date, max_concurrency=self._fina_concurrency)
+            logger.debug(f"Retrieved {len(result_df)} aggregated financial indicator records for {code}.")
+            return result_df
         except (LoginError, NoDataFoundError, DataSourceError, ValueError) as e:
             logger.warning(f"Known error fetching financial indicators for {code}: {type(e).__name__}")
             raise e
@@ -0,0 +1,215 @@
+# Long-lived Baostock session shared by every BaostockDataSource call
+import atexit
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
+
+import baostock as bs
+import baostock.common.contants as bs_constants
+import baostock.common.context as bs_context
+
+from .data_source_interface import LoginError
+from .tracing import span
+from .utils import isolate_stdout
+
+logger = logging.getLogger(__name__)
+
+# Error codes meaning the server no longer knows our session or the shared socket
+# is gone. Both are fixed by logging in again.
+SESSION_EXPIRED_CODES = frozenset({
+    "10001001",  # 用户未登陆
+    "10002001",  # 网络错误
+    "10002002",  # 网络连接失败
+    "10002003",  # 网络连接超时
+    "10002004",  # 网络接收时连接断开
+    "10002005",  # 网络发送失败
+    "10002006",  # 网络发送超时
+    "10002007",  # 网络接收错误
+    "10002008",  # 网络接收超时
+})
+
+# Seconds of inactivity before the heartbeat pings the server. 0 disables heartbeats.
+DEFAULT_HEARTBEAT_INTERVAL = 240.0
+
+
+def configure_server_address(address: Optional[str]) -> None:
+    """
+    Points the `baostock` client of this process at "host:port" instead of
+    www.baostock.com, e.g. a local stand-in server. Empty keeps the default.
+
+    Takes effect on the next login.
+    """
+    if not address:
+        return
+    host, sep, port = address.strip().rpartition(":")
+    if not sep or not host or not port.isdigit():
+        raise ValueError(f"Baostock server address must look like 'host:port', got '{address}'.")
+    bs_constants.BAOSTOCK_SERVER_IP = host
+    bs_constants.BAOSTOCK_SERVER_PORT = int(port)
+    logger.info(f"Using Baostock server at {host}:{port}.")
+
+
+class BaostockSessionManager:
+    """
+    Logs in to Baostock once and keeps the session alive for the whole process.
+
+    Baostock keeps its socket and user id in module globals, so all access goes
+    through a re-entrant lock: `acquire()` for work that spans several socket
+    round trips (e.g. paging through a result set) and `query()` for a single
+    call that transparently re-authenticates when the session has expired.
+    """
+
+    def __init__(self, heartbeat_interval: float = DEFAULT_HEARTBEAT_INTERVAL):
+        self._lock = threading.RLock()
+        self._logged_in = False
+        self._heartbeat_interval = heartbeat_interval
+        self._heartbeat_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._last_activity = time.monotonic()
+        self._atexit_registered = False
+
+        # Metrics
+        self._login_count = 0
+        self._relogin_count = 0
+        self._heartbeat_count = 0
+        self._last_login_ms: Optional[float] = None
+        self._relogin_ms_total = 0.0
+        self._relogin_ms_max = 0.0
+
+    @contextmanager
+    def acquire(self):
+        """Holds the session lock for the duration of the block, logging in first if needed."""
+        with self._lock:
+            if not self._logged_in:
+                self._login()
+            try:
+                yield self
+            finally:
+                self._last_activity = time.monotonic()
+
+    def query(self, query_func, *args, **kwargs):
+        """
+        Runs a single Baostock query function inside the session.
+
+        If Baostock reports that the session expired (or the socket died), logs in
+        again and retries the query once.
+        """
+        with self.acquire(), span(f"baostock.{getattr(query_func, '__name__', 'query')}", "upstream"):
+            rs = query_func(*args, **kwargs)
+            if rs.error_code in SESSION_EXPIRED_CODES:
+                logger.warning(
+                    f"Baostock session expired during {getattr(query_func, '__name__', 'query')} "
+                    f"(code: {rs.error_code}), re-authenticating.")
+                self._relogin()
+                rs = query_func(*args, **kwargs)
+            return rs
+
+    def close(self) -> None:
+        """Stops the heartbeat and logs out. Safe to call more than once."""
+        self._stop_event.set()
+        with self._lock:
+            if not self._logged_in:
+                return
+            logger.debug("Attempting Baostock logout...")
+            bs.logout()
+            self._logged_in = False
+            logger.info("Baostock logout successful.")
+
+    def metrics(self) -> dict:
+        """Returns login and heartbeat counters plus re-login latency."""
+        return {
+            "logged_in": self._logged_in,
+            "login_count": self._login_count,
+            "relogin_count": self._relogin_count,
+            "heartbeat_count": self._heartbeat_count,
+            "last_login_ms": self._last_login_ms,
+            "relogin_ms_total": round(self._relogin_ms_total, 3),
+            "relogin_ms_max": round(self._relogin_ms_max, 3),
+        }
+
+    # --- Internals (callers must hold self._lock) ---
+
+    def _login(self) -> float:
+        # Baostock prints its login banner to stdout; route it to the log once per process
+        isolate_stdout()
+        logger.debug("Attempting Baostock login...")
+        started = time.perf_counter()
+        with span("baostock.login", "upstream"):
+            lg = bs.login()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.debug(f"Login result: code={lg.error_code}, msg={lg.error_msg}")
+
+        if lg.error_code != '0':
+            logger.error(f"Baostock login failed: {lg.error_msg}")
+            raise LoginError(f"Baostock login failed: {lg.error_msg}")
+
+        self._logged_in = True
+        self._login_count += 1
+        self._last_login_ms = round(elapsed_ms, 3)
+        logger.info(f"Baostock login successful ({elapsed_ms:.1f} ms).")
+
+        if not self._atexit_registered:
+            atexit.register(self.close)
+            self._atexit_registered = True
+        self._start_heartbeat()
+        return elapsed_ms
+
+    def _relogin(self) -> None:
+        self._logged_in = False
+        # bs.login() opens a fresh socket without closing the old one
+        stale_socket = getattr(bs_context, "default_socket", None)
+        if stale_socket is not None:
+            try:
+                stale_socket.close()
+            except OSError:
+                pass
+        elapsed_ms = self._login()
+        self._relogin_count += 1
+        self._relogin_ms_total += elapsed_ms
+        self._relogin_ms_max = max(self._relogin_ms_max, elapsed_ms)
+
+    def _start_heartbeat(self) -> None:
+        if self._heartbeat_interval <= 0:
+            return
+        if self._heartbeat_thread is not None and self._heartbeat_thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._heartbeat_thread = threading.Thread(
+            target=self._heartbeat_loop, name="baostock-heartbeat", daemon=True)
+        self._heartbeat_thread.start()
+
+    def _heartbeat_loop(self) -> None:
+        while not self._stop_event.wait(self._heartbeat_interval):
+            if time.monotonic() - self._last_activity < self._heartbeat_interval:
+                continue
+            try:
+                today = datetime.now().strftime("%Y-%m-%d")
+                with self._lock:
+                    if not self._logged_in:
+                        continue
+                    self._heartbeat_count += 1
+                    self.query(bs.query_trade_dates, start_date=today, end_date=today)
+                logger.debug("Baostock heartbeat sent.")
+            except Exception as e:
+                logger.warning(f"Baostock heartbeat failed: {e}")
+
+
+_default_manager: Optional[BaostockSessionManager] = None
+_default_manager_lock = threading.Lock()
+
+
+def get_default_session_manager(heartbeat_interval: Optional[float] = None) -> BaostockSessionManager:
+    """
+    Returns the process-wide session manager (Baostock's state is process-global).
+
+    `heartbeat_interval` only takes effect when the manager is first created.
+    """
+    global _default_manager
+    with _default_manager_lock:
+        if _default_manager is None:
+            _default_manager = BaostockSessionManager(
+                DEFAULT_HEARTBEAT_INTERVAL if heartbeat_interval is None else heartbeat_interval)
+        return _default_manager
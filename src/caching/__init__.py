@@ -0,0 +1,13 @@
+from .kline_cache import CachedKLineDataSource, KLineCache
+from .response_cache import DEFAULT_POLICIES, CachePolicy, ResponseCacheDataSource
+from .snapshot_cache import SnapshotCache, SnapshotDataSource
+
+__all__ = [
+    "CachePolicy",
+    "CachedKLineDataSource",
+    "DEFAULT_POLICIES",
+    "KLineCache",
+    "ResponseCacheDataSource",
+    "SnapshotCache",
+    "SnapshotDataSource",
+]
@@ -0,0 +1,84 @@
+# Column-wise DataFrame files (.npz) shared by the on-disk cache tiers and recordings
+import io
+import json
+import os
+import tempfile
+from typing import BinaryIO, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+_META_KEY = "__meta__"
+
+
+def _frame_arrays(frame: pd.DataFrame, meta: dict) -> dict:
+    arrays = {}
+    for i, name in enumerate(frame.columns):
+        column = frame.iloc[:, i]
+        if column.dtype == object or isinstance(column.dtype, pd.CategoricalDtype):
+            arrays[f"c{i}"] = column.astype(str).to_numpy(dtype=str)
+        else:
+            arrays[f"c{i}"] = column.to_numpy()
+    categories = [str(c) for c in frame.columns if isinstance(frame[c].dtype, pd.CategoricalDtype)]
+    arrays[_META_KEY] = np.array(json.dumps(
+        {**meta, "columns": [str(c) for c in frame.columns], "categories": categories}))
+    return arrays
+
+
+def write_frame(path: str, frame: pd.DataFrame, meta: dict) -> None:
+    """
+    Stores `frame` as one compressed array per column plus a JSON `meta` dict.
+
+    Object and categorical columns are stored as strings (categorical ones are
+    restored on read), everything else with its numpy dtype. The file is
+    written next to `path` and moved into place, so readers never see a
+    partial file.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    arrays = _frame_arrays(frame, meta)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def frame_to_bytes(frame: pd.DataFrame, meta: dict) -> bytes:
+    """The contents `write_frame` would store, as bytes (e.g. for a member of a larger archive)."""
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **_frame_arrays(frame, meta))
+    return buffer.getvalue()
+
+
+def read_meta(path: str) -> Tuple[dict, int]:
+    """Returns the meta dict and row count without loading the other columns."""
+    with np.load(path, allow_pickle=False) as archive:
+        meta = json.loads(str(archive[_META_KEY]))
+        rows = len(archive["c0"]) if meta["columns"] else 0
+    return meta, rows
+
+
+def read_frame(source: Union[str, BinaryIO]) -> Tuple[pd.DataFrame, dict]:
+    """
+    Loads a file written by `write_frame` (a path, or a seekable file object such
+    as a BytesIO over `frame_to_bytes` output). String columns come back as object dtype.
+    """
+    with np.load(source, allow_pickle=False) as archive:
+        meta = json.loads(str(archive[_META_KEY]))
+        columns = meta["columns"]
+        data = {name: archive[f"c{i}"] for i, name in enumerate(columns)}
+    frame = pd.DataFrame(data, columns=columns)
+    for name in meta.get("categories", []):
+        # Missing values were written as the string "nan"
+        column = frame[name].astype(object)
+        frame[name] = column.mask(column == "nan").astype("category")
+    for name in columns:
+        if frame[name].dtype.kind == "U":
+            frame[name] = frame[name].astype(object)
+    return frame, meta
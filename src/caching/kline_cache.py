@@ -0,0 +1,397 @@
+# On-disk columnar cache for historical K-line bars
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from ..baostock_data_source import DEFAULT_K_FIELDS
+from ..data_source_interface import FinancialDataSource, NoDataFoundError, limit_rows
+from ..forwarding_data_source import ForwardingDataSource
+from .frame_io import read_frame, read_meta, write_frame
+
+logger = logging.getLogger(__name__)
+
+MINUTE_FREQUENCIES = ("5", "15", "30", "60")
+
+# Columns stored per frequency. Requests for other fields bypass the cache.
+CACHE_FIELDS: Dict[str, List[str]] = {
+    "d": list(DEFAULT_K_FIELDS),
+    "w": ["date", "code", "open", "high", "low", "close", "volume", "amount", "adjustflag", "turn", "pctChg"],
+    "m": ["date", "code", "open", "high", "low", "close", "volume", "amount", "adjustflag", "turn", "pctChg"],
+    **{freq: ["date", "time", "code", "open", "high", "low", "close", "volume", "amount", "adjustflag"]
+       for freq in MINUTE_FREQUENCIES},
+}
+
+_DATE_FMT = "%Y-%m-%d"
+
+
+def _parse_date(value: str) -> date:
+    return datetime.strptime(value, _DATE_FMT).date()
+
+
+def _fmt_date(value: date) -> str:
+    return value.strftime(_DATE_FMT)
+
+
+def settled_until(frequency: str, today: Optional[date] = None) -> date:
+    """
+    Latest date whose bars can no longer change upstream.
+
+    Baostock loads daily bars the same evening, minute bars by 11:00 the next
+    day, weekly bars on Saturday and monthly bars once the month is over. Only
+    ranges up to this date are stored; anything later is fetched every time.
+    """
+    today = today or date.today()
+    if frequency == "d":
+        return today - timedelta(days=1)
+    if frequency == "w":
+        # Sunday closing the last complete week
+        return today - timedelta(days=today.weekday() + 1)
+    if frequency == "m":
+        return today.replace(day=1) - timedelta(days=1)
+    return today - timedelta(days=2)
+
+
+@dataclass
+class KLineEntry:
+    """Cached bars for one (code, frequency, adjust_flag) plus the date range they cover."""
+
+    code: str
+    frequency: str
+    adjust_flag: str
+    frame: pd.DataFrame
+    covered_start: str
+    covered_end: str
+    validated_on: str
+    updated_at: float
+
+
+class KLineCache:
+    """
+    Stores K-line bars on disk, one compressed `.npz` file of column arrays per
+    (code, frequency, adjust_flag).
+
+    Each file records the calendar range it covers, which may be wider than the
+    bars it holds (weekends, suspensions). Writes go through a temporary file
+    and `os.replace`, so readers never see a half-written entry.
+    """
+
+    def __init__(self, root_dir: str):
+        self._root = os.path.abspath(os.path.expanduser(root_dir))
+        self._locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+        # Metrics
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "partial_hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "invalidations": 0,
+            "rows_from_cache": 0,
+            "rows_from_upstream": 0,
+        }
+
+    @property
+    def root_dir(self) -> str:
+        return self._root
+
+    def key_lock(self, code: str, frequency: str, adjust_flag: str) -> threading.Lock:
+        """Serializes top-ups of one entry so concurrent requests fetch the tail once."""
+        key = (code, frequency, adjust_flag)
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _path(self, code: str, frequency: str, adjust_flag: str) -> str:
+        return os.path.join(self._root, frequency, adjust_flag, f"{code}.npz")
+
+    def load(self, code: str, frequency: str, adjust_flag: str) -> Optional[KLineEntry]:
+        path = self._path(code, frequency, adjust_flag)
+        if not os.path.exists(path):
+            return None
+        try:
+            frame, meta = read_frame(path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Discarding unreadable K-line cache file {path}: {e}")
+            self._remove(path)
+            return None
+        return KLineEntry(
+            code=code,
+            frequency=frequency,
+            adjust_flag=adjust_flag,
+            frame=frame,
+            covered_start=meta["covered_start"],
+            covered_end=meta["covered_end"],
+            validated_on=meta.get("validated_on", ""),
+            updated_at=meta.get("updated_at", 0.0),
+        )
+
+    def coverage(self, code: str, frequency: str, adjust_flag: str) -> Optional[Tuple[str, str]]:
+        """The (covered_start, covered_end) of an entry, read without loading its bars; None if not cached."""
+        path = self._path(code, frequency, adjust_flag)
+        if not os.path.exists(path):
+            return None
+        try:
+            meta, _ = read_meta(path)
+        except (OSError, ValueError, KeyError):
+            return None
+        return meta["covered_start"], meta["covered_end"]
+
+    def save(self, entry: KLineEntry) -> None:
+        write_frame(self._path(entry.code, entry.frequency, entry.adjust_flag), entry.frame, {
+            "covered_start": entry.covered_start,
+            "covered_end": entry.covered_end,
+            "validated_on": entry.validated_on,
+            "updated_at": entry.updated_at,
+        })
+
+    def invalidate(
+        self,
+        code: Optional[str] = None,
+        frequency: Optional[str] = None,
+        adjust_flag: Optional[str] = None,
+    ) -> int:
+        """
+        Deletes cached entries matching every given filter (None matches all).
+        Use it when adjustment factors change. Returns the number of entries removed.
+        """
+        removed = 0
+        for entry_code, entry_freq, entry_adjust, path in self._iter_files():
+            if code is not None and entry_code != code:
+                continue
+            if frequency is not None and entry_freq != frequency:
+                continue
+            if adjust_flag is not None and entry_adjust != adjust_flag:
+                continue
+            self._remove(path)
+            removed += 1
+        if removed:
+            self.record("invalidations", removed)
+            logger.info(
+                f"Invalidated {removed} K-line cache entries (code={code}, frequency={frequency}, adjust={adjust_flag}).")
+        return removed
+
+    def status(self) -> dict:
+        """Returns counters plus one summary line per cached entry."""
+        entries = []
+        for entry_code, entry_freq, entry_adjust, path in self._iter_files():
+            try:
+                meta, rows = read_meta(path)
+            except (OSError, ValueError, KeyError):
+                continue
+            entries.append({
+                "code": entry_code,
+                "frequency": entry_freq,
+                "adjust_flag": entry_adjust,
+                "rows": rows,
+                "covered_start": meta["covered_start"],
+                "covered_end": meta["covered_end"],
+                "validated_on": meta.get("validated_on", ""),
+                "bytes": os.path.getsize(path),
+                "updated_at": datetime.fromtimestamp(meta.get("updated_at", 0.0)).strftime("%Y-%m-%d %H:%M:%S"),
+            })
+        stats = self.metrics()
+        stats.update({
+            "root_dir": self._root,
+            "entries": len(entries),
+            "bytes": sum(e["bytes"] for e in entries),
+        })
+        return {"stats": stats, "entries": entries}
+
+    def metrics(self) -> dict:
+        """Returns the hit/miss and row counters (without scanning the entries)."""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def record(self, counter: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[counter] += amount
+
+    def _iter_files(self):
+        if not os.path.isdir(self._root):
+            return
+        for frequency in sorted(os.listdir(self._root)):
+            freq_dir = os.path.join(self._root, frequency)
+            if not os.path.isdir(freq_dir):
+                continue
+            for adjust_flag in sorted(os.listdir(freq_dir)):
+                adjust_dir = os.path.join(freq_dir, adjust_flag)
+                if not os.path.isdir(adjust_dir):
+                    continue
+                for name in sorted(os.listdir(adjust_dir)):
+                    if name.endswith(".npz"):
+                        yield name[:-4], frequency, adjust_flag, os.path.join(adjust_dir, name)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class CachedKLineDataSource(ForwardingDataSource):
+    """
+    Serves get_historical_k_data from a KLineCache and only asks the wrapped
+    source for dates the cache does not cover yet.
+
+    Every request is widened to the cache's full column set for its frequency,
+    so one entry serves any subset of those fields. Coverage grows as one
+    contiguous range: a request before it fetches the gap in front, a request
+    after it fetches just the missing tail. Bars later than `settled_until()`
+    may still change upstream and are never stored. A row limit is applied to
+    the assembled bars, since gaps are fetched whole so they can be stored.
+
+    Forward-adjusted (前复权) prices are rewritten upstream whenever a new
+    dividend is paid, so those entries are re-checked once a day by comparing
+    the last cached bar with a fresh copy; on mismatch the entry is dropped.
+    """
+
+    def __init__(self, inner: FinancialDataSource, cache: KLineCache):
+        super().__init__(inner)
+        self._cache = cache
+
+    @property
+    def cache(self) -> KLineCache:
+        return self._cache
+
+    def metrics(self) -> dict:
+        return self._cache.metrics()
+
+    def get_historical_k_data(
+        self,
+        code: str,
+        start_date: str,
+        end_date: str,
+        frequency: str = "d",
+        adjust_flag: str = "3",
+        fields: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        order: str = "first",
+    ) -> pd.DataFrame:
+        cache_fields = CACHE_FIELDS.get(frequency)
+        requested = list(fields) if fields else list(DEFAULT_K_FIELDS)
+        if cache_fields is None or not set(requested).issubset(cache_fields):
+            self._cache.record("bypassed")
+            return self._inner.get_historical_k_data(
+                code=code, start_date=start_date, end_date=end_date,
+                frequency=frequency, adjust_flag=adjust_flag, fields=fields, limit=limit, order=order)
+
+        start, end = _parse_date(start_date), _parse_date(end_date)
+        today = date.today()
+        settled = settled_until(frequency, today)
+
+        with self._cache.key_lock(code, frequency, adjust_flag):
+            entry = self._cache.load(code, frequency, adjust_flag)
+            if entry is not None and adjust_flag == "2" and entry.validated_on != _fmt_date(today):
+                entry = self._revalidate(entry, cache_fields, today)
+            frame, fetched_rows = self._fill(entry, code, start, end, frequency, adjust_flag, cache_fields, settled, today)
+
+        mask = (frame["date"] >= start_date) & (frame["date"] <= end_date)
+        result = frame.loc[mask, requested].reset_index(drop=True)
+        self._cache.record("rows_from_cache", max(len(result) - fetched_rows, 0))
+        if result.empty:
+            raise NoDataFoundError(
+                f"No historical data found for {code} in the specified range (empty result set).")
+        return limit_rows(result, limit, order)
+
+    def _fill(
+        self,
+        entry: Optional[KLineEntry],
+        code: str,
+        start: date,
+        end: date,
+        frequency: str,
+        adjust_flag: str,
+        cache_fields: List[str],
+        settled: date,
+        today: date,
+    ) -> Tuple[pd.DataFrame, int]:
+        """Fetches whatever the entry lacks for [start, end], stores the settled part and returns all bars."""
+        ranges: List[Tuple[date, date]] = []
+        if entry is None:
+            self._cache.record("misses")
+            ranges.append((start, end))
+            cached = pd.DataFrame(columns=cache_fields)
+            new_start, new_end = start, min(end, settled)
+        else:
+            covered_start, covered_end = _parse_date(entry.covered_start), _parse_date(entry.covered_end)
+            if start < covered_start:
+                ranges.append((start, covered_start - timedelta(days=1)))
+            if end > covered_end:
+                ranges.append((covered_end + timedelta(days=1), end))
+            self._cache.record("partial_hits" if ranges else "hits")
+            cached = entry.frame
+            new_start, new_end = min(start, covered_start), max(covered_end, min(end, settled))
+
+        if not ranges:
+            return cached, 0
+
+        fetched = [self._fetch(code, range_start, range_end, frequency, adjust_flag, cache_fields)
+                   for range_start, range_end in ranges]
+        fetched_rows = sum(len(part) for part in fetched)
+        self._cache.record("rows_from_upstream", fetched_rows)
+        parts = [part for part in (cached, *fetched) if not part.empty]
+        if not parts:
+            return pd.DataFrame(columns=cache_fields), 0
+        combined = pd.concat(parts, ignore_index=True)
+        for name in cache_fields:
+            # concat falls back to object when the parts' categories differ
+            if any(isinstance(part[name].dtype, pd.CategoricalDtype) for part in parts):
+                combined[name] = combined[name].astype("category")
+        sort_keys = ["date", "time"] if "time" in combined.columns else ["date"]
+        combined = combined.sort_values(sort_keys, kind="stable").reset_index(drop=True)
+
+        if new_start <= new_end:
+            stored = combined[combined["date"] <= _fmt_date(new_end)].reset_index(drop=True)
+            self._cache.save(KLineEntry(
+                code=code,
+                frequency=frequency,
+                adjust_flag=adjust_flag,
+                frame=stored,
+                covered_start=_fmt_date(new_start),
+                covered_end=_fmt_date(new_end),
+                validated_on=_fmt_date(today),
+                updated_at=time.time(),
+            ))
+        return combined, fetched_rows
+
+    def _fetch(
+        self,
+        code: str,
+        start: date,
+        end: date,
+        frequency: str,
+        adjust_flag: str,
+        cache_fields: List[str],
+    ) -> pd.DataFrame:
+        try:
+            df = self._inner.get_historical_k_data(
+                code=code, start_date=_fmt_date(start), end_date=_fmt_date(end),
+                frequency=frequency, adjust_flag=adjust_flag, fields=cache_fields)
+        except NoDataFoundError:
+            # Holidays, suspensions or not listed yet: the range is known to be empty
+            return pd.DataFrame(columns=cache_fields)
+        return df[cache_fields]
+
+    def _revalidate(self, entry: KLineEntry, cache_fields: List[str], today: date) -> Optional[KLineEntry]:
+        if entry.frame.empty:
+            return entry
+        last = entry.frame.iloc[-1]
+        last_day = pd.Timestamp(last["date"]).date()
+        fresh = self._fetch(entry.code, last_day, last_day, entry.frequency, entry.adjust_flag, cache_fields)
+        if not fresh.empty and str(fresh.iloc[-1]["close"]) != str(last["close"]):
+            logger.info(
+                f"Adjusted prices for {entry.code} changed upstream; dropping its "
+                f"{entry.frequency}/{entry.adjust_flag} K-line cache entry.")
+            self._cache.invalidate(entry.code, entry.frequency, entry.adjust_flag)
+            return None
+        entry.validated_on = _fmt_date(today)
+        self._cache.save(entry)
+        return entry
@@ -0,0 +1,367 @@
+# Generic response cache around any FinancialDataSource
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from ..data_source_interface import FinancialDataSource, NoDataFoundError
+from ..fina_indicator import quarter_end
+from ..forwarding_data_source import ForwardingDataSource
+from .frame_io import read_frame, write_frame
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_BUDGET_BYTES = 64 * 1024 * 1024
+# Remembered "no data" answers; each is a key and a message, so this is a few MB at most
+DEFAULT_MAX_NEGATIVE_ENTRIES = 20000
+
+MINUTE = 60.0
+HOUR = 3600.0
+DAY = 24 * HOUR
+
+
+def _parse_date(value: Optional[str]) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+def _quarter_period(kwargs: dict) -> Optional[date]:
+    try:
+        return quarter_end(int(kwargs["year"]), int(kwargs["quarter"]))
+    except (KeyError, ValueError):
+        return None
+
+
+def _year_period(kwargs: dict) -> Optional[date]:
+    try:
+        return date(int(kwargs["year"]), 12, 31)
+    except (KeyError, ValueError):
+        return None
+
+
+def _end_date_period(kwargs: dict) -> Optional[date]:
+    return _parse_date(kwargs.get("end_date"))
+
+
+def _date_period(kwargs: dict) -> Optional[date]:
+    return _parse_date(kwargs.get("date"))
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    How long results of one data source method stay valid.
+
+    `ttl` is the lifetime in seconds for data that may still change (None keeps
+    it forever, 0 disables caching). If `period_end` is given, it maps the call
+    arguments to the last day of the period the data describes; once that day
+    plus `settle_days` (time for late publications) is in the past, the result
+    is treated as immutable and kept forever.
+
+    A NoDataFoundError is remembered for `negative_ttl` seconds while the
+    period is open (the data may still be published) and `negative_settled_ttl`
+    once it has settled (0 disables either).
+    """
+
+    ttl: Optional[float] = HOUR
+    period_end: Optional[Callable[[dict], Optional[date]]] = None
+    settle_days: int = 0
+    negative_ttl: float = 15 * MINUTE
+    negative_settled_ttl: float = 7 * DAY
+
+    def _settled(self, kwargs: dict, today: date) -> bool:
+        if self.period_end is None:
+            return False
+        end = self.period_end(kwargs)
+        return end is not None and end + timedelta(days=self.settle_days) < today
+
+    def ttl_for(self, kwargs: dict, today: date) -> Optional[float]:
+        return None if self._settled(kwargs, today) else self.ttl
+
+    def negative_ttl_for(self, kwargs: dict, today: date) -> float:
+        return self.negative_settled_ttl if self._settled(kwargs, today) else self.negative_ttl
+
+
+# Listed companies must publish annual reports within four months of year end,
+# the longest of the reporting deadlines.
+_QUARTERLY = CachePolicy(ttl=HOUR, period_end=_quarter_period, settle_days=120)
+
+DEFAULT_POLICIES: Dict[str, CachePolicy] = {
+    "get_profit_data": _QUARTERLY,
+    "get_operation_data": _QUARTERLY,
+    "get_growth_data": _QUARTERLY,
+    "get_balance_data": _QUARTERLY,
+    "get_cash_flow_data": _QUARTERLY,
+    "get_dupont_data": _QUARTERLY,
+    "get_fina_indicator": CachePolicy(ttl=HOUR, period_end=_end_date_period, settle_days=120),
+    # Both are keyed by publication date, so a past range is complete
+    "get_performance_express_report": CachePolicy(ttl=HOUR, period_end=_end_date_period, settle_days=1),
+    "get_forecast_report": CachePolicy(ttl=HOUR, period_end=_end_date_period, settle_days=1),
+    "get_dividend_data": CachePolicy(ttl=HOUR, period_end=_year_period, settle_days=366),
+    "get_deposit_rate_data": CachePolicy(ttl=6 * HOUR),
+    "get_loan_rate_data": CachePolicy(ttl=6 * HOUR),
+    "get_required_reserve_ratio_data": CachePolicy(ttl=6 * HOUR),
+    "get_money_supply_data_month": CachePolicy(ttl=6 * HOUR),
+    "get_money_supply_data_year": CachePolicy(ttl=6 * HOUR),
+    # Constituents are updated weekly; a past date's list is final
+    "get_hs300_stocks": CachePolicy(ttl=HOUR, period_end=_date_period, settle_days=7),
+    "get_sz50_stocks": CachePolicy(ttl=HOUR, period_end=_date_period, settle_days=7),
+    "get_zz500_stocks": CachePolicy(ttl=HOUR, period_end=_date_period, settle_days=7),
+    "get_stock_basic_info": CachePolicy(ttl=6 * HOUR),
+    # Forward adjustment factors are rescaled after every dividend
+    "get_adjust_factor_data": CachePolicy(ttl=HOUR),
+    "get_trade_dates": CachePolicy(ttl=6 * HOUR),
+}
+
+
+def _key_value(value: Any) -> Any:
+    # year=2023 and year="2023" are the same query; None stays distinct from "None"
+    if value is None:
+        return None
+    if isinstance(value, (list, tuple)):
+        return [_key_value(item) for item in value]
+    return str(value)
+
+
+def _cache_key(method: str, kwargs: dict) -> str:
+    normalized = {name: _key_value(value) for name, value in kwargs.items()}
+    return json.dumps([method, normalized], sort_keys=True, ensure_ascii=False)
+
+
+class ResponseCacheDataSource(ForwardingDataSource):
+    """
+    Caches the DataFrames returned by the wrapped source, per method and arguments.
+
+    - Methods without a policy (see DEFAULT_POLICIES) pass straight through.
+    - The memory tier is an LRU bounded by `memory_budget_bytes` of DataFrame
+      memory; an optional disk tier under `disk_dir` survives restarts and is
+      consulted on memory misses.
+    - Identical calls that arrive while one is already in flight wait for that
+      call instead of going upstream themselves.
+    - NoDataFoundError answers (unpublished quarters, years without a dividend,
+      empty report windows) are remembered in memory, up to
+      `max_negative_entries`, for the policy's negative TTL and raised again
+      without a query. Other errors are never cached.
+
+    Arguments are compared as text, so year=2023 and year="2023" share an
+    entry. Every caller gets its own shallow copy of the cached DataFrame:
+    adding, dropping or converting columns is safe, writing into the cells of
+    an existing column is not.
+    """
+
+    def __init__(
+        self,
+        inner: FinancialDataSource,
+        policies: Optional[Dict[str, CachePolicy]] = None,
+        memory_budget_bytes: int = DEFAULT_MEMORY_BUDGET_BYTES,
+        disk_dir: Optional[str] = None,
+        max_negative_entries: int = DEFAULT_MAX_NEGATIVE_ENTRIES,
+        clock: Callable[[], float] = time.time,
+    ):
+        super().__init__(inner)
+        # Wall clock the expiry times are measured on (replaceable in tests)
+        self._clock = clock
+        self._policies = dict(DEFAULT_POLICIES if policies is None else policies)
+        self._budget = memory_budget_bytes
+        self._disk_dir = os.path.abspath(os.path.expanduser(disk_dir)) if disk_dir else None
+
+        self._lock = threading.Lock()
+        # key -> (frame, expires_at wall clock or None, nbytes)
+        self._memory: "OrderedDict[str, Tuple[pd.DataFrame, Optional[float], int]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._in_flight: Dict[str, Future] = {}
+        # key -> (NoDataFoundError message, expires_at wall clock)
+        self._negative: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._max_negative = max_negative_entries
+
+        # Metrics
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "negative_hits": 0,
+            "negative_stores": 0,
+            "negative_expirations": 0,
+        }
+
+    def _forward(self, method: str, **kwargs: Any) -> pd.DataFrame:
+        policy = self._policies.get(method)
+        if policy is None:
+            return super()._forward(method, **kwargs)
+        ttl = policy.ttl_for(kwargs, date.today())
+        if ttl == 0:
+            return super()._forward(method, **kwargs)
+
+        key = _cache_key(method, kwargs)
+        frame = self._memory_get(key)
+        if frame is not None:
+            return frame.copy(deep=False)
+        message = self._negative_get(key)
+        if message is not None:
+            raise NoDataFoundError(message)
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self._stats["coalesced"] += 1
+        if not leader:
+            return future.result().copy(deep=False)
+
+        try:
+            stored = self._disk_get(key)
+            if stored is None:
+                with self._lock:
+                    self._stats["misses"] += 1
+                frame = super()._forward(method, **kwargs)
+                expires_at = None if ttl is None else self._clock() + ttl
+                self._disk_put(key, frame, expires_at)
+            else:
+                # A disk hit keeps the expiry it was stored with, not a fresh TTL
+                frame, expires_at = stored
+            self._memory_put(key, frame, expires_at)
+            future.set_result(frame)
+            return frame.copy(deep=False)
+        except NoDataFoundError as e:
+            self._negative_put(key, str(e), policy.negative_ttl_for(kwargs, date.today()))
+            future.set_exception(e)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    # --- Memory tier ---
+
+    def _memory_get(self, key: str) -> Optional[pd.DataFrame]:
+        with self._lock:
+            item = self._memory.get(key)
+            if item is None:
+                return None
+            frame, expires_at, nbytes = item
+            if expires_at is not None and self._clock() >= expires_at:
+                del self._memory[key]
+                self._memory_bytes -= nbytes
+                self._stats["expirations"] += 1
+                return None
+            self._memory.move_to_end(key)
+            self._stats["memory_hits"] += 1
+            return frame
+
+    def _memory_put(self, key: str, frame: pd.DataFrame, expires_at: Optional[float]) -> None:
+        nbytes = int(frame.memory_usage(index=True, deep=True).sum())
+        if nbytes > self._budget:
+            return
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= old[2]
+            self._memory[key] = (frame, expires_at, nbytes)
+            self._memory_bytes += nbytes
+            while self._memory_bytes > self._budget:
+                _, (_, _, evicted_bytes) = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted_bytes
+                self._stats["evictions"] += 1
+
+    # --- Negative entries ---
+
+    def _negative_get(self, key: str) -> Optional[str]:
+        with self._lock:
+            item = self._negative.get(key)
+            if item is None:
+                return None
+            message, expires_at = item
+            if self._clock() >= expires_at:
+                del self._negative[key]
+                self._stats["negative_expirations"] += 1
+                return None
+            self._negative.move_to_end(key)
+            self._stats["negative_hits"] += 1
+            return message
+
+    def _negative_put(self, key: str, message: str, ttl: float) -> None:
+        if ttl <= 0 or self._max_negative <= 0:
+            return
+        with self._lock:
+            self._negative.pop(key, None)
+            self._negative[key] = (message, self._clock() + ttl)
+            self._stats["negative_stores"] += 1
+            while len(self._negative) > self._max_negative:
+                self._negative.popitem(last=False)
+
+    # --- Disk tier ---
+
+    def _disk_path(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self._disk_dir, digest[:2], f"{digest}.npz")
+
+    def _disk_get(self, key: str) -> Optional[Tuple[pd.DataFrame, Optional[float]]]:
+        """The stored frame and its expires_at, or None if missing, expired or unreadable."""
+        if self._disk_dir is None:
+            return None
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            frame, meta = read_frame(path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Discarding unreadable response cache file {path}: {e}")
+            meta = None
+        if meta is None or meta.get("key") != key or (
+                meta.get("expires_at") is not None and self._clock() >= meta["expires_at"]):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        with self._lock:
+            self._stats["disk_hits"] += 1
+        return frame, meta.get("expires_at")
+
+    def _disk_put(self, key: str, frame: pd.DataFrame, expires_at: Optional[float]) -> None:
+        if self._disk_dir is None:
+            return
+        try:
+            write_frame(self._disk_path(key), frame, {"key": key, "expires_at": expires_at})
+        except OSError as e:
+            logger.warning(f"Could not write response cache file: {e}")
+
+    def clear(self) -> None:
+        """Drops the memory tier and the negative entries (the disk tier expires on its own)."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            self._negative.clear()
+
+    def metrics(self) -> dict:
+        """Returns hit/miss counters (positive and negative) and memory tier usage."""
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": len(self._memory),
+                "negative_entries": len(self._negative),
+                "memory_bytes": self._memory_bytes,
+                "memory_budget_bytes": self._budget,
+                "disk_dir": self._disk_dir,
+            }
@@ -0,0 +1,174 @@
+# Per-date snapshot cache for market-wide lists (all stocks, industry table)
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import pandas as pd
+
+from ..data_source_interface import FinancialDataSource, limit_rows
+from ..forwarding_data_source import ForwardingDataSource
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_ENTRIES = 16
+DEFAULT_CURRENT_TTL = 600.0
+
+
+class SnapshotCache:
+    """
+    Small thread-safe LRU map whose entries may carry an expiry time.
+
+    `get_or_load` runs the loader at most once per key at a time: concurrent
+    callers asking for the same missing key wait for the first one's result.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_SNAPSHOT_ENTRIES, clock: Callable[[], float] = time.monotonic):
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: Dict[Hashable, threading.Lock] = {}
+
+        # Metrics
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and self._clock() >= expires_at:
+                del self._entries[key]
+                self._expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float]) -> None:
+        expires_at = None if ttl is None else self._clock() + ttl
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float]) -> Any:
+        value = self.get(key)
+        if value is not None:
+            self._count(hit=True)
+            return value
+        with self._lock:
+            key_lock = self._loading.setdefault(key, threading.Lock())
+        with key_lock:
+            # Another caller may have loaded it while we waited
+            value = self.get(key)
+            if value is not None:
+                self._count(hit=True)
+                return value
+            self._count(hit=False)
+            try:
+                value = loader()
+                self.put(key, value, ttl)
+            finally:
+                with self._lock:
+                    self._loading.pop(key, None)
+            return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+
+class SnapshotDataSource(ForwardingDataSource):
+    """
+    Keeps one shared DataFrame per date for get_all_stock and the full
+    get_stock_industry table, so searches and industry lookups filter in memory.
+
+    Snapshots of past dates never change and stay until evicted by the LRU.
+    Snapshots for today (or for no date, i.e. "current") expire after
+    `current_ttl` seconds, since Baostock may still be updating them.
+
+    A pushed-down row limit is applied to the snapshot rather than passed on:
+    both lists fit in one upstream page, so loading them whole costs one round
+    trip either way and lets every later call slice locally.
+
+    Every caller gets its own shallow copy of the snapshot: adding, dropping
+    or converting columns is safe, writing into cells of an existing column
+    is not.
+    """
+
+    def __init__(
+        self,
+        inner: FinancialDataSource,
+        max_entries: int = DEFAULT_SNAPSHOT_ENTRIES,
+        current_ttl: float = DEFAULT_CURRENT_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(inner)
+        self._cache = SnapshotCache(max_entries, clock)
+        self._current_ttl = current_ttl
+
+    @property
+    def cache(self) -> SnapshotCache:
+        return self._cache
+
+    def _key_and_ttl(self, method: str, date: Optional[str]) -> Tuple[tuple, Optional[float]]:
+        today = datetime.now().strftime("%Y-%m-%d")
+        if date is None:
+            # The day is part of the key so "current" rolls over at midnight
+            return (method, None, today), self._current_ttl
+        if date >= today:
+            return (method, date, today), self._current_ttl
+        return (method, date, None), None
+
+    def get_all_stock(self, date: Optional[str] = None, limit: Optional[int] = None, order: str = "first") -> pd.DataFrame:
+        key, ttl = self._key_and_ttl("get_all_stock", date)
+        snapshot = self._cache.get_or_load(key, lambda: self._inner.get_all_stock(date=date), ttl)
+        return limit_rows(snapshot, limit, order).copy(deep=False)
+
+    def get_stock_industry(
+        self,
+        code: Optional[str] = None,
+        date: Optional[str] = None,
+        limit: Optional[int] = None,
+        order: str = "first",
+    ) -> pd.DataFrame:
+        key, ttl = self._key_and_ttl("get_stock_industry", date)
+        if code is None:
+            snapshot = self._cache.get_or_load(key, lambda: self._inner.get_stock_industry(code=None, date=date), ttl)
+            return limit_rows(snapshot, limit, order).copy(deep=False)
+        snapshot = self._cache.get(key)
+        if snapshot is not None and "code" in snapshot.columns:
+            rows = snapshot[snapshot["code"] == code]
+            if not rows.empty:
+                return limit_rows(rows.reset_index(drop=True), limit, order)
+        return self._inner.get_stock_industry(code=code, date=date, limit=limit, order=order)
+
+    def metrics(self) -> dict:
+        return self._cache.metrics()
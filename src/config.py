@@ -0,0 +1,135 @@
+"""Server settings read from environment variables."""
+import os
+from dataclasses import dataclass
+
+ENV_PREFIX = "A_SHARE_MCP_"
+
+
+def _env_str(name: str, default: str) -> str:
+    value = os.getenv(ENV_PREFIX + name)
+    return value.strip() if value is not None and value.strip() else default
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = _env_str(name, "")
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        raise ValueError(f"Environment variable {ENV_PREFIX + name} must be an integer, got '{raw}'.")
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = _env_str(name, "").lower()
+    if not raw:
+        return default
+    if raw in ("1", "true", "yes", "on"):
+        return True
+    if raw in ("0", "false", "no", "off"):
+        return False
+    raise ValueError(f"Environment variable {ENV_PREFIX + name} must be a boolean, got '{raw}'.")
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = _env_str(name, "")
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        raise ValueError(f"Environment variable {ENV_PREFIX + name} must be a number, got '{raw}'.")
+
+
+@dataclass(frozen=True)
+class ServerSettings:
+    """
+    Runtime knobs for mcp_server.py. Each field maps to an environment variable
+    named A_SHARE_MCP_<FIELD_NAME_IN_UPPER_CASE>.
+    """
+
+    # MCP transport: "stdio", or "sse" to serve over HTTP (host/port from FASTMCP_HOST / FASTMCP_PORT)
+    transport: str = "stdio"
+    # With the sse transport, also serve Prometheus-style metrics at this path, e.g. "/metrics" ("" = off)
+    metrics_path: str = ""
+    # Baostock server as "host:port" ("" = www.baostock.com), e.g. a local stand-in
+    baostock_server: str = ""
+    # Record every upstream call to this archive (written on exit), for later replay
+    record_path: str = ""
+    # Serve upstream calls from a recorded archive instead of Baostock
+    replay_path: str = ""
+    # Replayed calls sleep this multiple of their recorded duration (0 = no delay)
+    replay_latency_scale: float = 0.0
+    # Number of Baostock worker processes. 0 or 1 keeps a single in-process session.
+    pool_size: int = 0
+    # Requests that may be queued or running in the pool at once (0 = 4 per worker)
+    pool_max_pending: int = 0
+    # Seconds a caller waits for a pool slot before the request is rejected
+    pool_queue_timeout: float = 30.0
+    # Seconds of inactivity before a Baostock session sends a heartbeat (0 disables)
+    heartbeat_interval: float = 240.0
+    # Threads running data-source backed tools off the event loop
+    data_workers: int = 4
+    # Report queries in flight at once for one get_fina_indicator call
+    fina_concurrency: int = 6
+    # K-line queries in flight at once for one get_historical_k_data_batch call
+    batch_concurrency: int = 8
+    # On-disk K-line cache and where it lives
+    kline_cache: bool = True
+    kline_cache_dir: str = "~/.cache/a-share-mcp/kline"
+    # Response cache for reports, macro series, dividends, constituents, ...
+    response_cache: bool = True
+    response_cache_memory_mb: int = 64
+    # Optional directory for the response cache's disk tier ("" keeps it in memory only)
+    response_cache_dir: str = ""
+    # "No data" answers remembered by the response cache (0 = always ask upstream again)
+    response_cache_negative_entries: int = 20000
+    # In-memory snapshots of the all-stock / industry lists (0 entries disables)
+    snapshot_cache_entries: int = 16
+    # Seconds before a snapshot for today (or "current") is fetched again
+    snapshot_ttl: float = 600.0
+    # Record tracing spans (tool, use case, data source, upstream, ingest, rendering)
+    trace: bool = False
+    # Finished spans kept in memory for inspection
+    trace_buffer_spans: int = 20000
+    # Also append spans to this file in Chrome trace format (implies trace)
+    trace_file: str = ""
+    # Profile every call of these tools (comma-separated names, "*" = all) with cProfile + tracemalloc
+    profile_tools: str = ""
+    # Where profile reports of those calls are written
+    profile_dir: str = "~/.cache/a-share-mcp/profiles"
+    # Functions and allocation sites listed per profile report
+    profile_top: int = 25
+
+    @classmethod
+    def from_env(cls) -> "ServerSettings":
+        return cls(
+            transport=_env_str("TRANSPORT", cls.transport),
+            metrics_path=_env_str("METRICS_PATH", cls.metrics_path),
+            baostock_server=_env_str("BAOSTOCK_SERVER", cls.baostock_server),
+            record_path=_env_str("RECORD_PATH", cls.record_path),
+            replay_path=_env_str("REPLAY_PATH", cls.replay_path),
+            replay_latency_scale=_env_float("REPLAY_LATENCY_SCALE", cls.replay_latency_scale),
+            pool_size=_env_int("POOL_SIZE", cls.pool_size),
+            pool_max_pending=_env_int("POOL_MAX_PENDING", cls.pool_max_pending),
+            pool_queue_timeout=_env_float("POOL_QUEUE_TIMEOUT", cls.pool_queue_timeout),
+            heartbeat_interval=_env_float("HEARTBEAT_INTERVAL", cls.heartbeat_interval),
+            data_workers=_env_int("DATA_WORKERS", cls.data_workers),
+            fina_concurrency=_env_int("FINA_CONCURRENCY", cls.fina_concurrency),
+            batch_concurrency=_env_int("BATCH_CONCURRENCY", cls.batch_concurrency),
+            kline_cache=_env_bool("KLINE_CACHE", cls.kline_cache),
+            kline_cache_dir=_env_str("KLINE_CACHE_DIR", cls.kline_cache_dir),
+            response_cache=_env_bool("RESPONSE_CACHE", cls.response_cache),
+            response_cache_memory_mb=_env_int("RESPONSE_CACHE_MEMORY_MB", cls.response_cache_memory_mb),
+            response_cache_dir=_env_str("RESPONSE_CACHE_DIR", cls.response_cache_dir),
+            response_cache_negative_entries=_env_int(
+                "RESPONSE_CACHE_NEGATIVE_ENTRIES", cls.response_cache_negative_entries),
+            snapshot_cache_entries=_env_int("SNAPSHOT_CACHE_ENTRIES", cls.snapshot_cache_entries),
+            snapshot_ttl=_env_float("SNAPSHOT_TTL", cls.snapshot_ttl),
+            trace=_env_bool("TRACE", cls.trace),
+            trace_buffer_spans=_env_int("TRACE_BUFFER_SPANS", cls.trace_buffer_spans),
+            trace_file=_env_str("TRACE_FILE", cls.trace_file),
+            profile_tools=_env_str("PROFILE_TOOLS", cls.profile_tools),
+            profile_dir=_env_str("PROFILE_DIR", cls.profile_dir),
+            profile_top=_env_int("PROFILE_TOP", cls.profile_top),
+        )
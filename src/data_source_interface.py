@@ -1,7 +1,10 @@
 # Defines the abstract interface for financial data sources
 from abc import ABC, abstractmethod
 import pandas as pd
-from typing import Optional, List
+from typing import TYPE_CHECKING, Optional, List
+
+if TYPE_CHECKING:
+    from .kline_batch import KLineBatch
 
 class DataSourceError(Exception):
     """Base exception for data source errors."""
@@ -18,6 +21,19 @@ class NoDataFoundError(DataSourceError):
     pass
 
 
+# Which end of a result a row limit keeps: the first rows in the source's
+# order, or the last (for date-ordered data, the latest) ones
+ROW_ORDERS = ["first", "latest"]
+
+
+def limit_rows(df: pd.DataFrame, limit: Optional[int], order: str = "first") -> pd.DataFrame:
+    """Applies a pushed-down row limit to a full result. Returns `df` itself if nothing is cut."""
+    if limit is None or len(df) <= limit:
+        return df
+    part = df.tail(limit) if order == "latest" else df.head(limit)
+    return part.reset_index(drop=True)
+
+
 class FinancialDataSource(ABC):
     """
     Abstract base class defining the interface for financial data sources.
@@ -34,6 +50,8 @@ class FinancialDataSource(ABC):
         frequency: str = "d",
         adjust_flag: str = "3",
         fields: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        order: str = "first",
     ) -> pd.DataFrame:
         """
         Fetches historical K-line (OHLCV) data for a given stock code.
@@ -51,6 +69,10 @@ class FinancialDataSource(ABC):
                          Defaults to '3'.
             fields: Optional list of specific fields to retrieve. If None,
                     retrieves default fields defined by the implementation.
+            limit: Optional maximum number of bars to return. Implementations
+                   may use it to stop reading the upstream result early.
+            order: Which bars a `limit` keeps: 'first' (earliest) or 'latest'.
+                   The returned bars are in date order either way.
 
         Returns:
             A pandas DataFrame containing the historical K-line data, with
@@ -64,6 +86,33 @@ class FinancialDataSource(ABC):
         """
         pass
 
+    def get_historical_k_data_batch(
+        self,
+        codes: List[str],
+        start_date: str,
+        end_date: str,
+        frequency: str = "d",
+        adjust_flag: str = "3",
+        fields: Optional[List[str]] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> "KLineBatch":
+        """
+        Fetches the same K-line window for many stock codes.
+
+        The default implementation calls `get_historical_k_data` on this source
+        for every code, at most `max_concurrency` at a time (default 8), so any
+        caching in the source applies per code. Codes that fail are reported in
+        the result's `errors` instead of failing the batch; LoginError is still
+        raised.
+
+        Returns:
+            A KLineBatch with one DataFrame per successful code.
+        """
+        from .kline_batch import DEFAULT_BATCH_CONCURRENCY, fetch_k_data_batch
+        return fetch_k_data_batch(
+            self, codes, start_date, end_date, frequency=frequency, adjust_flag=adjust_flag,
+            fields=fields, max_concurrency=max_concurrency or DEFAULT_BATCH_CONCURRENCY)
+
     @abstractmethod
     def get_stock_basic_info(self, code: str) -> pd.DataFrame:
         """
@@ -91,8 +140,8 @@ class FinancialDataSource(ABC):
         pass
 
     @abstractmethod
-    def get_all_stock(self, date: Optional[str] = None) -> pd.DataFrame:
-        """Fetches list of all stocks and their trading status on a given date."""
+    def get_all_stock(self, date: Optional[str] = None, limit: Optional[int] = None, order: str = "first") -> pd.DataFrame:
+        """Fetches list of all stocks and their trading status on a given date (at most `limit` rows)."""
         pass
 
     @abstractmethod
@@ -185,7 +234,14 @@ class FinancialDataSource(ABC):
 
     # Index / industry
     @abstractmethod
-    def get_stock_industry(self, code: Optional[str] = None, date: Optional[str] = None) -> pd.DataFrame:
+    def get_stock_industry(
+        self,
+        code: Optional[str] = None,
+        date: Optional[str] = None,
+        limit: Optional[int] = None,
+        order: str = "first",
+    ) -> pd.DataFrame:
+        """Industry classification of one stock or, without `code`, of all stocks (at most `limit` rows)."""
         pass
 
     @abstractmethod
@@ -202,6 +258,6 @@ class FinancialDataSource(ABC):
 
     # Market overview
     @abstractmethod
-    def get_all_stock(self, date: Optional[str] = None) -> pd.DataFrame:
+    def get_all_stock(self, date: Optional[str] = None, limit: Optional[int] = None, order: str = "first") -> pd.DataFrame:
         pass
     # Note: SHIBOR is not implemented in current Baostock bindings; no abstract method here.
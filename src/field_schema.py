@@ -0,0 +1,170 @@
+# Column types for Baostock result sets, applied once when a result is fetched
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+FLOAT = "float64"
+INT = "int64"
+DATE = "date"
+DATETIME = "datetime"
+CATEGORY = "category"
+TEXT = "text"
+
+# Explicit types by Baostock field name. Fields not listed here fall back to
+# the rules in `field_kind`.
+FIELD_TYPES: Dict[str, str] = {
+    # Identifiers and free text
+    "code": TEXT,
+    "code_name": TEXT,
+    "profitForcastAbstract": TEXT,
+    # Text like "0.18或0.19" or "10转5派2元" can appear here
+    "dividCashPsAfterTax": TEXT,
+    "dividCashStock": TEXT,
+    # Flags and classifications (few distinct values). Values stay strings
+    # such as "0"/"1", so existing comparisons keep working.
+    "adjustflag": CATEGORY,
+    "tradestatus": CATEGORY,
+    "tradeStatus": CATEGORY,
+    "isST": CATEGORY,
+    "is_trading_day": CATEGORY,
+    "industry": CATEGORY,
+    "industryClassification": CATEGORY,
+    "type": CATEGORY,
+    "status": CATEGORY,
+    "profitForcastType": CATEGORY,
+    # K-line
+    "date": DATE,
+    "calendar_date": DATE,
+    "time": DATETIME,
+    "open": FLOAT,
+    "high": FLOAT,
+    "low": FLOAT,
+    "close": FLOAT,
+    "preclose": FLOAT,
+    "volume": INT,
+    "amount": FLOAT,
+    "turn": FLOAT,
+    "pctChg": FLOAT,
+    "peTTM": FLOAT,
+    "pbMRQ": FLOAT,
+    "psTTM": FLOAT,
+    "pcfNcfTTM": FLOAT,
+    # Dividends
+    "dividCashPsBeforeTax": FLOAT,
+    "dividStocksPs": FLOAT,
+    "dividReserveToStockPs": FLOAT,
+    # Macro
+    "statYear": INT,
+    "statMonth": INT,
+}
+
+# Type of unlisted, non-date fields per dataset. Reports and macro series are
+# numeric apart from the fields above; anything else stays text.
+DATASET_DEFAULTS: Dict[str, Optional[str]] = {
+    "financial": FLOAT,
+    "macro": FLOAT,
+    "adjust_factor": FLOAT,
+    "performance_express": FLOAT,
+    "forecast": FLOAT,
+}
+
+_DATE_FORMAT = "%Y-%m-%d"
+# Minute bars carry times like 20240102093500000
+_DATETIME_FORMAT = "%Y%m%d%H%M%S%f"
+
+
+def field_kind(field: str, dataset: Optional[str] = None) -> Optional[str]:
+    """Returns the target type of a field, or None to leave it as text."""
+    kind = FIELD_TYPES.get(field)
+    if kind is not None:
+        return kind
+    if field.endswith("Date"):
+        return DATE
+    return DATASET_DEFAULTS.get(dataset)
+
+
+def _convert(column: pd.Series, kind: str) -> Optional[pd.Series]:
+    """Converts one text column; returns None if a non-empty value does not parse."""
+    text = column.astype(object)
+    empty = text.isna() | (text == "")
+    cleaned = text.mask(empty, np.nan)
+    if kind == CATEGORY:
+        return cleaned.astype("category")
+    if kind in (DATE, DATETIME):
+        parsed = pd.to_datetime(
+            cleaned, format=_DATE_FORMAT if kind == DATE else _DATETIME_FORMAT, errors="coerce")
+    else:
+        parsed = pd.to_numeric(cleaned, errors="coerce")
+    if (parsed.isna() & ~empty).any():
+        return None
+    if kind == INT:
+        if parsed.isna().any() or not np.array_equal(parsed, np.floor(parsed)):
+            return parsed.astype("float64")
+        return parsed.astype("int64")
+    if kind == FLOAT:
+        return parsed.astype("float64")
+    return parsed
+
+
+def _fast_convert(values, kind: str):
+    """
+    Parses a sequence of strings with numpy's C converters.
+
+    Only covers the common case: no empty strings for numbers, ISO dates. Raises
+    ValueError/TypeError otherwise, and the caller falls back to `_convert`.
+    """
+    if kind == FLOAT:
+        return np.array(values, dtype=np.float64)
+    if kind == INT:
+        return np.array(values, dtype=np.int64)
+    if kind == DATE:
+        # numpy reads "" as NaT, which is what we want
+        return np.array(values, dtype="datetime64[D]").astype("datetime64[ns]")
+    raise ValueError(kind)
+
+
+def typed_column(values, field: str, dataset: Optional[str] = None):
+    """
+    Converts the raw values of one field (a sequence of strings) to its typed
+    column: a numpy array or pandas Series ready to go into a DataFrame.
+    """
+    kind = field_kind(field, dataset)
+    if kind is None or kind == TEXT:
+        return np.array(values, dtype=object)
+    if kind in (FLOAT, INT, DATE):
+        try:
+            return _fast_convert(values, kind)
+        except (ValueError, TypeError, OverflowError):
+            pass
+    column = pd.Series(np.array(values, dtype=object), dtype=object)
+    converted = _convert(column, kind)
+    if converted is None:
+        logger.debug(f"Keeping column '{field}' as text: values do not parse as {kind}.")
+        return column.to_numpy()
+    return converted.to_numpy() if kind != CATEGORY else converted.array
+
+
+def convert_columns(df: pd.DataFrame, dataset: Optional[str] = None) -> pd.DataFrame:
+    """
+    Converts the string columns of a fresh Baostock result in place and returns it.
+
+    Each column gets the type from `field_kind`; empty strings become
+    NaN/NaT. A column with a value that does not parse is left as text,
+    so unexpected upstream data never raises here.
+    """
+    for field in df.columns:
+        if df[field].dtype != object:
+            continue
+        kind = field_kind(field, dataset)
+        if kind is None or kind == TEXT:
+            continue
+        converted = _convert(df[field], kind)
+        if converted is None:
+            logger.debug(f"Keeping column '{field}' as text: values do not parse as {kind}.")
+            continue
+        df[field] = converted
+    return df
@@ -0,0 +1,149 @@
+# Fan-out/fan-in aggregation of the six quarterly financial reports into one wide table
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .data_source_interface import FinancialDataSource, LoginError, NoDataFoundError
+
+logger = logging.getLogger(__name__)
+
+# (column prefix, FinancialDataSource method) for every report merged into a row
+FINA_INDICATOR_SOURCES: List[Tuple[str, str]] = [
+    ("profit", "get_profit_data"),        # 盈利能力
+    ("operation", "get_operation_data"),  # 营运能力
+    ("growth", "get_growth_data"),        # 成长能力
+    ("balance", "get_balance_data"),      # 偿债能力
+    ("cashflow", "get_cash_flow_data"),   # 现金流量
+    ("dupont", "get_dupont_data"),        # 杜邦分析
+]
+
+# Upstream queries allowed in flight for a single get_fina_indicator call
+DEFAULT_FINA_CONCURRENCY = 6
+
+
+def quarter_end(year: int, quarter: int) -> date:
+    """Last calendar day of the given quarter."""
+    return {
+        1: date(year, 3, 31),
+        2: date(year, 6, 30),
+        3: date(year, 9, 30),
+        4: date(year, 12, 31),
+    }[quarter]
+
+
+def report_deadline(year: int, quarter: int) -> date:
+    """
+    Statutory publication deadline of a quarter's report: Q1 and Q3 reports
+    within a month of quarter end, the interim (Q2) report within two months,
+    the annual (Q4) report by April 30 of the next year.
+    """
+    return {
+        1: date(year, 4, 30),
+        2: date(year, 8, 31),
+        3: date(year, 10, 31),
+        4: date(year + 1, 4, 30),
+    }[quarter]
+
+
+def ended_quarters(today: Optional[date] = None, limit: int = 8) -> List[Tuple[int, int]]:
+    """The last `limit` quarters that ended before `today`, newest first."""
+    today = today or date.today()
+    year, quarter = today.year, (today.month - 1) // 3 + 1
+    quarters = []
+    while len(quarters) < limit:
+        year, quarter = (year, quarter - 1) if quarter > 1 else (year - 1, 4)
+        if quarter_end(year, quarter) < today:
+            quarters.append((year, quarter))
+    return quarters
+
+
+def fina_quarters(start_date: str, end_date: str, today: Optional[date] = None) -> List[Tuple[int, int]]:
+    """
+    Lists the (year, quarter) pairs to query for a date range, in order.
+
+    Quarters starting after `end_date` are out of range, and quarters newer
+    than the last ended one cannot have a report yet, so both are skipped.
+    Ended quarters still within their `report_deadline` are kept, since many
+    companies publish early.
+    """
+    try:
+        start = datetime.strptime(start_date, "%Y-%m-%d").date()
+        end = datetime.strptime(end_date, "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError(f"Invalid date format. Expected YYYY-MM-DD, got {start_date} to {end_date}")
+
+    latest = ended_quarters(today, limit=1)[0]
+    quarters = []
+    for year in range(start.year, end.year + 1):
+        for quarter in (1, 2, 3, 4):
+            if date(year, (quarter - 1) * 3 + 1, 1) > end:
+                continue
+            if (year, quarter) > latest:
+                continue
+            quarters.append((year, quarter))
+    return quarters
+
+
+def aggregate_fina_indicator(
+    data_source: FinancialDataSource,
+    code: str,
+    start_date: str,
+    end_date: str,
+    max_concurrency: int = DEFAULT_FINA_CONCURRENCY,
+) -> pd.DataFrame:
+    """
+    Builds the get_fina_indicator table from the per-quarter report methods of
+    `data_source`.
+
+    Every (year, quarter, report) query is independent, so they are issued
+    concurrently, at most `max_concurrency` at a time, and merged back into one
+    row per quarter with `profit_*`, `operation_*`, ... columns. Rows are sorted
+    by year and quarter. A failed or empty report just leaves its columns out of
+    that row; quarters with no report at all are dropped.
+    """
+    quarters = fina_quarters(start_date, end_date)
+    if not quarters:
+        raise NoDataFoundError(
+            f"No published quarters for {code} in range {start_date}-{end_date}")
+
+    tasks = [(year, quarter, prefix, method)
+             for year, quarter in quarters
+             for prefix, method in FINA_INDICATOR_SOURCES]
+
+    def run(task) -> Optional[pd.DataFrame]:
+        year, quarter, prefix, method = task
+        try:
+            return getattr(data_source, method)(code=code, year=str(year), quarter=quarter)
+        except LoginError:
+            raise
+        except NoDataFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Failed to fetch {prefix} data for {code} {year}Q{quarter}: {e}")
+            return None
+
+    workers = max(1, min(max_concurrency, len(tasks)))
+    logger.debug(f"Fetching {len(tasks)} financial reports for {code} with concurrency {workers}")
+    if workers == 1:
+        results = [run(task) for task in tasks]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fina") as executor:
+            results = list(executor.map(run, tasks))
+
+    records: Dict[Tuple[int, int], dict] = {}
+    for (year, quarter, prefix, _), df in zip(tasks, results):
+        if df is None or df.empty:
+            continue
+        record = records.setdefault(
+            (year, quarter), {"code": code, "year": str(year), "quarter": quarter})
+        for field, value in df.iloc[0].items():
+            record[f"{prefix}_{field}"] = value
+
+    if not records:
+        raise NoDataFoundError(
+            f"No financial indicator data found for {code} in range {start_date}-{end_date}")
+
+    return pd.DataFrame([records[key] for key in sorted(records)])
@@ -5,6 +5,9 @@ import pandas as pd
 import logging
 import json
 
+from .table_renderer import dumps, json_records, json_rows, render_csv, render_markdown
+from ..tracing import traced
+
 logger = logging.getLogger(__name__)
 
 # Configuration: Max rows to display in string outputs to protect context length
@@ -35,7 +38,7 @@ def format_df_to_markdown(df: pd.DataFrame, max_rows: int = None) -> str:
     truncated = original_rows > rows_to_show
 
     try:
-        markdown_table = df_display.to_markdown(index=False)
+        markdown_table = render_markdown(df_display)
     except Exception as e:
         logger.error("Error converting DataFrame to Markdown: %s", e, exc_info=True)
         return "Error: Could not format data into Markdown table."
@@ -46,19 +49,26 @@ def format_df_to_markdown(df: pd.DataFrame, max_rows: int = None) -> str:
     return markdown_table
 
 
+@traced("format")
 def format_table_output(
     df: pd.DataFrame,
     format: str = "markdown",
     max_rows: int | None = None,
     meta: dict | None = None,
+    order: str = "first",
+    exact_total: bool = True,
 ) -> str:
     """Formats a DataFrame into the requested string format with optional meta.
 
     Args:
         df: Data to format.
-        format: 'markdown' | 'json' | 'csv'. Defaults to 'markdown'.
+        format: 'markdown' | 'json' | 'json_compact' | 'csv'. Defaults to 'markdown'.
+            'json_compact' is {"columns": [...], "rows": [[...], ...], "meta": {...}}.
         max_rows: Optional max rows to include (defaults depend on formatters).
         meta: Optional metadata dict to include (prepended for markdown, embedded for json).
+        order: Which rows to keep when truncating: 'first' or 'latest'.
+        exact_total: False if `df` was already cut at the data source, in which
+            case a truncated result reports its total row count as unknown.
 
     Returns:
         A string suitable for tool responses.
@@ -72,7 +82,12 @@ def format_table_output(
     total_rows = 0 if df is None else int(df.shape[0])
     rows_to_show = 0 if df is None else min(total_rows, max_rows)
     truncated = total_rows > rows_to_show
-    df_display = df.head(rows_to_show) if df is not None else pd.DataFrame()
+    if df is None:
+        df_display = pd.DataFrame()
+    elif order == "latest":
+        df_display = df.tail(rows_to_show)
+    else:
+        df_display = df.head(rows_to_show)
 
     if fmt == "markdown":
         header = ""
@@ -86,7 +101,7 @@ def format_table_output(
 
     if fmt == "csv":
         try:
-            return df_display.to_csv(index=False)
+            return render_csv(df_display)
         except Exception as e:
             logger.error("Error converting DataFrame to CSV: %s", e, exc_info=True)
             return "Error: Could not format data into CSV."
@@ -94,10 +109,10 @@ def format_table_output(
     if fmt == "json":
         try:
             payload = {
-                "data": [] if df_display is None else df_display.to_dict(orient="records"),
+                "data": json_records(df_display),
                 "meta": {
                     **(meta or {}),
-                    "total_rows": total_rows,
+                    "total_rows": total_rows if exact_total or not truncated else None,
                     "returned_rows": rows_to_show,
                     "truncated": truncated,
                     "columns": [] if df_display is None else list(df_display.columns),
@@ -108,6 +123,23 @@ def format_table_output(
             logger.error("Error converting DataFrame to JSON: %s", e, exc_info=True)
             return "Error: Could not format data into JSON."
 
+    if fmt == "json_compact":
+        try:
+            payload = {
+                "columns": [str(c) for c in df_display.columns],
+                "rows": json_rows(df_display),
+                "meta": {
+                    **(meta or {}),
+                    "total_rows": total_rows if exact_total or not truncated else None,
+                    "returned_rows": rows_to_show,
+                    "truncated": truncated,
+                },
+            }
+            return dumps(payload)
+        except Exception as e:
+            logger.error("Error converting DataFrame to compact JSON: %s", e, exc_info=True)
+            return "Error: Could not format data into JSON."
+
     # Fallback to markdown if unknown format
     logger.warning("Unknown format '%s', falling back to markdown", fmt)
     return format_df_to_markdown(df_display, max_rows=max_rows)
@@ -0,0 +1,154 @@
+"""
+Column-at-a-time rendering of DataFrames to markdown, CSV and JSON.
+
+Every column is converted to strings (or JSON-ready values) in one vectorized
+step, and rows are only ever touched by a single str.join, instead of going
+through tabulate or per-row dicts.
+"""
+import json
+import re
+from typing import Callable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+_DATE_FORMAT = "%Y-%m-%d"
+_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_MARKDOWN_SPECIAL = re.compile(r"[|\n]")
+_CSV_SPECIAL = re.compile(r'[",\r\n]')
+
+
+def _datetime_format(series: pd.Series) -> str:
+    """Date-only unless some value carries a time of day."""
+    values = series.dropna()
+    has_time = (values != values.dt.normalize()).any()
+    return _DATETIME_FORMAT if has_time else _DATE_FORMAT
+
+
+def _is_numeric(series: pd.Series) -> bool:
+    return series.dtype.kind in "iuf"
+
+
+def _datetime_cells(series: pd.Series) -> List[str]:
+    values = series.to_numpy(dtype="datetime64[ns]")
+    if _datetime_format(series) == _DATE_FORMAT:
+        text = np.datetime_as_string(values, unit="D")
+    else:
+        text = np.char.replace(np.datetime_as_string(values, unit="s"), "T", " ")
+    cells = text.tolist()
+    missing = np.isnat(values)
+    if missing.any():
+        for i in np.flatnonzero(missing).tolist():
+            cells[i] = ""
+    return cells
+
+
+def column_cells(series: pd.Series, escape: Optional[Callable[[List[str]], List[str]]] = None) -> List[str]:
+    """
+    Display strings for one column; missing values become empty strings.
+
+    `escape` is applied to text only (object columns, category labels), never
+    to numbers or dates.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return _datetime_cells(series)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Format the categories once, then pick them by code
+        labels = [str(c) for c in series.cat.categories]
+        if escape is not None:
+            labels = escape(labels)
+        labels.append("")
+        return [labels[code] for code in series.cat.codes.tolist()]
+    values = series.to_numpy()
+    if values.dtype.kind in "iu":
+        return list(map(str, values.tolist()))
+    if values.dtype.kind == "f":
+        # Shortest round-trip repr, the same digits json.dumps writes
+        cells = list(map(repr, values.tolist()))
+        missing = np.isnan(values)
+        if missing.any():
+            for i in np.flatnonzero(missing).tolist():
+                cells[i] = ""
+        return cells
+    cells = ["" if v is None or v is pd.NaT or (isinstance(v, float) and v != v) else str(v)
+             for v in values.astype(object).tolist()]
+    return escape(cells) if escape is not None else cells
+
+
+def column_values(series: pd.Series) -> list:
+    """JSON-ready values for one column: native numbers and strings, None for missing."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        text = series.dt.strftime(_datetime_format(series))
+        return text.astype(object).where(text.notna(), None).tolist()
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        labels = series.cat.categories.to_numpy(dtype=object).tolist() + [None]
+        return [labels[code] for code in series.cat.codes.tolist()]
+    values = series.to_numpy()
+    if values.dtype.kind in "iub":
+        return values.tolist()
+    if values.dtype.kind == "f":
+        missing = np.isnan(values)
+        result = values.tolist()
+        if missing.any():
+            for i in np.flatnonzero(missing).tolist():
+                result[i] = None
+        return result
+    values = series.to_numpy(dtype=object)
+    missing = pd.isna(values)
+    if missing.any():
+        values = values.copy()
+        values[missing] = None
+    return [v.item() if isinstance(v, np.generic) else v for v in values.tolist()]
+
+
+def _escape_markdown(cells: List[str]) -> List[str]:
+    # One regex scan over the whole column decides whether any cell needs work
+    if not _MARKDOWN_SPECIAL.search("\x00".join(cells)):
+        return cells
+    return [c.replace("|", "\\|").replace("\n", " ") for c in cells]
+
+
+def _quote_csv(cells: List[str]) -> List[str]:
+    if not _CSV_SPECIAL.search("\x00".join(cells)):
+        return cells
+    return ['"' + c.replace('"', '""') + '"' if _CSV_SPECIAL.search(c) else c for c in cells]
+
+
+def render_markdown(df: pd.DataFrame) -> str:
+    """Pipe table with right-aligned numeric columns."""
+    headers = _escape_markdown([str(c) for c in df.columns])
+    aligns = ["---:" if _is_numeric(df.iloc[:, i]) else ":---" for i in range(df.shape[1])]
+    columns = [column_cells(df.iloc[:, i], _escape_markdown) for i in range(df.shape[1])]
+    lines = ["| " + " | ".join(headers) + " |", "|" + "|".join(aligns) + "|"]
+    if len(df):
+        lines.append("| " + " |\n| ".join(map(" | ".join, zip(*columns))) + " |")
+    return "\n".join(lines)
+
+
+def render_csv(df: pd.DataFrame) -> str:
+    """CSV with a header row, quoting only the text cells that need it."""
+    headers = _quote_csv([str(c) for c in df.columns])
+    columns = [column_cells(df.iloc[:, i], _quote_csv) for i in range(df.shape[1])]
+    lines = [",".join(headers)]
+    if len(df):
+        lines.append("\n".join(map(",".join, zip(*columns))))
+    return "\n".join(lines) + "\n"
+
+
+def json_records(df: pd.DataFrame) -> list:
+    """One dict per row, as DataFrame.to_dict(orient='records') would give, with JSON-ready values."""
+    names = [str(c) for c in df.columns]
+    columns = [column_values(df.iloc[:, i]) for i in range(df.shape[1])]
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+def json_rows(df: pd.DataFrame) -> list:
+    """One tuple per row, in column order (serialized as JSON arrays)."""
+    columns = [column_values(df.iloc[:, i]) for i in range(df.shape[1])]
+    return list(zip(*columns))
+
+
+def dumps(payload: dict) -> str:
+    """Compact JSON text (no spaces after separators), keeping non-ASCII as is."""
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
@@ -0,0 +1,122 @@
+# Base class for FinancialDataSource wrappers (pools, caches, recorders)
+from typing import Any, List, Optional
+
+import pandas as pd
+
+from .data_source_interface import FinancialDataSource
+
+
+class ForwardingDataSource(FinancialDataSource):
+    """
+    FinancialDataSource that sends every interface call through `_forward`.
+
+    By default `_forward` calls the same method on the wrapped source, so a
+    subclass only has to override `_forward` (to intercept every call) or the
+    individual methods it cares about.
+
+    get_historical_k_data_batch is deliberately not forwarded: the interface's
+    default fans out through this wrapper's own get_historical_k_data, so the
+    wrapper still sees every code.
+    """
+
+    def __init__(self, inner: Optional[FinancialDataSource] = None):
+        self._inner = inner
+
+    @property
+    def inner(self) -> Optional[FinancialDataSource]:
+        """The wrapped data source, if any."""
+        return self._inner
+
+    def _forward(self, method: str, **kwargs: Any) -> pd.DataFrame:
+        """Dispatches one interface call. Arguments are always passed by keyword."""
+        return getattr(self._inner, method)(**kwargs)
+
+    def get_historical_k_data(
+        self,
+        code: str,
+        start_date: str,
+        end_date: str,
+        frequency: str = "d",
+        adjust_flag: str = "3",
+        fields: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        order: str = "first",
+    ) -> pd.DataFrame:
+        return self._forward(
+            "get_historical_k_data", code=code, start_date=start_date, end_date=end_date,
+            frequency=frequency, adjust_flag=adjust_flag, fields=fields, limit=limit, order=order)
+
+    def get_stock_basic_info(self, code: str, fields: Optional[List[str]] = None) -> pd.DataFrame:
+        return self._forward("get_stock_basic_info", code=code, fields=fields)
+
+    def get_trade_dates(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
+        return self._forward("get_trade_dates", start_date=start_date, end_date=end_date)
+
+    def get_all_stock(self, date: Optional[str] = None, limit: Optional[int] = None, order: str = "first") -> pd.DataFrame:
+        return self._forward("get_all_stock", date=date, limit=limit, order=order)
+
+    def get_deposit_rate_data(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
+        return self._forward("get_deposit_rate_data", start_date=start_date, end_date=end_date)
+
+    def get_loan_rate_data(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
+        return self._forward("get_loan_rate_data", start_date=start_date, end_date=end_date)
+
+    def get_required_reserve_ratio_data(self, start_date: Optional[str] = None, end_date: Optional[str] = None, year_type: str = '0') -> pd.DataFrame:
+        return self._forward("get_required_reserve_ratio_data", start_date=start_date, end_date=end_date, year_type=year_type)
+
+    def get_money_supply_data_month(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
+        return self._forward("get_money_supply_data_month", start_date=start_date, end_date=end_date)
+
+    def get_money_supply_data_year(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
+        return self._forward("get_money_supply_data_year", start_date=start_date, end_date=end_date)
+
+    def get_dividend_data(self, code: str, year: str, year_type: str = "report") -> pd.DataFrame:
+        return self._forward("get_dividend_data", code=code, year=year, year_type=year_type)
+
+    def get_adjust_factor_data(self, code: str, start_date: str, end_date: str) -> pd.DataFrame:
+        return self._forward("get_adjust_factor_data", code=code, start_date=start_date, end_date=end_date)
+
+    def get_profit_data(self, code: str, year: str, quarter: int) -> pd.DataFrame:
+        return self._forward("get_profit_data", code=code, year=year, quarter=quarter)
+
+    def get_operation_data(self, code: str, year: str, quarter: int) -> pd.DataFrame:
+        return self._forward("get_operation_data", code=code, year=year, quarter=quarter)
+
+    def get_growth_data(self, code: str, year: str, quarter: int) -> pd.DataFrame:
+        return self._forward("get_growth_data", code=code, year=year, quarter=quarter)
+
+    def get_balance_data(self, code: str, year: str, quarter: int) -> pd.DataFrame:
+        return self._forward("get_balance_data", code=code, year=year, quarter=quarter)
+
+    def get_cash_flow_data(self, code: str, year: str, quarter: int) -> pd.DataFrame:
+        return self._forward("get_cash_flow_data", code=code, year=year, quarter=quarter)
+
+    def get_dupont_data(self, code: str, year: str, quarter: int) -> pd.DataFrame:
+        return self._forward("get_dupont_data", code=code, year=year, quarter=quarter)
+
+    def get_performance_express_report(self, code: str, start_date: str, end_date: str) -> pd.DataFrame:
+        return self._forward("get_performance_express_report", code=code, start_date=start_date, end_date=end_date)
+
+    def get_forecast_report(self, code: str, start_date: str, end_date: str) -> pd.DataFrame:
+        return self._forward("get_forecast_report", code=code, start_date=start_date, end_date=end_date)
+
+    def get_fina_indicator(self, code: str, start_date: str, end_date: str) -> pd.DataFrame:
+        return self._forward("get_fina_indicator", code=code, start_date=start_date, end_date=end_date)
+
+    def get_stock_industry(
+        self,
+        code: Optional[str] = None,
+        date: Optional[str] = None,
+        limit: Optional[int] = None,
+        order: str = "first",
+    ) -> pd.DataFrame:
+        return self._forward("get_stock_industry", code=code, date=date, limit=limit, order=order)
+
+    def get_hs300_stocks(self, date: Optional[str] = None) -> pd.DataFrame:
+        return self._forward("get_hs300_stocks", date=date)
+
+    def get_sz50_stocks(self, date: Optional[str] = None) -> pd.DataFrame:
+        return self._forward("get_sz50_stocks", date=date)
+
+    def get_zz500_stocks(self, date: Optional[str] = None) -> pd.DataFrame:
+        return self._forward("get_zz500_stocks", date=date)
@@ -0,0 +1,128 @@
+# Turns Baostock result sets into typed DataFrames
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from .field_schema import typed_column
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+class IngestStats:
+    """Per-query counters: calls, rows, pages, wire bytes, frame bytes and time spent."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queries: Dict[str, Dict[str, float]] = {}
+
+    def record(self, query: str, rows: int, pages: int, wire_bytes: int, frame_bytes: int, elapsed_ms: float) -> None:
+        with self._lock:
+            stats = self._queries.setdefault(query, {
+                "calls": 0, "rows": 0, "pages": 0, "wire_bytes": 0, "frame_bytes": 0,
+                "elapsed_ms_total": 0.0, "elapsed_ms_max": 0.0,
+            })
+            stats["calls"] += 1
+            stats["rows"] += rows
+            stats["pages"] += pages
+            stats["wire_bytes"] += wire_bytes
+            stats["frame_bytes"] += frame_bytes
+            stats["elapsed_ms_total"] += elapsed_ms
+            stats["elapsed_ms_max"] = max(stats["elapsed_ms_max"], elapsed_ms)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                query: {k: round(v, 3) if isinstance(v, float) else v for k, v in stats.items()}
+                for query, stats in self._queries.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._queries.clear()
+
+
+_stats = IngestStats()
+
+
+def get_ingest_stats() -> IngestStats:
+    """Process-wide ingest counters."""
+    return _stats
+
+
+def _wire_bytes(rs) -> int:
+    try:
+        return int(getattr(rs, "msg_body_length", 0) or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def read_result_set(
+    rs,
+    dataset: Optional[str] = None,
+    query: str = "query",
+    limit: Optional[int] = None,
+    order: str = "first",
+) -> pd.DataFrame:
+    """
+    Reads every remaining page of a successful Baostock result set into a typed DataFrame.
+
+    Instead of one `next()`/`get_row_data()` call per row, this takes each page's
+    row list as a whole and only calls `next()` to fetch the following page.
+    Each field is then gathered from the rows and converted straight to its
+    typed column (see field_schema), so no
+    intermediate all-object DataFrame is built.
+
+    With a `limit`, only that many rows are converted: the first ones, in which
+    case no further pages are requested once enough rows are in, or the last
+    ones (`order="latest"`), which still needs every page. Pages are requested
+    one at a time, so leaving the rest of a result unread is safe.
+
+    Must be called while holding the Baostock session, since fetching further
+    pages uses the shared socket. Returns an empty DataFrame with the result's
+    columns if there are no rows.
+    """
+    started = time.perf_counter()
+    fields: List[str] = list(rs.fields)
+    rows: List[list] = []
+    pages = 0
+    wire_bytes = _wire_bytes(rs)
+    # Reading pages includes the upstream round trips for every page after the first
+    with span("ingest.pages", "ingest", query=query) as pages_span:
+        while True:
+            page = rs.data
+            if rs.cur_row_num < len(page):
+                rows.extend(page[rs.cur_row_num:] if rs.cur_row_num else page)
+                pages += 1
+            # Mark the page consumed so next() requests the following one
+            rs.cur_row_num = len(page)
+            if limit is not None and order != "latest" and len(rows) >= limit:
+                break
+            if not rs.next():
+                break
+            wire_bytes += _wire_bytes(rs)
+        if pages_span is not None:
+            pages_span.set(pages=pages, rows=len(rows), wire_bytes=wire_bytes)
+
+    if limit is not None and len(rows) > limit:
+        rows = rows[-limit:] if order == "latest" else rows[:limit]
+    with span("ingest.frame", "ingest", query=query, rows=len(rows)):
+        if not rows:
+            df = pd.DataFrame(columns=fields)
+        else:
+            # One field at a time, so only a single raw column is alive at once
+            df = pd.DataFrame(
+                {field: typed_column([row[i] for row in rows], field, dataset) for i, field in enumerate(fields)},
+                columns=fields,
+            )
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    frame_bytes = int(df.memory_usage(index=False, deep=False).sum())
+    _stats.record(query, len(df), pages, wire_bytes, frame_bytes, elapsed_ms)
+    logger.debug(
+        f"Ingested {query}: {len(df)} rows, {pages} pages, {wire_bytes} wire bytes, "
+        f"{frame_bytes} frame bytes in {elapsed_ms:.1f} ms")
+    return df
@@ -0,0 +1,89 @@
+# Concurrent K-line fetches for many codes over the same window
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from .data_source_interface import FinancialDataSource, LoginError, NoDataFoundError
+
+logger = logging.getLogger(__name__)
+
+# K-line queries in flight at once for one batch call
+DEFAULT_BATCH_CONCURRENCY = 8
+
+
+@dataclass
+class KLineBatch:
+    """Per-code results of a batch K-line fetch: bars for the codes that worked, an error message for the rest."""
+
+    codes: List[str]
+    frames: Dict[str, pd.DataFrame] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    def long_frame(self) -> pd.DataFrame:
+        """All bars in one table, in the order of `codes`, with a `code` column."""
+        parts = []
+        for code in self.codes:
+            frame = self.frames.get(code)
+            if frame is None or frame.empty:
+                continue
+            if "code" not in frame.columns:
+                frame = frame.copy()
+                frame.insert(0, "code", code)
+            parts.append(frame)
+        if not parts:
+            return pd.DataFrame()
+        return pd.concat(parts, ignore_index=True)
+
+
+def fetch_k_data_batch(
+    data_source: FinancialDataSource,
+    codes: List[str],
+    start_date: str,
+    end_date: str,
+    frequency: str = "d",
+    adjust_flag: str = "3",
+    fields: Optional[List[str]] = None,
+    max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+) -> KLineBatch:
+    """
+    Calls `data_source.get_historical_k_data` for every code, at most
+    `max_concurrency` at a time.
+
+    Each call goes through `data_source` itself, so caches and pools wrapped
+    around it apply per code. A code that fails is recorded in `errors` and the
+    rest of the batch carries on; a login failure aborts the whole batch, since
+    no other code could succeed either.
+    """
+    batch = KLineBatch(codes=list(codes))
+    if not batch.codes:
+        return batch
+
+    def run(code: str) -> Optional[pd.DataFrame]:
+        try:
+            return data_source.get_historical_k_data(
+                code=code, start_date=start_date, end_date=end_date,
+                frequency=frequency, adjust_flag=adjust_flag, fields=fields)
+        except LoginError:
+            raise
+        except NoDataFoundError as e:
+            batch.errors[code] = f"No data: {e}"
+        except Exception as e:
+            logger.debug(f"Batch K-line fetch failed for {code}: {e}")
+            batch.errors[code] = f"{type(e).__name__}: {e}"
+        return None
+
+    workers = max(1, min(max_concurrency, len(batch.codes)))
+    logger.debug(f"Fetching K-lines for {len(batch.codes)} codes with concurrency {workers}")
+    if workers == 1:
+        results = [run(code) for code in batch.codes]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kline-batch") as executor:
+            results = list(executor.map(run, batch.codes))
+
+    for code, frame in zip(batch.codes, results):
+        if frame is not None:
+            batch.frames[code] = frame
+    return batch
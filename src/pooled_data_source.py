@@ -0,0 +1,169 @@
+# FinancialDataSource that spreads queries over several Baostock worker processes
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Optional
+
+import baostock.common.contants as bs_constants
+import pandas as pd
+
+from .baostock_session import DEFAULT_HEARTBEAT_INTERVAL
+from .data_source_interface import DataSourceError
+from .fina_indicator import DEFAULT_FINA_CONCURRENCY, aggregate_fina_indicator
+from .forwarding_data_source import ForwardingDataSource
+
+logger = logging.getLogger(__name__)
+
+# Pending requests allowed per worker before callers start waiting for a slot
+DEFAULT_PENDING_PER_WORKER = 4
+
+# --- Worker process side ---
+# Each worker owns one BaostockDataSource and therefore one logged-in session.
+_worker_source = None
+
+
+def _init_worker(heartbeat_interval: float, server_address: Optional[str]) -> None:
+    global _worker_source
+    from .baostock_data_source import BaostockDataSource
+    from .baostock_session import BaostockSessionManager, configure_server_address
+    from .utils import isolate_stdout
+
+    # The worker inherits the parent's stdout, which may be the MCP JSON-RPC channel
+    isolate_stdout()
+    # Spawned workers start from a fresh `baostock` module
+    configure_server_address(server_address)
+    _worker_source = BaostockDataSource(BaostockSessionManager(heartbeat_interval=heartbeat_interval))
+
+
+def _call_worker(method: str, kwargs: dict) -> pd.DataFrame:
+    return getattr(_worker_source, method)(**kwargs)
+
+
+class PooledDataSource(ForwardingDataSource):
+    """
+    Dispatches FinancialDataSource calls to a pool of worker processes.
+
+    The `baostock` module keeps a single global socket, so one process can only
+    have one upstream request in flight. Each worker here holds its own logged-in
+    Baostock session; calls are queued and picked up by whichever worker is idle.
+    At most `max_pending` calls may be queued or running at once. Beyond that,
+    callers wait up to `queue_timeout` seconds for a slot and then get a
+    DataSourceError, which keeps a burst from piling up unbounded work.
+
+    get_fina_indicator is aggregated here rather than in a worker, so its
+    per-quarter report queries fan out across the whole pool.
+
+    Worker processes are started lazily on the first call. They connect to
+    `server_address` ("host:port"), or by default to whatever server the
+    `baostock` client in this process points at when the pool starts.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 4,
+        max_pending: Optional[int] = None,
+        queue_timeout: float = 30.0,
+        heartbeat_interval: float = DEFAULT_HEARTBEAT_INTERVAL,
+        fina_concurrency: int = DEFAULT_FINA_CONCURRENCY,
+        server_address: Optional[str] = None,
+    ):
+        super().__init__(None)
+        if pool_size <= 0:
+            raise ValueError("pool_size must be positive.")
+        self._pool_size = pool_size
+        self._max_pending = max_pending or pool_size * DEFAULT_PENDING_PER_WORKER
+        self._queue_timeout = queue_timeout
+        self._heartbeat_interval = heartbeat_interval
+        self._fina_concurrency = fina_concurrency
+        self._server_address = server_address
+        self._slots = threading.BoundedSemaphore(self._max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+        # Metrics
+        self._stats_lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+
+    @property
+    def pool_size(self) -> int:
+        return self._pool_size
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                logger.info(f"Starting Baostock worker pool with {self._pool_size} processes.")
+                server_address = self._server_address or \
+                    f"{bs_constants.BAOSTOCK_SERVER_IP}:{bs_constants.BAOSTOCK_SERVER_PORT}"
+                # spawn: safe with the threads already running in this process, and
+                # the only start method available on Windows
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._pool_size,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self._heartbeat_interval, server_address),
+                )
+            return self._executor
+
+    def _forward(self, method: str, **kwargs: Any) -> pd.DataFrame:
+        if not self._slots.acquire(timeout=self._queue_timeout):
+            with self._stats_lock:
+                self._rejected += 1
+            raise DataSourceError(
+                f"Baostock worker pool is saturated ({self._max_pending} requests pending); try again later.")
+        with self._stats_lock:
+            self._pending += 1
+        try:
+            future = self._get_executor().submit(_call_worker, method, kwargs)
+            result = future.result()
+        except BrokenProcessPool as e:
+            self._reset_executor()
+            self._record_done(failed=True)
+            raise DataSourceError(f"Baostock worker process died while running {method}: {e}")
+        except Exception:
+            self._record_done(failed=True)
+            raise
+        self._record_done(failed=False)
+        return result
+
+    def get_fina_indicator(self, code: str, start_date: str, end_date: str) -> pd.DataFrame:
+        return aggregate_fina_indicator(
+            self, code, start_date, end_date, max_concurrency=self._fina_concurrency)
+
+    def _record_done(self, failed: bool) -> None:
+        with self._stats_lock:
+            self._pending -= 1
+            if failed:
+                self._failed += 1
+            else:
+                self._completed += 1
+        self._slots.release()
+
+    def _reset_executor(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def metrics(self) -> dict:
+        """Returns pool size and request counters."""
+        with self._stats_lock:
+            return {
+                "pool_size": self._pool_size,
+                "max_pending": self._max_pending,
+                "pending": self._pending,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+            }
+
+    def close(self) -> None:
+        """Shuts the worker processes down."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
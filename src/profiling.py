@@ -0,0 +1,156 @@
+# On-demand cProfile + tracemalloc reports for single tool calls
+import cProfile
+import io
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from typing import FrozenSet
+
+from mcp.server.lowlevel.server import request_ctx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOP = 25
+DEFAULT_PROFILE_DIR = "~/.cache/a-share-mcp/profiles"
+
+# Only one profiler may be active at a time: tracemalloc is process-wide, and a
+# second cProfile would see the first one's overhead. Profiled calls queue here.
+_profile_lock = threading.Lock()
+
+
+class CallProfile:
+    """
+    Context manager profiling the enclosed block with cProfile (CPU time of the
+    calling thread) and tracemalloc (allocations of the whole process, so
+    concurrent requests show up too). `report()` renders the top functions by
+    cumulative time and the top allocation sites by net size; `write()` also
+    saves the raw pstats data next to the text report (for snakeviz & co).
+
+    Profiled calls run one at a time and several times slower than usual; it
+    is a debugging aid, not something to leave on for all traffic.
+    """
+
+    def __init__(self, tool: str, context: str, top: int = DEFAULT_TOP):
+        self.tool = tool
+        self.context = context
+        self.top = max(1, top)
+        self.elapsed_ms = 0.0
+        self.peak_bytes = 0
+        self._profiler = cProfile.Profile()
+        self._allocations: list = []
+        self._owns_tracemalloc = False
+
+    def __enter__(self) -> "CallProfile":
+        _profile_lock.acquire()
+        try:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracemalloc = True
+            tracemalloc.reset_peak()
+            self._before = tracemalloc.take_snapshot()
+            self._started = time.perf_counter()
+            self._profiler.enable()
+        except BaseException:
+            self._release()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            self._profiler.disable()
+            self.elapsed_ms = (time.perf_counter() - self._started) * 1000
+            _, self.peak_bytes = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            ignored = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+            self._allocations = after.filter_traces(ignored).compare_to(
+                self._before.filter_traces(ignored), "lineno")
+            del self._before
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+        _profile_lock.release()
+
+    def report(self) -> str:
+        """Plain-text report: headline, top functions by cumulative time, top allocation sites."""
+        out = io.StringIO()
+        out.write(f"Profile of {self.context}: {self.elapsed_ms:.1f} ms, "
+                  f"peak traced memory {self.peak_bytes / 1024:.1f} KiB\n")
+        out.write("CPU time is that of the calling thread only: work the tool hands to other "
+                  "threads (e.g. the analysis reports' parallel fetches) is not included, "
+                  "its allocations are.\n\n")
+        out.write(f"Top {self.top} functions by cumulative time:\n")
+        stats = pstats.Stats(self._profiler, stream=out)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        out.write(f"Top {self.top} allocation sites by net size:\n")
+        grown = [diff for diff in self._allocations if diff.size_diff > 0][:self.top]
+        for diff in grown:
+            frame = diff.traceback[0]
+            out.write(f"  {frame.filename}:{frame.lineno}: {diff.size_diff / 1024:+.1f} KiB "
+                      f"({diff.count_diff:+d} blocks, {diff.size / 1024:.1f} KiB live)\n")
+        if not grown:
+            out.write("  (none)\n")
+        return out.getvalue()
+
+    def write(self, directory: str) -> str:
+        """Writes `<time>-<tool>.txt` (the report) and `.prof` (pstats data) to `directory`; returns the .txt path."""
+        directory = os.path.abspath(os.path.expanduser(directory))
+        os.makedirs(directory, exist_ok=True)
+        now = time.time()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + f"{now % 1:.3f}"[1:]
+        stem = os.path.join(directory, f"{stamp}-{self.tool}")
+        self._profiler.dump_stats(stem + ".prof")
+        with open(stem + ".txt", "w", encoding="utf-8") as f:
+            f.write(self.report())
+        return stem + ".txt"
+
+
+class ProfilingConfig:
+    """Which tools are profiled on every call, where their reports go and how long they are."""
+
+    def __init__(self):
+        self.tools: FrozenSet[str] = frozenset()
+        self.output_dir = DEFAULT_PROFILE_DIR
+        self.top = DEFAULT_TOP
+
+    def configure(self, tools: str = "", output_dir: str = "", top: int = DEFAULT_TOP) -> None:
+        """`tools` is a comma-separated list of tool names, or "*" for every tool ("" = none)."""
+        self.tools = frozenset(name.strip() for name in tools.split(",") if name.strip())
+        self.output_dir = output_dir or DEFAULT_PROFILE_DIR
+        self.top = top
+        if self.tools:
+            logger.info(f"Profiling tools {', '.join(sorted(self.tools))}; reports go to {self.output_dir}.")
+
+    def wants(self, tool: str) -> bool:
+        return "*" in self.tools or tool in self.tools
+
+
+_config = ProfilingConfig()
+
+
+def get_profiling_config() -> ProfilingConfig:
+    """The process-wide profiling settings (no tool profiled until configured)."""
+    return _config
+
+
+def configure_profiling(tools: str = "", output_dir: str = "", top: int = DEFAULT_TOP) -> None:
+    _config.configure(tools, output_dir, top)
+
+
+def profile_requested() -> bool:
+    """
+    True if the MCP request being handled asked for a profile of itself with
+    `"_meta": {"profile": true}` in its params. Only meaningful on the event
+    loop; executor threads don't see the request context.
+    """
+    try:
+        meta = request_ctx.get().meta
+    except LookupError:
+        return False
+    return bool(meta is not None and (meta.model_extra or {}).get("profile"))
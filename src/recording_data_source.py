@@ -0,0 +1,255 @@
+# Record every FinancialDataSource call to an archive, and serve it back later
+import hashlib
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from .baostock_data_source import DEFAULT_K_FIELDS
+from .caching.frame_io import frame_to_bytes, read_frame
+from .data_source_interface import (
+    DataSourceError,
+    FinancialDataSource,
+    LoginError,
+    NoDataFoundError,
+    limit_rows,
+)
+from .forwarding_data_source import ForwardingDataSource
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_VERSION = 1
+_CALLS_MEMBER = "calls.jsonl"
+_META_MEMBER = "meta.json"
+
+# Errors replayed as their own type; anything else comes back as a DataSourceError
+_REPLAYABLE_ERRORS = {cls.__name__: cls for cls in (DataSourceError, LoginError, NoDataFoundError, ValueError)}
+
+
+def _call_key(method: str, kwargs: dict) -> str:
+    return json.dumps([method, kwargs], sort_keys=True, default=str, ensure_ascii=False)
+
+
+def _frame_digest(frame: pd.DataFrame) -> str:
+    """Content hash, so identical results are stored once per archive."""
+    digest = hashlib.sha1()
+    digest.update(json.dumps([[str(c), str(t)] for c, t in frame.dtypes.items()]).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:20]
+
+
+@dataclass
+class RecordedCall:
+    """One data source call: its arguments, how long it took, and its result or error."""
+
+    seq: int
+    method: str
+    kwargs: Dict[str, Any]
+    started_s: float
+    elapsed_ms: float
+    frame: Optional[str] = None
+    error_type: Optional[str] = None
+    error_message: Optional[str] = None
+
+    def to_json(self) -> dict:
+        return {key: value for key, value in self.__dict__.items() if value is not None}
+
+
+class RecordingDataSource(ForwardingDataSource):
+    """
+    Passes every call through to `inner` and records it to a zip archive at `path`.
+
+    Each distinct result DataFrame is stored once, as a column-wise .npz member
+    (see caching.frame_io); the calls themselves go to a JSON-lines index with
+    their arguments, start offset, duration and result or error. The archive is
+    written to a temporary file and moved to `path` by `close()`, so an
+    interrupted recording never leaves a truncated archive behind.
+    """
+
+    def __init__(self, inner: FinancialDataSource, path: str):
+        super().__init__(inner)
+        self._path = os.path.abspath(os.path.expanduser(path))
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(dir=os.path.dirname(self._path), suffix=".tmp")
+        os.close(fd)
+        self._zip: Optional[zipfile.ZipFile] = zipfile.ZipFile(self._tmp_path, "w")
+        self._lock = threading.Lock()
+        self._calls: List[RecordedCall] = []
+        self._frames: set = set()
+        self._started = time.monotonic()
+        self._frame_bytes = 0
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def _forward(self, method: str, **kwargs: Any) -> pd.DataFrame:
+        started = time.monotonic()
+        try:
+            result = super()._forward(method, **kwargs)
+        except Exception as e:
+            self._record(method, kwargs, started, error=e)
+            raise
+        self._record(method, kwargs, started, frame=result)
+        return result
+
+    def _record(self, method: str, kwargs: dict, started: float,
+                frame: Optional[pd.DataFrame] = None, error: Optional[Exception] = None) -> None:
+        elapsed_ms = (time.monotonic() - started) * 1000
+        digest = _frame_digest(frame) if frame is not None else None
+        with self._lock:
+            if self._zip is None:
+                return
+            if digest is not None and digest not in self._frames:
+                # Members are already compressed .npz data, so store them as is
+                data = frame_to_bytes(frame, {"method": method})
+                self._zip.writestr(f"frames/{digest}.npz", data, compress_type=zipfile.ZIP_STORED)
+                self._frames.add(digest)
+                self._frame_bytes += len(data)
+            self._calls.append(RecordedCall(
+                seq=len(self._calls), method=method, kwargs=kwargs,
+                started_s=round(started - self._started, 6), elapsed_ms=round(elapsed_ms, 3), frame=digest,
+                error_type=type(error).__name__ if error is not None else None,
+                error_message=str(error) if error is not None else None,
+            ))
+
+    def metrics(self) -> dict:
+        """Returns the number of calls and distinct frames recorded so far."""
+        with self._lock:
+            return {
+                "path": self._path,
+                "calls": len(self._calls),
+                "frames": len(self._frames),
+                "frame_bytes": self._frame_bytes,
+            }
+
+    def close(self) -> None:
+        """Writes the call index and moves the archive into place. Safe to call more than once."""
+        with self._lock:
+            if self._zip is None:
+                return
+            index = "\n".join(json.dumps(call.to_json(), ensure_ascii=False, default=str) for call in self._calls)
+            self._zip.writestr(_CALLS_MEMBER, index, compress_type=zipfile.ZIP_DEFLATED)
+            self._zip.writestr(_META_MEMBER, json.dumps({
+                "version": ARCHIVE_VERSION, "calls": len(self._calls), "frames": len(self._frames),
+                "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            }))
+            self._zip.close()
+            self._zip = None
+            os.replace(self._tmp_path, self._path)
+        logger.info(f"Recorded {len(self._calls)} data source calls to {self._path}.")
+
+
+class ReplayDataSource(ForwardingDataSource):
+    """
+    Serves the calls in an archive written by RecordingDataSource, without any upstream.
+
+    A call is matched on its method and arguments. A K-line call with no exact
+    match is cut from a recorded call for the same code, frequency and
+    adjustment whose date range and fields cover it, so cache tails and
+    `limit` push-down still find their data. Anything else unrecorded raises
+    DataSourceError. Recorded errors are raised again with their original type.
+
+    Each replayed call sleeps `latency_ms` plus `latency_scale` times the
+    duration it had when recorded (both 0 by default, i.e. no delay).
+    Returned DataFrames are shared between callers and must not be modified in
+    place.
+    """
+
+    def __init__(self, path: str, latency_scale: float = 0.0, latency_ms: float = 0.0):
+        super().__init__(None)
+        self._path = os.path.abspath(os.path.expanduser(path))
+        self._latency_scale = latency_scale
+        self._latency_ms = latency_ms
+        self._calls: Dict[str, RecordedCall] = {}
+        self._k_calls: Dict[tuple, List[RecordedCall]] = {}
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._range_hits = 0
+        self._misses = 0
+        self._load()
+
+    def _load(self) -> None:
+        with zipfile.ZipFile(self._path) as archive:
+            meta = json.loads(archive.read(_META_MEMBER))
+            if meta.get("version") != ARCHIVE_VERSION:
+                raise DataSourceError(f"Unsupported recording version {meta.get('version')} in {self._path}.")
+            for line in archive.read(_CALLS_MEMBER).decode("utf-8").splitlines():
+                call = RecordedCall(**json.loads(line))
+                # The first recording of a call wins
+                self._calls.setdefault(_call_key(call.method, call.kwargs), call)
+                if call.method == "get_historical_k_data" and call.frame and not call.kwargs.get("limit"):
+                    self._k_calls.setdefault(self._k_series(call.kwargs), []).append(call)
+            for name in archive.namelist():
+                if name.startswith("frames/"):
+                    frame, _ = read_frame(io.BytesIO(archive.read(name)))
+                    self._frames[name[len("frames/"):-len(".npz")]] = frame
+        logger.info(f"Loaded {len(self._calls)} recorded calls and {len(self._frames)} frames from {self._path}.")
+
+    @staticmethod
+    def _k_series(kwargs: dict) -> tuple:
+        return kwargs.get("code"), kwargs.get("frequency"), kwargs.get("adjust_flag")
+
+    def _delay(self, call: Optional[RecordedCall]) -> None:
+        delay_ms = self._latency_ms + (self._latency_scale * call.elapsed_ms if call is not None else 0.0)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+    def _forward(self, method: str, **kwargs: Any) -> pd.DataFrame:
+        call = self._calls.get(_call_key(method, kwargs))
+        if call is None and method == "get_historical_k_data":
+            result = self._cut_k_data(kwargs)
+            if result is not None:
+                return result
+        if call is None:
+            with self._stats_lock:
+                self._misses += 1
+            self._delay(None)
+            raise DataSourceError(f"No recorded result for {method}({kwargs}) in {self._path}.")
+        with self._stats_lock:
+            self._hits += 1
+        self._delay(call)
+        if call.error_type is not None:
+            raise _REPLAYABLE_ERRORS.get(call.error_type, DataSourceError)(call.error_message)
+        return self._frames[call.frame]
+
+    def _cut_k_data(self, kwargs: dict) -> Optional[pd.DataFrame]:
+        start, end = kwargs["start_date"], kwargs["end_date"]
+        fields = list(kwargs.get("fields") or DEFAULT_K_FIELDS)
+        for call in self._k_calls.get(self._k_series(kwargs), []):
+            if call.kwargs["start_date"] > start or call.kwargs["end_date"] < end:
+                continue
+            frame = self._frames[call.frame]
+            if "date" not in frame.columns or not set(fields) <= set(frame.columns):
+                continue
+            dates = frame["date"]
+            mask = (dates >= pd.Timestamp(start)) & (dates <= pd.Timestamp(end))
+            with self._stats_lock:
+                self._range_hits += 1
+            self._delay(call)
+            result = frame.loc[mask, fields].reset_index(drop=True)
+            if result.empty:
+                raise NoDataFoundError(
+                    f"No historical data found for {kwargs['code']} in the specified range (empty result set).")
+            return limit_rows(result, kwargs.get("limit"), kwargs.get("order", "first"))
+        return None
+
+    def metrics(self) -> dict:
+        """Returns exact hits, K-line range hits and misses."""
+        with self._stats_lock:
+            return {
+                "path": self._path,
+                "recorded_calls": len(self._calls),
+                "hits": self._hits,
+                "range_hits": self._range_hits,
+                "misses": self._misses,
+            }
@@ -0,0 +1,92 @@
+"""Remembers which quarterly report each company published last."""
+import logging
+import threading
+import time
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.fina_indicator import ended_quarters, report_deadline
+
+logger = logging.getLogger(__name__)
+
+Quarter = Tuple[int, int]
+
+# Seconds a resolved latest quarter is trusted before newer quarters are probed again
+DEFAULT_TTL = 3600.0
+# Quarters walked back (newest first) before concluding a company has no reports
+DEFAULT_MAX_LOOKBACK = 8
+
+
+class ReportPeriodIndex:
+    """
+    Latest published report quarter per code, so report consumers ask for a
+    quarter that exists instead of the current one, which never does.
+
+    Without a remembered answer, the quarters worth fetching are every ended
+    quarter back to the newest one whose statutory deadline has passed (one or
+    two quarters): the older one is published by law, the newer one may be
+    already. Callers fetch those, report back what they found with
+    `remember()`, and only fall back to walking further back one quarter at a
+    time (`fallback()`) when none of them had a report. A remembered answer,
+    including "no reports at all", is trusted for `ttl` seconds.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, max_lookback: int = DEFAULT_MAX_LOOKBACK,
+                 clock: Callable[[], float] = time.monotonic):
+        self._ttl = ttl
+        # Clock the TTL is measured on (replaceable in tests)
+        self._clock = clock
+        self._max_lookback = max_lookback
+        self._lock = threading.Lock()
+        self._latest: Dict[str, Tuple[Optional[Quarter], float]] = {}
+        self._hits = 0
+        self._misses = 0
+
+    def _fresh(self, code: str) -> Tuple[bool, Optional[Quarter]]:
+        with self._lock:
+            entry = self._latest.get(code)
+            if entry is not None and entry[1] > self._clock():
+                self._hits += 1
+                return True, entry[0]
+            self._misses += 1
+            return False, None
+
+    def candidates(self, code: str, today: Optional[date] = None) -> List[Quarter]:
+        """
+        Quarters to fetch for `code`, newest first: the remembered latest
+        quarter while it is fresh (none if the company is known to have no
+        reports), otherwise the ended quarters back to the newest past its deadline.
+        """
+        known, quarter = self._fresh(code)
+        if known:
+            return [quarter] if quarter is not None else []
+        today = today or date.today()
+        quarters = []
+        for year, q in ended_quarters(today, self._max_lookback):
+            quarters.append((year, q))
+            if report_deadline(year, q) < today:
+                break
+        return quarters
+
+    def fallback(self, code: str, tried: Iterable[Quarter], today: Optional[date] = None) -> List[Quarter]:
+        """Older quarters to probe one by one after `tried` came back empty (none for a remembered answer)."""
+        with self._lock:
+            entry = self._latest.get(code)
+            if entry is not None and entry[1] > self._clock():
+                return []
+        tried = set(tried)
+        return [quarter for quarter in ended_quarters(today, self._max_lookback) if quarter not in tried]
+
+    def remember(self, code: str, quarter: Optional[Quarter]) -> None:
+        """Records the latest quarter found for `code` (None: no report within the lookback)."""
+        with self._lock:
+            self._latest[code] = (quarter, self._clock() + self._ttl)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._latest.clear()
+
+    def metrics(self) -> dict:
+        """Returns the number of codes remembered and lookup hits / misses."""
+        with self._lock:
+            return {"codes": len(self._latest), "hits": self._hits, "misses": self._misses}
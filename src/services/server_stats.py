@@ -0,0 +1,232 @@
+"""Per-tool counters and the server statistics snapshot (JSON / Prometheus text)."""
+import bisect
+import os
+import sys
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+from src.caching import CachedKLineDataSource, ResponseCacheDataSource, SnapshotDataSource
+from src.data_source_interface import FinancialDataSource
+from src.ingest import get_ingest_stats
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Upper bounds (ms) of the tool latency histogram buckets; a final +Inf bucket is implied
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+METRIC_PREFIX = "a_share_mcp_"
+
+_STARTED_AT = time.time()
+
+_CACHE_LAYERS = (CachedKLineDataSource, ResponseCacheDataSource, SnapshotDataSource)
+
+
+class ToolStats:
+    """Thread-safe call counts, latency histograms, error classes and in-flight calls per tool."""
+
+    def __init__(self, buckets_ms=LATENCY_BUCKETS_MS):
+        self._buckets_ms = tuple(buckets_ms)
+        self._lock = threading.Lock()
+        self._tools: Dict[str, dict] = {}
+
+    def _entry(self, tool: str) -> dict:
+        entry = self._tools.get(tool)
+        if entry is None:
+            entry = self._tools[tool] = {
+                "calls": 0, "in_flight": 0, "errors": {}, "latency_ms_sum": 0.0, "latency_ms_max": 0.0,
+                "buckets": [0] * (len(self._buckets_ms) + 1),
+            }
+        return entry
+
+    def started(self, tool: str) -> None:
+        with self._lock:
+            self._entry(tool)["in_flight"] += 1
+
+    def finished(self, tool: str, elapsed_ms: float, error: Optional[BaseException] = None) -> None:
+        bucket = bisect.bisect_left(self._buckets_ms, elapsed_ms)
+        with self._lock:
+            entry = self._entry(tool)
+            entry["in_flight"] -= 1
+            entry["calls"] += 1
+            entry["latency_ms_sum"] += elapsed_ms
+            entry["latency_ms_max"] = max(entry["latency_ms_max"], elapsed_ms)
+            entry["buckets"][bucket] += 1
+            if error is not None:
+                name = type(error).__name__
+                entry["errors"][name] = entry["errors"].get(name, 0) + 1
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Per tool: counters, cumulative histogram {le_ms: count} and p50/p95 bucket bounds."""
+        with self._lock:
+            tools = {tool: {**entry, "errors": dict(entry["errors"]), "buckets": list(entry["buckets"])}
+                     for tool, entry in self._tools.items()}
+        bounds = [str(b) for b in self._buckets_ms] + ["+Inf"]
+        result = {}
+        for tool, entry in sorted(tools.items()):
+            cumulative, running = {}, 0
+            for bound, count in zip(bounds, entry["buckets"]):
+                running += count
+                cumulative[bound] = running
+            result[tool] = {
+                "calls": entry["calls"],
+                "in_flight": entry["in_flight"],
+                "errors": entry["errors"],
+                "latency_ms_sum": round(entry["latency_ms_sum"], 3),
+                "latency_ms_max": round(entry["latency_ms_max"], 3),
+                "latency_ms_p50_le": _quantile_bound(cumulative, entry["calls"], 0.50),
+                "latency_ms_p95_le": _quantile_bound(cumulative, entry["calls"], 0.95),
+                "latency_histogram": cumulative,
+            }
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tools.clear()
+
+
+def _quantile_bound(cumulative: Dict[str, int], calls: int, q: float) -> Optional[str]:
+    """Upper bound of the bucket holding the q-quantile (the histogram's resolution)."""
+    if not calls:
+        return None
+    for bound, count in cumulative.items():
+        if count >= q * calls:
+            return bound
+    return "+Inf"
+
+
+_tool_stats = ToolStats()
+
+
+def get_tool_stats() -> ToolStats:
+    """Process-wide tool counters, fed by run_tool_with_handling."""
+    return _tool_stats
+
+
+def _layers(data_source: Optional[FinancialDataSource]) -> Iterator[FinancialDataSource]:
+    while data_source is not None:
+        yield data_source
+        data_source = getattr(data_source, "inner", None)
+
+
+def _hit_ratio(metrics: dict) -> Optional[float]:
+    hits = sum(v for k, v in metrics.items() if k.endswith("hits") and isinstance(v, int))
+    total = hits + metrics.get("misses", 0)
+    return round(hits / total, 4) if total else None
+
+
+def _process_memory() -> dict:
+    memory = {"rss_bytes": None, "peak_rss_bytes": None}
+    try:
+        with open("/proc/self/statm") as f:
+            memory["rss_bytes"] = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        memory["peak_rss_bytes"] = peak if sys.platform == "darwin" else peak * 1024
+    return memory
+
+
+def collect_server_stats(data_source: Optional[FinancialDataSource] = None, trading_calendar=None) -> dict:
+    """
+    One snapshot of everything the server counts: tools, upstream queries,
+    every cache / pool / replay layer of the data source chain, the trading
+    calendar and process memory.
+    """
+    tools = _tool_stats.snapshot()
+    ingest = get_ingest_stats().snapshot()
+    upstream = {
+        "queries": {query: stats["calls"] for query, stats in sorted(ingest.items())},
+        "query_total": sum(stats["calls"] for stats in ingest.values()),
+        "rows_total": sum(stats["rows"] for stats in ingest.values()),
+        "wire_bytes_total": sum(stats["wire_bytes"] for stats in ingest.values()),
+    }
+    caches, sources = {}, {}
+    for layer in _layers(data_source):
+        session = getattr(layer, "session", None)
+        if session is not None and hasattr(session, "metrics"):
+            upstream["session"] = session.metrics()
+        if not hasattr(layer, "metrics"):
+            continue
+        metrics = layer.metrics()
+        if isinstance(layer, _CACHE_LAYERS):
+            caches[type(layer).__name__] = {**metrics, "hit_ratio": _hit_ratio(metrics)}
+        else:
+            sources[type(layer).__name__] = metrics
+    stats = {
+        "tools": tools,
+        "in_flight": sum(t["in_flight"] for t in tools.values()),
+        "upstream": upstream,
+        "caches": caches,
+        "data_sources": sources,
+        "process": {"pid": os.getpid(), "uptime_s": round(time.time() - _STARTED_AT, 1), **_process_memory()},
+    }
+    if trading_calendar is not None:
+        stats["trading_calendar"] = trading_calendar.metrics()
+    return stats
+
+
+def _label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(stats: dict) -> str:
+    """Renders a collect_server_stats() snapshot in the Prometheus text exposition format."""
+    lines: List[str] = []
+
+    def metric(name: str, kind: str, help_text: str, samples: List[tuple]) -> None:
+        lines.append(f"# HELP {METRIC_PREFIX}{name} {help_text}")
+        lines.append(f"# TYPE {METRIC_PREFIX}{name} {kind}")
+        for suffix, labels, value in samples:
+            label_text = ",".join(f'{k}="{_label(v)}"' for k, v in labels.items())
+            lines.append(f"{METRIC_PREFIX}{name}{suffix}{{{label_text}}} {value}" if label_text
+                         else f"{METRIC_PREFIX}{name}{suffix} {value}")
+
+    tools = stats["tools"]
+    metric("tool_calls_total", "counter", "Completed tool calls.",
+           [("", {"tool": t}, s["calls"]) for t, s in tools.items()])
+    metric("tool_errors_total", "counter", "Tool calls that returned an error, by exception class.",
+           [("", {"tool": t, "error": e}, n) for t, s in tools.items() for e, n in sorted(s["errors"].items())])
+    metric("tool_in_flight", "gauge", "Tool calls currently running.",
+           [("", {"tool": t}, s["in_flight"]) for t, s in tools.items()])
+    histogram = []
+    for tool, s in tools.items():
+        for bound, count in s["latency_histogram"].items():
+            le = bound if bound == "+Inf" else repr(int(bound) / 1000)
+            histogram.append(("_bucket", {"tool": tool, "le": le}, count))
+        histogram.append(("_sum", {"tool": tool}, s["latency_ms_sum"] / 1000))
+        histogram.append(("_count", {"tool": tool}, s["calls"]))
+    metric("tool_latency_seconds", "histogram", "Tool call latency.", histogram)
+
+    upstream = stats["upstream"]
+    metric("upstream_queries_total", "counter", "Baostock queries read in this process, by query.",
+           [("", {"query": q}, n) for q, n in upstream["queries"].items()])
+    metric("upstream_wire_bytes_total", "counter", "Bytes received from Baostock.",
+           [("", {}, upstream["wire_bytes_total"])])
+    session = upstream.get("session")
+    if session:
+        metric("upstream_logins_total", "counter", "Baostock logins, including re-logins.",
+               [("", {}, session["login_count"])])
+        metric("upstream_relogins_total", "counter", "Baostock re-logins after an expired session.",
+               [("", {}, session["relogin_count"])])
+
+    caches = stats["caches"]
+    metric("cache_hits_total", "counter", "Cache hits (all tiers, including partial hits).",
+           [("", {"cache": c}, sum(v for k, v in m.items() if k.endswith("hits") and isinstance(v, int)))
+            for c, m in caches.items()])
+    metric("cache_misses_total", "counter", "Cache misses.", [("", {"cache": c}, m["misses"]) for c, m in caches.items()])
+    metric("cache_negative_hits_total", "counter", "Calls answered from a remembered no-data result (included in hits).",
+           [("", {"cache": c}, m["negative_hits"]) for c, m in caches.items() if "negative_hits" in m])
+
+    process = stats["process"]
+    if process["rss_bytes"] is not None:
+        metric("process_resident_memory_bytes", "gauge", "Resident set size.", [("", {}, process["rss_bytes"])])
+    if process["peak_rss_bytes"] is not None:
+        metric("process_peak_resident_memory_bytes", "gauge", "Peak resident set size.",
+               [("", {}, process["peak_rss_bytes"])])
+    metric("process_uptime_seconds", "gauge", "Seconds since the server started.", [("", {}, process["uptime_s"])])
+    return "\n".join(lines) + "\n"
@@ -1,34 +1,126 @@
-"""Common error handling for MCP tools."""
+"""Common error handling and execution for MCP tools."""
+import asyncio
 import logging
-from typing import Callable
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Callable, Optional
 
 from src.data_source_interface import NoDataFoundError, LoginError, DataSourceError
+from src.profiling import CallProfile, get_profiling_config, profile_requested
+from src.services.server_stats import get_tool_stats
+from src.tracing import span
 
 logger = logging.getLogger(__name__)
 
+# Threads that run data-source backed tools off the event loop. Access to the
+# upstream itself is serialized by the data source (e.g. the Baostock session
+# lock), so extra threads only let cached work and formatting overlap.
+DEFAULT_DATA_EXECUTOR_WORKERS = 4
 
-def run_tool_with_handling(action: Callable[[], str], context: str) -> str:
+# Line between a tool's output and the profile report appended to it
+PROFILE_SEPARATOR = "--- profile ---"
+
+_data_executor: Optional[ThreadPoolExecutor] = None
+_data_executor_workers = DEFAULT_DATA_EXECUTOR_WORKERS
+_data_executor_lock = threading.Lock()
+
+
+def configure_data_executor(max_workers: int) -> None:
+    """Sets the size of the data executor. Must be called before the first tool runs."""
+    global _data_executor_workers
+    if max_workers <= 0:
+        raise ValueError("max_workers must be positive.")
+    with _data_executor_lock:
+        if _data_executor is not None:
+            raise RuntimeError("Data executor already started; configure it before serving requests.")
+        _data_executor_workers = max_workers
+
+
+def get_data_executor() -> ThreadPoolExecutor:
+    """Returns the executor dedicated to blocking data-source work, creating it on first use."""
+    global _data_executor
+    with _data_executor_lock:
+        if _data_executor is None:
+            _data_executor = ThreadPoolExecutor(
+                max_workers=_data_executor_workers, thread_name_prefix="data-source")
+        return _data_executor
+
+
+def run_tool_with_handling(action: Callable[[], str], context: str,
+                           profile: Optional[bool] = None) -> str:
     """
     Executes a callable and normalizes exceptions to user-friendly strings.
 
+    Every call is counted in the tool stats (latency, error class, in flight)
+    under the part of `context` before the first ':', i.e. the tool name.
+
+    The call runs under cProfile + tracemalloc if the tool is listed in the
+    profiling config (the report is written to its directory), or if the
+    caller asked for it (`profile`; None reads the request's `_meta.profile`),
+    in which case the report is appended to the tool's own output after a
+    PROFILE_SEPARATOR line.
+
     Args:
         action: Callable returning a string (typically formatted output).
         context: Short description for logs.
+        profile: Return a profile report along with the result.
     """
+    tool = context.split(":", 1)[0]
+    if profile is None:
+        profile = profile_requested()
+    profiling = get_profiling_config()
+    profiler = CallProfile(tool, context, profiling.top) if profile or profiling.wants(tool) else None
+    stats = get_tool_stats()
+    stats.started(tool)
+    started = time.perf_counter()
+    error: Optional[Exception] = None
     try:
-        return action()
+        with span(tool, "tool", context=context), profiler or nullcontext():
+            result = action()
     except NoDataFoundError as e:
+        error = e
         logger.warning(f"{context}: No data found: {e}")
-        return f"Error: {e}"
+        result = f"Error: {e}"
     except LoginError as e:
+        error = e
         logger.error(f"{context}: Login error: {e}")
-        return f"Error: Could not connect to data source. {e}"
+        result = f"Error: Could not connect to data source. {e}"
     except DataSourceError as e:
+        error = e
         logger.error(f"{context}: Data source error: {e}")
-        return f"Error: An error occurred while fetching data. {e}"
+        result = f"Error: An error occurred while fetching data. {e}"
     except ValueError as e:
+        error = e
         logger.warning(f"{context}: Validation error: {e}")
-        return f"Error: Invalid input parameter. {e}"
+        result = f"Error: Invalid input parameter. {e}"
     except Exception as e:  # Catch-all
+        error = e
         logger.exception(f"{context}: Unexpected error: {e}")
-        return f"Error: An unexpected error occurred: {e}"
+        result = f"Error: An unexpected error occurred: {e}"
+    finally:
+        stats.finished(tool, (time.perf_counter() - started) * 1000, error)
+    if profiler is None:
+        return result
+    if profiling.wants(tool):
+        try:
+            logger.info(f"{context}: profile written to {profiler.write(profiling.output_dir)}")
+        except OSError as e:
+            logger.warning(f"{context}: could not write profile: {e}")
+    return f"{result}\n\n{PROFILE_SEPARATOR}\n{profiler.report()}" if profile else result
+
+
+async def run_tool_async(action: Callable[[], str], context: str) -> str:
+    """
+    Runs `run_tool_with_handling` on the data executor so blocking upstream I/O
+    doesn't stall the event loop (and with it every other in-flight request).
+
+    Args:
+        action: Callable returning a string (typically formatted output).
+        context: Short description for logs.
+    """
+    loop = asyncio.get_running_loop()
+    # The request context doesn't follow the call into the executor; resolve the profile flag here
+    return await loop.run_in_executor(
+        get_data_executor(), run_tool_with_handling, action, context, profile_requested())
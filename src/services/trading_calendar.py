@@ -0,0 +1,139 @@
+"""In-memory index of the exchange trading calendar."""
+import bisect
+import logging
+import threading
+from datetime import date, datetime
+from typing import List, Optional
+
+import pandas as pd
+
+from src.data_source_interface import FinancialDataSource
+
+logger = logging.getLogger(__name__)
+
+# First day of the Shanghai exchange; Baostock's calendar starts here
+CALENDAR_START = "1990-12-19"
+
+
+def _today() -> str:
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+class TradingCalendar:
+    """
+    Loads the full trading calendar once and answers date questions locally.
+
+    Trading days are kept as a sorted list of 'YYYY-MM-DD' strings, so every
+    lookup is a binary search. The calendar is fetched again the first time it
+    is used on a new day; if that refresh fails, the previous copy keeps
+    serving. Dates outside the loaded range are reported as unknown (None).
+    """
+
+    def __init__(self, data_source: FinancialDataSource):
+        self._data_source = data_source
+        self._lock = threading.Lock()
+        self._trading_days: List[str] = []
+        self._first: Optional[str] = None
+        self._last: Optional[str] = None
+        self._loaded_on: Optional[str] = None
+        self._load_count = 0
+
+    def _ensure_loaded(self) -> None:
+        today = _today()
+        if self._loaded_on == today:
+            return
+        with self._lock:
+            if self._loaded_on == today:
+                return
+            try:
+                self._load(today)
+            except Exception as e:
+                if not self._trading_days:
+                    raise
+                logger.warning(f"Trading calendar refresh failed, keeping the copy from {self._loaded_on}: {e}")
+                self._loaded_on = today
+
+    def _load(self, today: str) -> None:
+        end_date = f"{int(today[:4]) + 1}-12-31"
+        df = self._data_source.get_trade_dates(start_date=CALENDAR_START, end_date=end_date)
+        calendar_dates = df["calendar_date"]
+        if pd.api.types.is_datetime64_any_dtype(calendar_dates):
+            calendar_dates = calendar_dates.dt.strftime("%Y-%m-%d")
+        calendar_dates = calendar_dates.astype(str)
+        flags = df["is_trading_day"].astype(str)
+        self._trading_days = sorted(calendar_dates[flags == "1"].tolist())
+        self._first = calendar_dates.min() if not df.empty else None
+        self._last = calendar_dates.max() if not df.empty else None
+        self._loaded_on = today
+        self._load_count += 1
+        logger.info(
+            f"Trading calendar loaded: {len(self._trading_days)} trading days ({self._first} to {self._last}).")
+
+    def covers(self, day: str) -> bool:
+        """Whether the loaded calendar includes `day`."""
+        self._ensure_loaded()
+        return self._first is not None and self._first <= day <= self._last
+
+    def is_trading_day(self, day: str) -> Optional[bool]:
+        """True/False for a known date, None if the date is outside the calendar."""
+        if not self.covers(day):
+            return None
+        i = bisect.bisect_left(self._trading_days, day)
+        return i < len(self._trading_days) and self._trading_days[i] == day
+
+    def previous(self, day: str) -> Optional[str]:
+        """Last trading day strictly before `day`."""
+        self._ensure_loaded()
+        i = bisect.bisect_left(self._trading_days, day)
+        return self._trading_days[i - 1] if i > 0 else None
+
+    def next(self, day: str) -> Optional[str]:
+        """First trading day strictly after `day`."""
+        self._ensure_loaded()
+        i = bisect.bisect_right(self._trading_days, day)
+        return self._trading_days[i] if i < len(self._trading_days) else None
+
+    def latest(self, on_or_before: Optional[str] = None) -> Optional[str]:
+        """Last trading day on or before the given date (default: today)."""
+        self._ensure_loaded()
+        i = bisect.bisect_right(self._trading_days, on_or_before or _today())
+        return self._trading_days[i - 1] if i > 0 else None
+
+    def last_n(self, n: int, on_or_before: Optional[str] = None) -> List[str]:
+        """Up to `n` trading days ending on or before the given date (default: today), oldest first."""
+        self._ensure_loaded()
+        if n <= 0:
+            return []
+        i = bisect.bisect_right(self._trading_days, on_or_before or _today())
+        return self._trading_days[max(0, i - n):i]
+
+    def between(self, start_date: str, end_date: str) -> List[str]:
+        """Trading days within [start_date, end_date]."""
+        self._ensure_loaded()
+        lo = bisect.bisect_left(self._trading_days, start_date)
+        hi = bisect.bisect_right(self._trading_days, end_date)
+        return self._trading_days[lo:hi]
+
+    def month_end(self, year: int, month: int) -> Optional[str]:
+        """Last trading day of the given month, if it had one."""
+        self._ensure_loaded()
+        month_start = date(year, month, 1).strftime("%Y-%m-%d")
+        next_month = date(year + month // 12, month % 12 + 1, 1).strftime("%Y-%m-%d")
+        i = bisect.bisect_left(self._trading_days, next_month)
+        if i > 0 and self._trading_days[i - 1] >= month_start:
+            return self._trading_days[i - 1]
+        return None
+
+    def month_ends(self, year: int) -> List[str]:
+        """Last trading day of every month of `year` that had one."""
+        return [d for d in (self.month_end(year, m) for m in range(1, 13)) if d]
+
+    def metrics(self) -> dict:
+        """Returns the loaded range and how often the calendar was fetched."""
+        return {
+            "trading_days": len(self._trading_days),
+            "first_date": self._first,
+            "last_date": self._last,
+            "loaded_on": self._loaded_on,
+            "load_count": self._load_count,
+        }
@@ -1,11 +1,17 @@
 """Validation utilities for tool inputs."""
+from datetime import datetime
 from typing import Iterable
 
+from src.tracing import traced
+
 VALID_FREQS = ["d", "w", "m", "5", "15", "30", "60"]
 VALID_ADJUST_FLAGS = ["1", "2", "3"]
-VALID_FORMATS = ["markdown", "json", "csv"]
+VALID_FORMATS = ["markdown", "json", "json_compact", "csv"]
 VALID_YEAR_TYPES = ["report", "operate"]
 VALID_RESERVE_YEAR_TYPES = ["0", "1", "2"]
+VALID_ROW_ORDERS = ["first", "latest"]
+VALID_BATCH_VIEWS = ["long", "summary"]
+VALID_ANALYSIS_TYPES = ["fundamental", "technical", "comprehensive"]
 
 
 def _ensure_in(value: str, allowed: Iterable[str], label: str) -> None:
@@ -13,37 +19,71 @@ def _ensure_in(value: str, allowed: Iterable[str], label: str) -> None:
         raise ValueError(f"Invalid {label} '{value}'. Valid options are: {list(allowed)}")
 
 
+@traced("validate")
 def validate_frequency(frequency: str) -> None:
     _ensure_in(frequency, VALID_FREQS, "frequency")
 
 
+@traced("validate")
 def validate_adjust_flag(adjust_flag: str) -> None:
     _ensure_in(adjust_flag, VALID_ADJUST_FLAGS, "adjust_flag")
 
 
+@traced("validate")
 def validate_output_format(fmt: str) -> None:
     _ensure_in(fmt, VALID_FORMATS, "format")
 
 
+@traced("validate")
+def validate_row_order(order: str) -> None:
+    _ensure_in(order, VALID_ROW_ORDERS, "order")
+
+
+@traced("validate")
+def validate_batch_view(view: str) -> None:
+    _ensure_in(view, VALID_BATCH_VIEWS, "view")
+
+
+@traced("validate")
+def validate_analysis_type(analysis_type: str) -> None:
+    _ensure_in(analysis_type, VALID_ANALYSIS_TYPES, "analysis_type")
+
+
+@traced("validate")
 def validate_year(year: str) -> None:
     if not year.isdigit() or len(year) != 4:
         raise ValueError(f"Invalid year '{year}'. Please provide a 4-digit year.")
 
 
+@traced("validate")
+def validate_date(value: str) -> None:
+    # strptime alone also takes '2024-6-28'; the trading calendar compares dates as strings
+    try:
+        valid = datetime.strptime(value, "%Y-%m-%d").strftime("%Y-%m-%d") == value
+    except (TypeError, ValueError):
+        valid = False
+    if not valid:
+        raise ValueError(f"Invalid date '{value}'. Please use the YYYY-MM-DD format.")
+
+
+@traced("validate")
 def validate_year_type(year_type: str) -> None:
     _ensure_in(year_type, VALID_YEAR_TYPES, "year_type")
 
 
+@traced("validate")
 def validate_quarter(quarter: int) -> None:
     if quarter not in (1, 2, 3, 4):
         raise ValueError("Invalid quarter. Must be between 1 and 4.")
 
 
+@traced("validate")
 def validate_non_empty_str(value: str, label: str) -> None:
     if value is None or not str(value).strip():
         raise ValueError(f"'{label}' is required.")
 
 
+@traced("validate")
 def validate_index_key(value: str, mapping: dict) -> str:
     key = mapping.get(value.lower()) if isinstance(value, str) else None
     if not key:
@@ -51,10 +91,12 @@ def validate_index_key(value: str, mapping: dict) -> str:
     return key
 
 
+@traced("validate")
 def validate_year_type_reserve(year_type: str) -> None:
     _ensure_in(year_type, VALID_RESERVE_YEAR_TYPES, "year_type")
 
 
+@traced("validate")
 def validate_limit(limit: int) -> None:
     if limit <= 0:
         raise ValueError("limit must be positive.")
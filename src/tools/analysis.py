@@ -3,20 +3,32 @@ Analysis tools for MCP server.
 Delegates heavy lifting to use-case layer.
 """
 import logging
+from typing import List, Optional
 
 from mcp.server.fastmcp import FastMCP
 from src.data_source_interface import FinancialDataSource
-from src.services.tool_runner import run_tool_with_handling
-from src.use_cases.analysis import build_stock_analysis_report
+from src.services.report_periods import ReportPeriodIndex
+from src.services.tool_runner import run_tool_async
+from src.services.trading_calendar import TradingCalendar
+from src.kline_batch import DEFAULT_BATCH_CONCURRENCY
+from src.use_cases.analysis import build_portfolio_analysis, build_stock_analysis_report
 
 logger = logging.getLogger(__name__)
 
 
-def register_analysis_tools(app: FastMCP, active_data_source: FinancialDataSource):
+def register_analysis_tools(
+    app: FastMCP,
+    active_data_source: FinancialDataSource,
+    trading_calendar: Optional[TradingCalendar] = None,
+    report_periods: Optional[ReportPeriodIndex] = None,
+    batch_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+):
     """Register analysis tools."""
+    trading_calendar = trading_calendar or TradingCalendar(active_data_source)
+    report_periods = report_periods or ReportPeriodIndex()
 
     @app.tool()
-    def get_stock_analysis(code: str, analysis_type: str = "fundamental") -> str:
+    async def get_stock_analysis(code: str, analysis_type: str = "fundamental") -> str:
         """
         提供基于数据的股票分析报告，而非投资建议。
 
@@ -24,8 +36,57 @@ def register_analysis_tools(app: FastMCP, active_data_source: FinancialDataSourc
             code: 股票代码，如'sh.600000'
             analysis_type: 'fundamental'|'technical'|'comprehensive'
         """
-        logger.info(f"Tool 'get_stock_analysis' called for {code}, type={analysis_type}")
-        return run_tool_with_handling(
-            lambda: build_stock_analysis_report(active_data_source, code=code, analysis_type=analysis_type),
+        logger.debug(f"Tool 'get_stock_analysis' called for {code}, type={analysis_type}")
+        return await run_tool_async(
+            lambda: build_stock_analysis_report(
+                active_data_source, code=code, analysis_type=analysis_type,
+                trading_calendar=trading_calendar, report_periods=report_periods),
             context=f"get_stock_analysis:{code}:{analysis_type}",
         )
+
+    @app.tool()
+    async def get_portfolio_analysis(
+        codes: Optional[List[str]] = None,
+        index: Optional[str] = None,
+        industry: Optional[str] = None,
+        analysis_type: str = "comprehensive",
+        limit: int = 500,
+        format: str = "markdown",
+    ) -> str:
+        """
+        对一组股票（自选列表、指数成分股或行业成员）做与 get_stock_analysis 相同的
+        基本面/技术面汇总，输出一张逐只对比的表格，而非投资建议。
+
+        Args:
+            codes: 股票代码列表，如['sh.600000', 'sz.000001']，最多500只
+            index: 代替 codes：指数成分股，'hs300'/'沪深300'、'sz50'/'上证50' 或 'zz500'/'中证500'
+            industry: 代替 codes：行业成员，行业名称与 list_industries 返回的一致
+            analysis_type: 'fundamental'|'technical'|'comprehensive'
+            limit: 最多返回的行数，默认500
+            format: 输出格式：'markdown' | 'json' | 'json_compact' | 'csv'，默认'markdown'
+
+        Returns:
+            每只股票一行：名称、行业；基本面为最新已披露季度的 ROE、销售净利率、净利润
+            与净资产同比增长、流动比率、资产负债率、总资产周转率；技术面为近180日
+            区间涨跌幅、20日均线、年化波动率和最大回撤。取数失败的股票保留在表中，
+            原因见 error 列。
+        """
+        logger.debug(
+            f"Tool 'get_portfolio_analysis' called for {len(codes) if codes else index or industry}, "
+            f"type={analysis_type}"
+        )
+        return await run_tool_async(
+            lambda: build_portfolio_analysis(
+                active_data_source,
+                codes=codes,
+                index=index,
+                industry=industry,
+                analysis_type=analysis_type,
+                limit=limit,
+                format=format,
+                trading_calendar=trading_calendar,
+                report_periods=report_periods,
+                max_concurrency=batch_concurrency,
+            ),
+            context=f"get_portfolio_analysis:{len(codes) if codes else index or industry}:{analysis_type}",
+        )
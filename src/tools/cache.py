@@ -0,0 +1,62 @@
+"""
+Cache administration tools for the MCP server.
+They only touch local files and run on the data executor like data tools.
+"""
+import logging
+from typing import Optional
+
+from mcp.server.fastmcp import FastMCP
+from src.caching.kline_cache import KLineCache
+from src.services.tool_runner import run_tool_async
+from src.use_cases.cache import fetch_kline_cache_status, invalidate_kline_cache_entries
+
+logger = logging.getLogger(__name__)
+
+
+def register_cache_tools(app: FastMCP, kline_cache: Optional[KLineCache]):
+    """
+    Register cache status/invalidation tools with the MCP app.
+
+    Args:
+        app: The FastMCP app instance
+        kline_cache: The K-line cache, or None when caching is disabled
+    """
+
+    @app.tool()
+    async def get_kline_cache_status(limit: int = 250, format: str = "markdown") -> str:
+        """
+        Shows the local K-line cache: hit/miss counters and, per cached
+        (code, frequency, adjust_flag), the covered date range, row count and size.
+
+        Args:
+            limit: Max entries to list. Defaults to 250.
+            format: Output format: 'markdown' | 'json' | 'json_compact' | 'csv'. Defaults to 'markdown'.
+        """
+        logger.debug("Tool 'get_kline_cache_status' called")
+        return await run_tool_async(
+            lambda: fetch_kline_cache_status(kline_cache, limit=limit, format=format),
+            context="get_kline_cache_status",
+        )
+
+    @app.tool()
+    async def invalidate_kline_cache(
+        code: Optional[str] = None,
+        frequency: Optional[str] = None,
+        adjust_flag: Optional[str] = None,
+    ) -> str:
+        """
+        Deletes cached K-line data so it is downloaded again on the next request,
+        e.g. after adjustment factors changed because of a dividend or split.
+
+        Args:
+            code: Only this stock (e.g. 'sh.600000'). None means every stock.
+            frequency: Only this frequency ('d', 'w', 'm', '5', '15', '30', '60'). None means all.
+            adjust_flag: Only this adjustment ('1', '2', '3'). None means all.
+        """
+        logger.debug(
+            f"Tool 'invalidate_kline_cache' called code={code}, frequency={frequency}, adjust_flag={adjust_flag}")
+        return await run_tool_async(
+            lambda: invalidate_kline_cache_entries(
+                kline_cache, code=code, frequency=frequency, adjust_flag=adjust_flag),
+            context="invalidate_kline_cache",
+        )
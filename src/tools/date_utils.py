@@ -7,77 +7,89 @@ from typing import Optional
 
 from mcp.server.fastmcp import FastMCP
 from src.data_source_interface import FinancialDataSource
-from src.services.tool_runner import run_tool_with_handling
+from src.services.tool_runner import run_tool_async, run_tool_with_handling
+from src.services.trading_calendar import TradingCalendar
 from src.use_cases import date_utils as uc_date
 
 logger = logging.getLogger(__name__)
 
 
-def register_date_utils_tools(app: FastMCP, active_data_source: FinancialDataSource):
-    """Register date utility tools."""
+def register_date_utils_tools(
+    app: FastMCP,
+    active_data_source: FinancialDataSource,
+    trading_calendar: Optional[TradingCalendar] = None,
+):
+    """
+    Register date utility tools.
+
+    All of them answer from the in-memory trading calendar; only its initial
+    load and daily refresh touch the data source.
+    """
+    trading_calendar = trading_calendar or TradingCalendar(active_data_source)
 
     @app.tool()
-    def get_latest_trading_date() -> str:
+    async def get_latest_trading_date() -> str:
         """Get the latest trading date up to today."""
-        logger.info("Tool 'get_latest_trading_date' called")
-        return run_tool_with_handling(
-            lambda: uc_date.get_latest_trading_date(active_data_source),
+        logger.debug("Tool 'get_latest_trading_date' called")
+        return await run_tool_async(
+            lambda: uc_date.get_latest_trading_date(trading_calendar),
             context="get_latest_trading_date",
         )
 
     @app.tool()
-    def get_market_analysis_timeframe(period: str = "recent") -> str:
+    async def get_market_analysis_timeframe(period: str = "recent") -> str:
         """Return a human-friendly timeframe label."""
-        logger.info(f"Tool 'get_market_analysis_timeframe' called with period={period}")
+        logger.debug(f"Tool 'get_market_analysis_timeframe' called with period={period}")
+        # Pure date arithmetic: run inline instead of queuing behind data fetches
         return run_tool_with_handling(
             lambda: uc_date.get_market_analysis_timeframe(period=period),
             context="get_market_analysis_timeframe",
         )
 
     @app.tool()
-    def is_trading_day(date: str) -> str:
+    async def is_trading_day(date: str) -> str:
         """Check if a specific date is a trading day."""
-        return run_tool_with_handling(
-            lambda: uc_date.is_trading_day(active_data_source, date=date),
+        return await run_tool_async(
+            lambda: uc_date.is_trading_day(trading_calendar, date=date),
             context=f"is_trading_day:{date}",
         )
 
     @app.tool()
-    def previous_trading_day(date: str) -> str:
+    async def previous_trading_day(date: str) -> str:
         """Get the previous trading day before the given date."""
-        return run_tool_with_handling(
-            lambda: uc_date.previous_trading_day(active_data_source, date=date),
+        return await run_tool_async(
+            lambda: uc_date.previous_trading_day(trading_calendar, date=date),
             context=f"previous_trading_day:{date}",
         )
 
     @app.tool()
-    def next_trading_day(date: str) -> str:
+    async def next_trading_day(date: str) -> str:
         """Get the next trading day after the given date."""
-        return run_tool_with_handling(
-            lambda: uc_date.next_trading_day(active_data_source, date=date),
+        return await run_tool_async(
+            lambda: uc_date.next_trading_day(trading_calendar, date=date),
             context=f"next_trading_day:{date}",
         )
 
     @app.tool()
-    def get_last_n_trading_days(days: int = 5) -> str:
+    async def get_last_n_trading_days(days: int = 5) -> str:
         """Return the last N trading dates."""
-        return run_tool_with_handling(
-            lambda: uc_date.get_last_n_trading_days(active_data_source, days=days),
+        return await run_tool_async(
+            lambda: uc_date.get_last_n_trading_days(trading_calendar, days=days),
             context=f"get_last_n_trading_days:{days}",
         )
 
     @app.tool()
-    def get_recent_trading_range(days: int = 5) -> str:
+    async def get_recent_trading_range(days: int = 5) -> str:
         """Return a date range string covering the recent N trading days."""
-        return run_tool_with_handling(
-            lambda: uc_date.get_recent_trading_range(active_data_source, days=days),
+        return await run_tool_async(
+            lambda: uc_date.get_recent_trading_range(trading_calendar, days=days),
             context=f"get_recent_trading_range:{days}",
         )
 
     @app.tool()
-    def get_month_end_trading_dates(year: int) -> str:
+    async def get_month_end_trading_dates(year: int) -> str:
         """Return month-end trading dates for a given year."""
-        return run_tool_with_handling(
-            lambda: uc_date.get_month_end_trading_dates(active_data_source, year=year),
+        return await run_tool_async(
+            lambda: uc_date.get_month_end_trading_dates(trading_calendar, year=year),
             context=f"get_month_end_trading_dates:{year}",
         )
@@ -1,6 +1,7 @@
 """
 Helper tools for code normalization and constants discovery.
-Uses shared validation and helper logic.
+Uses shared validation and helper logic. These tools never touch the data
+source, so they run inline on the event loop rather than on the data executor.
 """
 import logging
 from typing import Optional
@@ -16,32 +17,32 @@ def register_helpers_tools(app: FastMCP):
     """Register helper/utility tools with the MCP app."""
 
     @app.tool()
-    def normalize_stock_code(code: str) -> str:
+    async def normalize_stock_code(code: str) -> str:
         """Normalize a stock code to Baostock format."""
-        logger.info("Tool 'normalize_stock_code' called with input=%s", code)
+        logger.debug("Tool 'normalize_stock_code' called with input=%s", code)
         return run_tool_with_handling(
             lambda: normalize_stock_code_logic(code),
             context="normalize_stock_code",
         )
 
     @app.tool()
-    def normalize_index_code(code: str) -> str:
+    async def normalize_index_code(code: str) -> str:
         """Normalize common index codes to Baostock format."""
-        logger.info("Tool 'normalize_index_code' called with input=%s", code)
+        logger.debug("Tool 'normalize_index_code' called with input=%s", code)
         return run_tool_with_handling(
             lambda: normalize_index_code_logic(code),
             context="normalize_index_code",
         )
 
     @app.tool()
-    def list_tool_constants(kind: Optional[str] = None) -> str:
+    async def list_tool_constants(kind: Optional[str] = None) -> str:
         """
         List valid constants for tool parameters.
 
         Args:
             kind: Optional filter: 'frequency' | 'adjust_flag' | 'year_type' | 'index'. If None, show all.
         """
-        logger.info("Tool 'list_tool_constants' called kind=%s", kind or "all")
+        logger.debug("Tool 'list_tool_constants' called kind=%s", kind or "all")
         freq = [
             ("d", "daily"), ("w", "weekly"), ("m", "monthly"),
             ("5", "5 minutes"), ("15", "15 minutes"), ("30", "30 minutes"), ("60", "60 minutes"),
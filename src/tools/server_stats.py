@@ -0,0 +1,47 @@
+"""
+Server statistics tool for the MCP server.
+It only reads in-process counters, so it runs inline on the event loop.
+"""
+import logging
+from typing import Optional
+
+from mcp.server.fastmcp import FastMCP
+from src.data_source_interface import FinancialDataSource
+from src.services.tool_runner import run_tool_with_handling
+from src.services.trading_calendar import TradingCalendar
+from src.use_cases.server_stats import fetch_server_stats
+
+logger = logging.getLogger(__name__)
+
+
+def register_server_stats_tools(
+    app: FastMCP,
+    active_data_source: FinancialDataSource,
+    trading_calendar: Optional[TradingCalendar] = None,
+):
+    """
+    Register the server statistics tool with the MCP app.
+
+    Args:
+        app: The FastMCP app instance
+        active_data_source: The active financial data source (its cache and pool layers are reported)
+        trading_calendar: Optional shared trading calendar
+    """
+
+    @app.tool()
+    async def get_server_stats(format: str = "markdown") -> str:
+        """
+        Reports server health and load: per-tool call counts, latency (mean, p50/p95
+        bucket bounds, max), errors by exception class and calls in flight; upstream
+        Baostock query counts and session logins; cache hit ratios; worker pool
+        counters; and process memory.
+
+        Args:
+            format: Output format: 'markdown' | 'json' | 'json_compact' | 'csv'. Defaults to 'markdown'.
+                    'json' returns the full snapshot including latency histograms.
+        """
+        logger.debug("Tool 'get_server_stats' called")
+        return run_tool_with_handling(
+            lambda: fetch_server_stats(active_data_source, trading_calendar=trading_calendar, format=format),
+            context="get_server_stats",
+        )
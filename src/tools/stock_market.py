@@ -7,28 +7,37 @@ from typing import List, Optional
 
 from mcp.server.fastmcp import FastMCP
 from src.data_source_interface import FinancialDataSource
-from src.services.tool_runner import run_tool_with_handling
+from src.services.tool_runner import run_tool_async
+from src.services.trading_calendar import TradingCalendar
 from src.use_cases.stock_market import (
     fetch_adjust_factor_data,
     fetch_dividend_data,
     fetch_historical_k_data,
+    fetch_historical_k_data_batch,
     fetch_stock_basic_info,
 )
 
 logger = logging.getLogger(__name__)
 
 
-def register_stock_market_tools(app: FastMCP, active_data_source: FinancialDataSource):
+def register_stock_market_tools(
+    app: FastMCP,
+    active_data_source: FinancialDataSource,
+    trading_calendar: Optional[TradingCalendar] = None,
+    batch_concurrency: Optional[int] = None,
+):
     """
     Register stock market data tools with the MCP app.
 
     Args:
         app: The FastMCP app instance
         active_data_source: The active financial data source
+        trading_calendar: Optional calendar used to narrow K-line fetches to the rows `limit` keeps
+        batch_concurrency: K-line queries in flight at once for one batch call (None = source default)
     """
 
     @app.tool()
-    def get_historical_k_data(
+    async def get_historical_k_data(
         code: str,
         start_date: str,
         end_date: str,
@@ -37,6 +46,7 @@ def register_stock_market_tools(app: FastMCP, active_data_source: FinancialDataS
         fields: Optional[List[str]] = None,
         limit: int = 250,
         format: str = "markdown",
+        order: str = "first",
     ) -> str:
         """
         Fetches historical K-line (OHLCV) data for a Chinese A-share stock.
@@ -62,16 +72,18 @@ def register_stock_market_tools(app: FastMCP, active_data_source: FinancialDataS
             fields: Optional list of specific data fields to retrieve (must be valid Baostock fields).
                     If None or empty, default fields will be used (e.g., date, code, open, high, low, close, volume, amount, pctChg).
             limit: Max rows to return. Defaults to 250.
-            format: Output format: 'markdown' | 'json' | 'csv'. Defaults to 'markdown'.
+            format: Output format: 'markdown' | 'json' | 'json_compact' | 'csv'. Defaults to 'markdown'.
+            order: Which bars to return when the range holds more than `limit`:
+                   'first' (earliest) or 'latest' (most recent). Defaults to 'first'.
 
             Returns:
                 A Markdown formatted string containing the K-line data table, or an error message.
                 The table might be truncated if the result set is too large.
             """
-        logger.info(
+        logger.debug(
             f"Tool 'get_historical_k_data' called for {code} ({start_date}-{end_date}, freq={frequency}, adj={adjust_flag}, fields={fields})"
         )
-        return run_tool_with_handling(
+        return await run_tool_async(
             lambda: fetch_historical_k_data(
                 active_data_source,
                 code=code,
@@ -82,12 +94,72 @@ def register_stock_market_tools(app: FastMCP, active_data_source: FinancialDataS
                 fields=fields,
                 limit=limit,
                 format=format,
+                order=order,
+                trading_calendar=trading_calendar,
             ),
             context=f"get_historical_k_data:{code}",
         )
 
     @app.tool()
-    def get_stock_basic_info(code: str, fields: Optional[List[str]] = None, format: str = "markdown") -> str:
+    async def get_historical_k_data_batch(
+        start_date: str,
+        end_date: str,
+        codes: Optional[List[str]] = None,
+        index: Optional[str] = None,
+        frequency: str = "d",
+        adjust_flag: str = "3",
+        fields: Optional[List[str]] = None,
+        view: str = "long",
+        limit: int = 250,
+        format: str = "markdown",
+    ) -> str:
+        """
+        Fetches the same K-line window for many stocks in one call.
+
+        Args:
+            start_date: Start date in 'YYYY-MM-DD' format.
+            end_date: End date in 'YYYY-MM-DD' format.
+            codes: List of stock codes in Baostock format (e.g., ['sh.600000', 'sz.000001']), up to 500.
+            index: Instead of `codes`, an index whose current constituents to fetch:
+                   'hs300'/'沪深300', 'sz50'/'上证50' or 'zz500'/'中证500'.
+            frequency: 'd', 'w', 'm', '5', '15', '30' or '60'. Defaults to 'd'.
+            adjust_flag: '1' (后复权), '2' (前复权) or '3' (不复权). Defaults to '3'.
+            fields: Optional list of K-line fields, as for get_historical_k_data.
+            view: 'long' for one table of all bars with a code column, or 'summary'
+                  for one row per code (bars, date span, first/last close, change %, error).
+                  Defaults to 'long'.
+            limit: Max rows to return. Defaults to 250.
+            format: Output format: 'markdown' | 'json' | 'json_compact' | 'csv'. Defaults to 'markdown'.
+
+        Returns:
+            The requested table. Codes that could not be fetched are listed with
+            their error (in the meta for 'long', in the error column for 'summary');
+            the other codes are still returned.
+        """
+        logger.debug(
+            f"Tool 'get_historical_k_data_batch' called for {len(codes) if codes else index} codes "
+            f"({start_date}-{end_date}, freq={frequency}, adj={adjust_flag}, view={view})"
+        )
+        return await run_tool_async(
+            lambda: fetch_historical_k_data_batch(
+                active_data_source,
+                codes=codes,
+                index=index,
+                start_date=start_date,
+                end_date=end_date,
+                frequency=frequency,
+                adjust_flag=adjust_flag,
+                fields=fields,
+                view=view,
+                limit=limit,
+                format=format,
+                max_concurrency=batch_concurrency,
+            ),
+            context="get_historical_k_data_batch",
+        )
+
+    @app.tool()
+    async def get_stock_basic_info(code: str, fields: Optional[List[str]] = None, format: str = "markdown") -> str:
         """
         Fetches basic information for a given Chinese A-share stock.
 
@@ -100,8 +172,8 @@ def register_stock_market_tools(app: FastMCP, active_data_source: FinancialDataS
         Returns:
             Basic stock information in the requested format.
         """
-        logger.info(f"Tool 'get_stock_basic_info' called for {code} (fields={fields})")
-        return run_tool_with_handling(
+        logger.debug(f"Tool 'get_stock_basic_info' called for {code} (fields={fields})")
+        return await run_tool_async(
             lambda: fetch_stock_basic_info(
                 active_data_source, code=code, fields=fields, format=format
             ),
@@ -109,7 +181,7 @@ def register_stock_market_tools(app: FastMCP, active_data_source: FinancialDataS
         )
 
     @app.tool()
-    def get_dividend_data(code: str, year: str, year_type: str = "report", limit: int = 250, format: str = "markdown") -> str:
+    async def get_dividend_data(code: str, year: str, year_type: str = "report", limit: int = 250, format: str = "markdown") -> str:
         """
         Fetches dividend information for a given stock code and year.
 
@@ -124,8 +196,8 @@ def register_stock_market_tools(app: FastMCP, active_data_source: FinancialDataS
         Returns:
             Dividend records table.
         """
-        logger.info(f"Tool 'get_dividend_data' called for {code}, year={year}, year_type={year_type}")
-        return run_tool_with_handling(
+        logger.debug(f"Tool 'get_dividend_data' called for {code}, year={year}, year_type={year_type}")
+        return await run_tool_async(
             lambda: fetch_dividend_data(
                 active_data_source,
                 code=code,
@@ -138,7 +210,7 @@ def register_stock_market_tools(app: FastMCP, active_data_source: FinancialDataS
         )
 
     @app.tool()
-    def get_adjust_factor_data(code: str, start_date: str, end_date: str, limit: int = 250, format: str = "markdown") -> str:
+    async def get_adjust_factor_data(code: str, start_date: str, end_date: str, limit: int = 250, format: str = "markdown") -> str:
         """
         Fetches adjustment factor data for a given stock code and date range.
         Uses Baostock's "涨跌幅复权算法" factors. Useful for calculating adjusted prices.
@@ -151,8 +223,8 @@ def register_stock_market_tools(app: FastMCP, active_data_source: FinancialDataS
         Returns:
             Adjustment factors table.
         """
-        logger.info(f"Tool 'get_adjust_factor_data' called for {code} ({start_date} to {end_date})")
-        return run_tool_with_handling(
+        logger.debug(f"Tool 'get_adjust_factor_data' called for {code} ({start_date} to {end_date})")
+        return await run_tool_async(
             lambda: fetch_adjust_factor_data(
                 active_data_source,
                 code=code,
@@ -0,0 +1,185 @@
+# Lightweight in-process tracing spans, exportable in Chrome trace format
+import atexit
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, List, Optional, TextIO
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUFFER_SPANS = 20000
+
+# Returned by span() while tracing is off; entering and leaving it does nothing
+_NO_SPAN = nullcontext()
+
+
+class _Span:
+    __slots__ = ("_tracer", "_name", "_category", "_args", "_started_ns")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: Dict[str, Any]):
+        self._tracer = tracer
+        self._name = name
+        self._category = category
+        self._args = args
+
+    def __enter__(self) -> "_Span":
+        self._started_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        ended_ns = time.perf_counter_ns()
+        if exc_type is not None:
+            self._args["error"] = exc_type.__name__
+        self._tracer._finish(self._name, self._category, self._args, self._started_ns, ended_ns)
+
+    def set(self, **args: Any) -> None:
+        """Adds arguments to the span, e.g. a row count known only at the end."""
+        self._args.update(args)
+
+
+class Tracer:
+    """
+    Collects timed spans (tool call, use case, data source method, Baostock
+    login / query / paging, frame construction, validation, rendering).
+
+    Finished spans go to a ring buffer of the last `buffer_spans` spans and,
+    if a path is set, are appended to a Chrome trace file (JSON array format,
+    which chrome://tracing and Perfetto open even while it is still being
+    written). Spans nest by time within a thread. While disabled, span() hands
+    out a shared no-op context manager and traced functions call straight
+    through, so instrumentation costs one attribute check.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._buffer: deque = deque(maxlen=DEFAULT_BUFFER_SPANS)
+        self._file: Optional[TextIO] = None
+        self._path: Optional[str] = None
+        self._named_threads: set = set()
+        self._origin_ns = time.perf_counter_ns()
+        self._pid = os.getpid()
+        self._atexit_registered = False
+
+    def configure(self, enabled: bool, buffer_spans: int = DEFAULT_BUFFER_SPANS, path: Optional[str] = None) -> None:
+        """Turns tracing on or off, resizing the ring buffer and (re)opening the trace file."""
+        with self._lock:
+            self._close_file()
+            self._buffer = deque(self._buffer, maxlen=max(1, buffer_spans))
+            if enabled and path:
+                self._path = os.path.abspath(os.path.expanduser(path))
+                os.makedirs(os.path.dirname(self._path), exist_ok=True)
+                self._file = open(self._path, "w", encoding="utf-8")
+                self._file.write("[\n")
+                self._named_threads.clear()
+                if not self._atexit_registered:
+                    atexit.register(self.close)
+                    self._atexit_registered = True
+            self.enabled = enabled
+        if enabled:
+            logger.info(f"Tracing enabled (buffer {buffer_spans} spans, file {self._path or 'none'}).")
+
+    def span(self, name: str, category: str = "function", **args: Any):
+        """Context manager timing the enclosed block as one span."""
+        if not self.enabled:
+            return _NO_SPAN
+        return _Span(self, name, category, args)
+
+    def _finish(self, name: str, category: str, args: Dict[str, Any], started_ns: int, ended_ns: int) -> None:
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (started_ns - self._origin_ns) / 1000,
+            "dur": (ended_ns - started_ns) / 1000,
+            "pid": self._pid,
+            "tid": thread.ident,
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self._buffer.append(event)
+            if self._file is not None:
+                if thread.ident not in self._named_threads:
+                    self._named_threads.add(thread.ident)
+                    self._write({"name": "thread_name", "ph": "M", "pid": self._pid, "tid": thread.ident,
+                                 "args": {"name": thread.name}})
+                self._write(event)
+
+    def _write(self, event: dict) -> None:
+        self._file.write(json.dumps(event, ensure_ascii=False, default=str))
+        self._file.write(",\n")
+
+    def spans(self, limit: Optional[int] = None) -> List[dict]:
+        """The most recent finished spans (all buffered ones by default), oldest first."""
+        with self._lock:
+            events = list(self._buffer)
+        return events[-limit:] if limit else events
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Count, total and max duration (ms) per span name over the buffered spans."""
+        totals: Dict[str, Dict[str, float]] = {}
+        for event in self.spans():
+            stats = totals.setdefault(event["name"], {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            dur_ms = event["dur"] / 1000
+            stats["count"] += 1
+            stats["total_ms"] += dur_ms
+            stats["max_ms"] = max(stats["max_ms"], dur_ms)
+        return {name: {k: round(v, 3) for k, v in stats.items()} for name, stats in totals.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buffer.clear()
+
+    def close(self) -> None:
+        """Flushes and closes the trace file. Safe to call more than once."""
+        with self._lock:
+            self._close_file()
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """The process-wide tracer (disabled until configured)."""
+    return _tracer
+
+
+def configure_tracing(enabled: bool, buffer_spans: int = DEFAULT_BUFFER_SPANS, path: Optional[str] = None) -> None:
+    _tracer.configure(enabled, buffer_spans, path)
+
+
+def span(name: str, category: str = "function", **args: Any):
+    """Times the enclosed block on the process-wide tracer (a no-op while tracing is off)."""
+    if not _tracer.enabled:
+        return _NO_SPAN
+    return _Span(_tracer, name, category, args)
+
+
+def traced(category: str = "function", name: Optional[str] = None) -> Callable:
+    """Decorator recording each call of the function as a span named after it."""
+
+    def decorate(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _tracer.enabled:
+                return func(*args, **kwargs)
+            with _Span(_tracer, span_name, category, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
@@ -1,35 +1,141 @@
 """Use case for stock analysis report generation."""
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 
-from src.data_source_interface import FinancialDataSource
-from src.formatting.markdown_formatter import format_df_to_markdown
+import numpy as np
+import pandas as pd
 
+from src.data_source_interface import FinancialDataSource, LoginError, NoDataFoundError
+from src.formatting.markdown_formatter import format_df_to_markdown, format_table_output
+from src.kline_batch import DEFAULT_BATCH_CONCURRENCY
+from src.services.report_periods import ReportPeriodIndex
+from src.services.trading_calendar import TradingCalendar
+from src.services.validation import (
+    validate_analysis_type,
+    validate_index_key,
+    validate_non_empty_str,
+    validate_output_format,
+)
+from src.tracing import traced
+from src.use_cases.indices import INDEX_MAP, get_index_constituents
+from src.use_cases.stock_market import MAX_BATCH_CODES
 
-def build_stock_analysis_report(data_source: FinancialDataSource, *, code: str, analysis_type: str) -> str:
-    basic_info = data_source.get_stock_basic_info(code=code)
+# Quarterly reports behind the fundamental section: (key, FinancialDataSource method)
+_REPORTS = (
+    ("profit", "get_profit_data"),
+    ("growth", "get_growth_data"),
+    ("balance", "get_balance_data"),
+    ("dupont", "get_dupont_data"),
+)
 
-    # Fundamental data
-    if analysis_type in ["fundamental", "comprehensive"]:
-        recent_year = datetime.now().strftime("%Y")
-        recent_quarter = (datetime.now().month - 1) // 3 + 1
-        if recent_quarter < 1:
-            recent_year = str(int(recent_year) - 1)
-            recent_quarter = 4
+# Upstream queries in flight at once for one report (basic info, K-lines and
+# four reports for up to two candidate quarters)
+DEFAULT_REPORT_CONCURRENCY = 10
 
-        profit_data = data_source.get_profit_data(code=code, year=recent_year, quarter=recent_quarter)
-        growth_data = data_source.get_growth_data(code=code, year=recent_year, quarter=recent_quarter)
-        balance_data = data_source.get_balance_data(code=code, year=recent_year, quarter=recent_quarter)
-        dupont_data = data_source.get_dupont_data(code=code, year=recent_year, quarter=recent_quarter)
-    else:
-        profit_data = growth_data = balance_data = dupont_data = None
+# Calendar days of K-lines behind the technical section
+PRICE_WINDOW_DAYS = 180
+
+
+def _format_date(value) -> str:
+    if pd.isna(value):
+        return '未知'
+    return pd.Timestamp(value).strftime("%Y-%m-%d")
+
+
+def _fetch_report(data_source: FinancialDataSource, method: str, code: str, quarter: Tuple[int, int]):
+    """One quarterly report, or None if the quarter has none (not published yet)."""
+    year, q = quarter
+    try:
+        return getattr(data_source, method)(code=code, year=str(year), quarter=q)
+    except NoDataFoundError:
+        return None
+
+
+def _price_window(trading_calendar: Optional[TradingCalendar]) -> Tuple[str, str]:
+    """The last 180 days, clamped to trading days so cached ranges line up across calls."""
+    end_date = datetime.now().strftime("%Y-%m-%d")
+    start_date = (datetime.now() - timedelta(days=PRICE_WINDOW_DAYS)).strftime("%Y-%m-%d")
+    if trading_calendar is not None:
+        end_date = trading_calendar.latest(end_date) or end_date
+        start_date = trading_calendar.next(
+            (datetime.strptime(start_date, "%Y-%m-%d") - timedelta(days=1)).strftime("%Y-%m-%d")) or start_date
+    return start_date, end_date
+
+
+def _fetch_price_data(data_source: FinancialDataSource, code: str, trading_calendar: Optional[TradingCalendar]):
+    start_date, end_date = _price_window(trading_calendar)
+    return data_source.get_historical_k_data(code=code, start_date=start_date, end_date=end_date)
 
-    # Technical data
-    if analysis_type in ["technical", "comprehensive"]:
-        end_date = datetime.now().strftime("%Y-%m-%d")
-        start_date = (datetime.now() - timedelta(days=180)).strftime("%Y-%m-%d")
-        price_data = data_source.get_historical_k_data(code=code, start_date=start_date, end_date=end_date)
-    else:
-        price_data = None
+
+def _latest_reports(
+    data_source: FinancialDataSource,
+    code: str,
+    report_periods: ReportPeriodIndex,
+    executor: ThreadPoolExecutor,
+    futures: Dict[Tuple[Tuple[int, int], str], Future],
+    candidates: List[Tuple[int, int]],
+) -> Tuple[Optional[Tuple[int, int]], Dict[str, Optional[pd.DataFrame]]]:
+    """Picks the newest candidate quarter with a profit report, walking further back only if none has one."""
+    for quarter in candidates:
+        profit = futures[(quarter, "profit")].result()
+        if profit is not None and not profit.empty:
+            report_periods.remember(code, quarter)
+            return quarter, {key: futures[(quarter, key)].result() for key, _ in _REPORTS}
+    for quarter in report_periods.fallback(code, candidates):
+        profit = _fetch_report(data_source, "get_profit_data", code, quarter)
+        if profit is not None and not profit.empty:
+            report_periods.remember(code, quarter)
+            others = {key: executor.submit(_fetch_report, data_source, method, code, quarter)
+                      for key, method in _REPORTS if key != "profit"}
+            return quarter, {"profit": profit, **{key: future.result() for key, future in others.items()}}
+    if candidates:
+        report_periods.remember(code, None)
+    return None, {}
+
+
+@traced("use_case")
+def build_stock_analysis_report(
+    data_source: FinancialDataSource,
+    *,
+    code: str,
+    analysis_type: str,
+    trading_calendar: Optional[TradingCalendar] = None,
+    report_periods: Optional[ReportPeriodIndex] = None,
+    max_concurrency: int = DEFAULT_REPORT_CONCURRENCY,
+) -> str:
+    """
+    Renders the analysis report for one stock.
+
+    Basic info, the 180-day K-lines and the reports of the latest published
+    quarter are fetched concurrently, so a cold report takes about as long as
+    its slowest query. The quarter comes from `report_periods`: while it
+    remembers the answer for `code` only that quarter is fetched, otherwise
+    the one or two quarters that may be the latest are fetched side by side.
+    """
+    fundamental = analysis_type in ["fundamental", "comprehensive"]
+    technical = analysis_type in ["technical", "comprehensive"]
+    report_periods = report_periods or ReportPeriodIndex()
+    candidates = report_periods.candidates(code) if fundamental else []
+
+    tasks = 1 + technical + len(candidates) * len(_REPORTS)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, tasks)), thread_name_prefix="analysis") as executor:
+        basic_future = executor.submit(data_source.get_stock_basic_info, code=code)
+        price_future = executor.submit(_fetch_price_data, data_source, code, trading_calendar) if technical else None
+        report_futures = {(quarter, key): executor.submit(_fetch_report, data_source, method, code, quarter)
+                          for quarter in candidates for key, method in _REPORTS}
+
+        basic_info = basic_future.result()
+        price_data = price_future.result() if price_future is not None else None
+        if fundamental:
+            period, reports = _latest_reports(data_source, code, report_periods, executor, report_futures, candidates)
+        else:
+            period, reports = None, {}
+
+    profit_data = reports.get("profit")
+    growth_data = reports.get("growth")
+    balance_data = reports.get("balance")
+    dupont_data = reports.get("dupont")
 
     report = f"# {basic_info['code_name'].values[0] if not basic_info.empty else code} 数据分析报告\n\n"
     report += "## 免责声明\n本报告基于公开数据生成，仅供参考，不构成投资建议。投资决策需基于个人风险承受能力和研究。\n\n"
@@ -40,10 +146,10 @@ def build_stock_analysis_report(data_source: FinancialDataSource, *, code: str,
         report += f"- 股票代码: {code}\n"
         report += f"- 股票名称: {basic_info['code_name'].values[0]}\n"
         report += f"- 所属行业: {basic_info['industry'].values[0] if 'industry' in basic_info.columns else '未知'}\n"
-        report += f"- 上市日期: {basic_info['ipoDate'].values[0] if 'ipoDate' in basic_info.columns else '未知'}\n\n"
+        report += f"- 上市日期: {_format_date(basic_info['ipoDate'].iloc[0]) if 'ipoDate' in basic_info.columns else '未知'}\n\n"
 
-    if analysis_type in ["fundamental", "comprehensive"] and profit_data is not None and not profit_data.empty:
-        report += f"## 基本面指标分析 ({recent_year}年第{recent_quarter}季度)\n\n"
+    if fundamental and profit_data is not None and not profit_data.empty:
+        report += f"## 基本面指标分析 ({period[0]}年第{period[1]}季度)\n\n"
         report += "### 盈利能力指标\n"
         if 'roeAvg' in profit_data.columns:
             report += f"- ROE(净资产收益率): {profit_data['roeAvg'].values[0]}%\n"
@@ -66,14 +172,199 @@ def build_stock_analysis_report(data_source: FinancialDataSource, *, code: str,
             if 'assetLiabRatio' in balance_data.columns:
                 report += f"- 资产负债率: {balance_data['assetLiabRatio'].values[0]}%\n"
 
-    if analysis_type in ["technical", "comprehensive"] and price_data is not None and not price_data.empty:
+        if dupont_data is not None and not dupont_data.empty:
+            report += "\n### 杜邦分析\n"
+            if 'dupontROE' in dupont_data.columns:
+                report += f"- 净资产收益率: {dupont_data['dupontROE'].values[0]}\n"
+            if 'dupontAssetStoEquity' in dupont_data.columns:
+                report += f"- 权益乘数: {dupont_data['dupontAssetStoEquity'].values[0]}\n"
+            if 'dupontAssetTurn' in dupont_data.columns:
+                report += f"- 总资产周转率: {dupont_data['dupontAssetTurn'].values[0]}\n"
+
+    if technical and price_data is not None and not price_data.empty:
         report += "\n## 技术面简析（近180日）\n"
         latest_price = price_data['close'].iloc[-1]
         start_price = price_data['close'].iloc[0]
         price_change = ((latest_price - start_price) / start_price) * 100 if start_price else 0
         report += f"- 区间涨跌幅: {price_change:.2f}%\n"
         if 'close' in price_data.columns and price_data.shape[0] >= 20:
-            ma20 = price_data['close'].astype(float).rolling(window=20).mean().iloc[-1]
+            ma20 = price_data['close'].rolling(window=20).mean().iloc[-1]
             report += f"- 20日均线: {ma20:.2f}\n"
 
     return report
+
+
+# Report fields in the portfolio table: (report key, field, column)
+_PORTFOLIO_FUNDAMENTALS = (
+    ("profit", "roeAvg", "roe_avg"),
+    ("profit", "npMargin", "np_margin"),
+    ("growth", "YOYNI", "yoy_ni"),
+    ("growth", "YOYEquity", "yoy_equity"),
+    ("balance", "currentRatio", "current_ratio"),
+    ("balance", "liabilityToAsset", "liability_to_asset"),
+    ("dupont", "dupontAssetTurn", "asset_turn"),
+)
+
+_PRICE_COLUMNS = ["last_date", "last_close", "return_pct", "ma20", "volatility_pct", "max_drawdown_pct"]
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+def _price_metrics(bars: pd.DataFrame) -> pd.DataFrame:
+    """
+    Period return, MA20, annualized volatility and max drawdown for every code,
+    computed column-wise on one date x code matrix of closes.
+
+    Suspended days are gaps in the matrix: MA20 averages each code's own last
+    20 bars, daily returns skip the gap (the first bar after it carries the
+    whole move), and drawdowns run on the forward-filled close.
+    """
+    if bars.empty or not {"date", "code", "close"} <= set(bars.columns):
+        return pd.DataFrame(columns=_PRICE_COLUMNS)
+    close = (bars.assign(close=pd.to_numeric(bars["close"], errors="coerce"))
+             .pivot(index="date", columns="code", values="close")
+             .sort_index())
+    valid = close.notna()
+    filled = close.ffill()
+    first = close.bfill().iloc[0]
+    last = filled.iloc[-1]
+    bars_from_end = valid.iloc[::-1].cumsum().iloc[::-1]
+    ma20 = close.where(bars_from_end <= 20).mean().where(valid.sum() >= 20)
+    log_returns = np.log(filled).diff().where(valid)
+    metrics = pd.DataFrame({
+        "last_date": valid.iloc[::-1].idxmax(),
+        "last_close": last,
+        "return_pct": (last / first.where(first != 0) - 1) * 100,
+        "ma20": ma20,
+        "volatility_pct": log_returns.std() * np.sqrt(TRADING_DAYS_PER_YEAR) * 100,
+        "max_drawdown_pct": (filled / filled.cummax() - 1).min() * 100,
+    })
+    return metrics.round({"last_close": 2, "return_pct": 2, "ma20": 2, "volatility_pct": 2, "max_drawdown_pct": 2})
+
+
+def _resolve_portfolio(
+    data_source: FinancialDataSource,
+    codes: Optional[List[str]],
+    index: Optional[str],
+    industry: Optional[str],
+) -> Tuple[List[str], dict, Optional[pd.DataFrame]]:
+    """Member codes, the meta describing where they came from, and the industry table if it was read."""
+    if sum(bool(x) for x in (codes, index, industry)) != 1:
+        raise ValueError("Provide exactly one of 'codes', 'index' or 'industry'.")
+    industries = None
+    if index:
+        key = validate_index_key(index, INDEX_MAP)
+        code_list = get_index_constituents(data_source, key)["code"].tolist()
+        meta = {"index": key}
+    elif industry:
+        validate_non_empty_str(industry, "industry")
+        industries = data_source.get_stock_industry(code=None)
+        col = "industry" if "industry" in industries.columns else industries.columns[-1]
+        code_list = industries.loc[industries[col] == industry, "code"].tolist()
+        meta = {"industry": industry}
+        if not code_list:
+            raise NoDataFoundError(f"No stocks found in industry '{industry}'.")
+    else:
+        # Keep the caller's order, drop blanks and repeats
+        code_list = list(dict.fromkeys(c.strip() for c in codes if c and c.strip()))
+        meta = {}
+    if not code_list:
+        raise ValueError("No stock codes to analyze.")
+    if len(code_list) > MAX_BATCH_CODES:
+        raise ValueError(f"Too many codes ({len(code_list)}); at most {MAX_BATCH_CODES} per call.")
+    return code_list, meta, industries
+
+
+@traced("use_case")
+def build_portfolio_analysis(
+    data_source: FinancialDataSource,
+    *,
+    codes: Optional[List[str]] = None,
+    index: Optional[str] = None,
+    industry: Optional[str] = None,
+    analysis_type: str = "comprehensive",
+    limit: int = MAX_BATCH_CODES,
+    format: str = "markdown",
+    trading_calendar: Optional[TradingCalendar] = None,
+    report_periods: Optional[ReportPeriodIndex] = None,
+    max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+) -> str:
+    """
+    The fundamental and technical summary of build_stock_analysis_report for
+    many stocks at once, as one comparative table with a row per code.
+
+    Everything goes through one pipeline: the industry table (names and
+    industries), the batch K-line fetch and the quarterly reports of every
+    code's latest published quarter (see build_stock_analysis_report) are
+    queried concurrently, at most `max_concurrency` at a time, and share the
+    data source's caches with the single-stock tools. Price metrics are then
+    computed for all codes together. A code whose data could not be fetched
+    keeps its row, with the reason in the error column.
+    """
+    validate_analysis_type(analysis_type)
+    validate_output_format(format)
+    fundamental = analysis_type in ["fundamental", "comprehensive"]
+    technical = analysis_type in ["technical", "comprehensive"]
+    report_periods = report_periods or ReportPeriodIndex()
+
+    code_list, meta, industries = _resolve_portfolio(data_source, codes, index, industry)
+    start_date, end_date = _price_window(trading_calendar) if technical else (None, None)
+    candidates = {code: report_periods.candidates(code) for code in code_list} if fundamental else {}
+
+    errors: Dict[str, str] = {}
+    reports: Dict[str, Dict[str, Optional[pd.DataFrame]]] = {}
+    periods: Dict[str, Optional[Tuple[int, int]]] = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix="portfolio") as executor:
+        industries_future = (executor.submit(data_source.get_stock_industry, code=None)
+                             if industries is None else None)
+        batch_future = (executor.submit(data_source.get_historical_k_data_batch, codes=code_list,
+                                        start_date=start_date, end_date=end_date, max_concurrency=max_concurrency)
+                        if technical else None)
+        report_futures = {(code, quarter, key): executor.submit(_fetch_report, data_source, method, code, quarter)
+                          for code, quarters in candidates.items()
+                          for quarter in quarters for key, method in _REPORTS}
+
+        for code, quarters in candidates.items():
+            futures = {(quarter, key): report_futures[(code, quarter, key)] for quarter in quarters for key, _ in _REPORTS}
+            try:
+                periods[code], reports[code] = _latest_reports(
+                    data_source, code, report_periods, executor, futures, quarters)
+            except LoginError:
+                raise
+            except Exception as e:
+                errors[code] = f"{type(e).__name__}: {e}"
+        batch = batch_future.result() if batch_future is not None else None
+        if industries_future is not None:
+            try:
+                industries = industries_future.result()
+            except NoDataFoundError:
+                industries = None
+
+    table = pd.DataFrame({"code": code_list})
+    if industries is not None and not industries.empty:
+        lookup = industries.drop_duplicates("code").set_index("code")
+        table["name"] = table["code"].map(lookup["code_name"]) if "code_name" in lookup.columns else None
+        table["industry"] = table["code"].map(lookup["industry"]) if "industry" in lookup.columns else None
+
+    if fundamental:
+        table["quarter"] = [f"{periods[code][0]}Q{periods[code][1]}" if periods.get(code) else None
+                            for code in code_list]
+        for key, field, column in _PORTFOLIO_FUNDAMENTALS:
+            values = []
+            for code in code_list:
+                frame = reports.get(code, {}).get(key)
+                values.append(frame[field].iloc[0] if frame is not None and not frame.empty
+                              and field in frame.columns else None)
+            table[column] = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce")
+
+    if technical:
+        metrics = _price_metrics(batch.long_frame())
+        table = table.join(metrics.reindex(columns=_PRICE_COLUMNS), on="code")
+        for code, message in batch.errors.items():
+            errors.setdefault(code, message)
+
+    table["error"] = table["code"].map(errors)
+    meta.update({"codes": len(code_list), "analysis_type": analysis_type, "failed": len(errors)})
+    if technical:
+        meta.update({"start_date": start_date, "end_date": end_date})
+    return format_table_output(table, format=format, max_rows=limit, meta=meta)
@@ -0,0 +1,44 @@
+"""Cache administration use cases (status and invalidation)."""
+from typing import Optional
+
+import pandas as pd
+
+from src.caching.kline_cache import KLineCache
+from src.formatting.markdown_formatter import format_table_output
+from src.services.validation import validate_adjust_flag, validate_frequency, validate_output_format
+from src.tracing import traced
+
+
+def _require_cache(cache: Optional[KLineCache]) -> KLineCache:
+    if cache is None:
+        raise ValueError("K-line cache is disabled (set A_SHARE_MCP_KLINE_CACHE=1 to enable it).")
+    return cache
+
+
+@traced("use_case")
+def fetch_kline_cache_status(
+    cache: Optional[KLineCache],
+    *,
+    limit: int = 250,
+    format: str = "markdown",
+) -> str:
+    validate_output_format(format)
+    status = _require_cache(cache).status()
+    df = pd.DataFrame(status["entries"])
+    return format_table_output(df, format=format, max_rows=limit, meta=status["stats"])
+
+
+@traced("use_case")
+def invalidate_kline_cache_entries(
+    cache: Optional[KLineCache],
+    *,
+    code: Optional[str] = None,
+    frequency: Optional[str] = None,
+    adjust_flag: Optional[str] = None,
+) -> str:
+    if frequency is not None:
+        validate_frequency(frequency)
+    if adjust_flag is not None:
+        validate_adjust_flag(adjust_flag)
+    removed = _require_cache(cache).invalidate(code=code, frequency=frequency, adjust_flag=adjust_flag)
+    return f"Removed {removed} K-line cache entries (code={code or 'all'}, frequency={frequency or 'all'}, adjust_flag={adjust_flag or 'all'})."
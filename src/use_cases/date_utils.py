@@ -1,30 +1,18 @@
 """Use cases for date utility tools."""
-import calendar
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import datetime
 
-import pandas as pd
+from src.services.trading_calendar import TradingCalendar
+from src.services.validation import validate_date
+from src.tracing import traced
 
-from src.data_source_interface import FinancialDataSource
 
-
-def _fetch_trading_days(data_source: FinancialDataSource, start_date: str, end_date: str) -> pd.DataFrame:
-    return data_source.get_trade_dates(start_date=start_date, end_date=end_date)
-
-
-def get_latest_trading_date(data_source: FinancialDataSource) -> str:
+@traced("use_case")
+def get_latest_trading_date(trading_calendar: TradingCalendar) -> str:
     today = datetime.now().strftime("%Y-%m-%d")
-    start_date = datetime.now().replace(day=1).strftime("%Y-%m-%d")
-    end_date = datetime.now().replace(day=28).strftime("%Y-%m-%d")
-    df = _fetch_trading_days(data_source, start_date=start_date, end_date=end_date)
-    valid_trading_days = df[df["is_trading_day"] == "1"]["calendar_date"].tolist()
-    latest_trading_date = None
-    for dstr in valid_trading_days:
-        if dstr <= today and (latest_trading_date is None or dstr > latest_trading_date):
-            latest_trading_date = dstr
-    return latest_trading_date or today
+    return trading_calendar.latest(today) or today
 
 
+@traced("use_case")
 def get_market_analysis_timeframe(period: str = "recent") -> str:
     now = datetime.now()
     end_date = now
@@ -53,60 +41,40 @@ def get_market_analysis_timeframe(period: str = "recent") -> str:
     return f"{start_date.strftime('%Y-%m-%d')} 至 {end_date.strftime('%Y-%m-%d')}"
 
 
-def is_trading_day(data_source: FinancialDataSource, *, date: str) -> str:
-    df = _fetch_trading_days(data_source, start_date=date, end_date=date)
-    if df.empty:
+@traced("use_case")
+def is_trading_day(trading_calendar: TradingCalendar, *, date: str) -> str:
+    validate_date(date)
+    result = trading_calendar.is_trading_day(date)
+    if result is None:
         return "未知"
-    row = df.iloc[0]
-    return "是" if str(row.get("is_trading_day", "")) == "1" else "否"
-
-
-def previous_trading_day(data_source: FinancialDataSource, *, date: str) -> str:
-    target = datetime.strptime(date, "%Y-%m-%d")
-    start = (target - timedelta(days=31)).strftime("%Y-%m-%d")
-    df = _fetch_trading_days(data_source, start_date=start, end_date=date)
-    days = df[df["is_trading_day"] == "1"]["calendar_date"].tolist()
-    prev = max([d for d in days if d < date], default=None)
-    return prev or date
-
-
-def next_trading_day(data_source: FinancialDataSource, *, date: str) -> str:
-    target = datetime.strptime(date, "%Y-%m-%d")
-    end = (target + timedelta(days=31)).strftime("%Y-%m-%d")
-    df = _fetch_trading_days(data_source, start_date=date, end_date=end)
-    days = df[df["is_trading_day"] == "1"]["calendar_date"].tolist()
-    next_day = min([d for d in days if d > date], default=None)
-    return next_day or date
-
-
-def get_last_n_trading_days(data_source: FinancialDataSource, *, days: int) -> str:
-    today = datetime.now()
-    start = (today - timedelta(days=days * 2)).strftime("%Y-%m-%d")
-    end = today.strftime("%Y-%m-%d")
-    df = _fetch_trading_days(data_source, start_date=start, end_date=end)
-    trading_days = df[df["is_trading_day"] == "1"]["calendar_date"].tolist()
-    return ", ".join(trading_days[-days:]) if trading_days else ""
-
-
-def get_recent_trading_range(data_source: FinancialDataSource, *, days: int) -> str:
-    today = datetime.now()
-    start = (today - timedelta(days=days * 2)).strftime("%Y-%m-%d")
-    end = today.strftime("%Y-%m-%d")
-    df = _fetch_trading_days(data_source, start_date=start, end_date=end)
-    trading_days = df[df["is_trading_day"] == "1"]["calendar_date"].tolist()
+    return "是" if result else "否"
+
+
+@traced("use_case")
+def previous_trading_day(trading_calendar: TradingCalendar, *, date: str) -> str:
+    validate_date(date)
+    return trading_calendar.previous(date) or date
+
+
+@traced("use_case")
+def next_trading_day(trading_calendar: TradingCalendar, *, date: str) -> str:
+    validate_date(date)
+    return trading_calendar.next(date) or date
+
+
+@traced("use_case")
+def get_last_n_trading_days(trading_calendar: TradingCalendar, *, days: int) -> str:
+    return ", ".join(trading_calendar.last_n(days))
+
+
+@traced("use_case")
+def get_recent_trading_range(trading_calendar: TradingCalendar, *, days: int) -> str:
+    trading_days = trading_calendar.last_n(days)
     if not trading_days:
         return ""
-    return f"{trading_days[-days]} 至 {trading_days[-1]}" if len(trading_days) >= days else f"{trading_days[0]} 至 {trading_days[-1]}"
-
-
-def get_month_end_trading_dates(data_source: FinancialDataSource, *, year: int) -> str:
-    results = []
-    for month in range(1, 13):
-        last_day = calendar.monthrange(year, month)[1]
-        start_date = datetime(year, month, last_day - 7).strftime("%Y-%m-%d")
-        end_date = datetime(year, month, last_day).strftime("%Y-%m-%d")
-        df = _fetch_trading_days(data_source, start_date=start_date, end_date=end_date)
-        trading_days = df[df["is_trading_day"] == "1"]["calendar_date"].tolist()
-        if trading_days:
-            results.append(trading_days[-1])
-    return ", ".join(results)
+    return f"{trading_days[0]} 至 {trading_days[-1]}"
+
+
+@traced("use_case")
+def get_month_end_trading_dates(trading_calendar: TradingCalendar, *, year: int) -> str:
+    return ", ".join(trading_calendar.month_ends(year))
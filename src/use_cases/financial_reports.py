@@ -8,6 +8,7 @@ from src.services.validation import (
     validate_quarter,
     validate_year,
 )
+from src.tracing import traced
 
 
 def _format_financial_df(df, *, code: str, year: str | None, quarter: Optional[int], dataset: str, format: str, limit: int) -> str:
@@ -19,6 +20,7 @@ def _format_financial_df(df, *, code: str, year: str | None, quarter: Optional[i
     return format_table_output(df, format=format, max_rows=limit, meta=meta)
 
 
+@traced("use_case")
 def fetch_profit_data(data_source: FinancialDataSource, *, code: str, year: str, quarter: int, limit: int, format: str) -> str:
     validate_year(year)
     validate_quarter(quarter)
@@ -27,6 +29,7 @@ def fetch_profit_data(data_source: FinancialDataSource, *, code: str, year: str,
     return _format_financial_df(df, code=code, year=year, quarter=quarter, dataset="Profitability", format=format, limit=limit)
 
 
+@traced("use_case")
 def fetch_operation_data(data_source: FinancialDataSource, *, code: str, year: str, quarter: int, limit: int, format: str) -> str:
     validate_year(year)
     validate_quarter(quarter)
@@ -35,6 +38,7 @@ def fetch_operation_data(data_source: FinancialDataSource, *, code: str, year: s
     return _format_financial_df(df, code=code, year=year, quarter=quarter, dataset="Operation Capability", format=format, limit=limit)
 
 
+@traced("use_case")
 def fetch_growth_data(data_source: FinancialDataSource, *, code: str, year: str, quarter: int, limit: int, format: str) -> str:
     validate_year(year)
     validate_quarter(quarter)
@@ -43,6 +47,7 @@ def fetch_growth_data(data_source: FinancialDataSource, *, code: str, year: str,
     return _format_financial_df(df, code=code, year=year, quarter=quarter, dataset="Growth", format=format, limit=limit)
 
 
+@traced("use_case")
 def fetch_balance_data(data_source: FinancialDataSource, *, code: str, year: str, quarter: int, limit: int, format: str) -> str:
     validate_year(year)
     validate_quarter(quarter)
@@ -51,6 +56,7 @@ def fetch_balance_data(data_source: FinancialDataSource, *, code: str, year: str
     return _format_financial_df(df, code=code, year=year, quarter=quarter, dataset="Balance Sheet", format=format, limit=limit)
 
 
+@traced("use_case")
 def fetch_cash_flow_data(data_source: FinancialDataSource, *, code: str, year: str, quarter: int, limit: int, format: str) -> str:
     validate_year(year)
     validate_quarter(quarter)
@@ -59,6 +65,7 @@ def fetch_cash_flow_data(data_source: FinancialDataSource, *, code: str, year: s
     return _format_financial_df(df, code=code, year=year, quarter=quarter, dataset="Cash Flow", format=format, limit=limit)
 
 
+@traced("use_case")
 def fetch_dupont_data(data_source: FinancialDataSource, *, code: str, year: str, quarter: int, limit: int, format: str) -> str:
     validate_year(year)
     validate_quarter(quarter)
@@ -67,6 +74,7 @@ def fetch_dupont_data(data_source: FinancialDataSource, *, code: str, year: str,
     return _format_financial_df(df, code=code, year=year, quarter=quarter, dataset="Dupont", format=format, limit=limit)
 
 
+@traced("use_case")
 def fetch_performance_express_report(data_source: FinancialDataSource, *, code: str, start_date: str, end_date: str, limit: int, format: str) -> str:
     validate_output_format(format)
     df = data_source.get_performance_express_report(code=code, start_date=start_date, end_date=end_date)
@@ -74,6 +82,7 @@ def fetch_performance_express_report(data_source: FinancialDataSource, *, code:
     return format_table_output(df, format=format, max_rows=limit, meta=meta)
 
 
+@traced("use_case")
 def fetch_forecast_report(data_source: FinancialDataSource, *, code: str, start_date: str, end_date: str, limit: int, format: str) -> str:
     validate_output_format(format)
     df = data_source.get_forecast_report(code=code, start_date=start_date, end_date=end_date)
@@ -81,6 +90,7 @@ def fetch_forecast_report(data_source: FinancialDataSource, *, code: str, start_
     return format_table_output(df, format=format, max_rows=limit, meta=meta)
 
 
+@traced("use_case")
 def fetch_fina_indicator(data_source: FinancialDataSource, *, code: str, start_date: str, end_date: str, limit: int, format: str) -> str:
     """Fetch financial indicators (ROE, gross margin, net margin, etc.) within a date range."""
     validate_output_format(format)
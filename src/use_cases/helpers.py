@@ -2,8 +2,10 @@
 import re
 
 from src.services.validation import validate_non_empty_str
+from src.tracing import traced
 
 
+@traced("use_case")
 def normalize_stock_code_logic(code: str) -> str:
     validate_non_empty_str(code, "code")
     raw = code.strip()
@@ -27,6 +29,7 @@ def normalize_stock_code_logic(code: str) -> str:
     raise ValueError("Unsupported code format. Examples: 'sh.600000', '600000', '000001.SZ'.")
 
 
+@traced("use_case")
 def normalize_index_code_logic(code: str) -> str:
     validate_non_empty_str(code, "code")
     raw = code.strip().upper()
@@ -4,6 +4,7 @@ from typing import Optional
 from src.data_source_interface import FinancialDataSource
 from src.formatting.markdown_formatter import format_table_output
 from src.services.validation import validate_output_format, validate_index_key, validate_non_empty_str
+from src.tracing import traced
 
 INDEX_MAP = {
     "hs300": "hs300",
@@ -15,26 +16,35 @@ INDEX_MAP = {
 }
 
 
+@traced("use_case")
+def get_index_constituents(data_source: FinancialDataSource, key: str, date: Optional[str] = None):
+    """Constituents of a normalized index key ('hs300' | 'sz50' | 'zz500')."""
+    if key == "hs300":
+        return data_source.get_hs300_stocks(date=date)
+    if key == "sz50":
+        return data_source.get_sz50_stocks(date=date)
+    return data_source.get_zz500_stocks(date=date)
+
+
+@traced("use_case")
 def fetch_stock_industry(data_source: FinancialDataSource, *, code: Optional[str], date: Optional[str], limit: int, format: str) -> str:
     validate_output_format(format)
-    df = data_source.get_stock_industry(code=code, date=date)
+    # One row more than shown, so the output can tell whether rows were cut
+    df = data_source.get_stock_industry(code=code, date=date, limit=limit + 1)
     meta = {"code": code or "all", "as_of": date or "latest"}
-    return format_table_output(df, format=format, max_rows=limit, meta=meta)
+    return format_table_output(df, format=format, max_rows=limit, meta=meta, exact_total=False)
 
 
+@traced("use_case")
 def fetch_index_constituents(data_source: FinancialDataSource, *, index: str, date: Optional[str], limit: int, format: str) -> str:
     validate_output_format(format)
     key = validate_index_key(index, INDEX_MAP)
-    if key == "hs300":
-        df = data_source.get_hs300_stocks(date=date)
-    elif key == "sz50":
-        df = data_source.get_sz50_stocks(date=date)
-    else:
-        df = data_source.get_zz500_stocks(date=date)
+    df = get_index_constituents(data_source, key, date)
     meta = {"index": key, "as_of": date or "latest"}
     return format_table_output(df, format=format, max_rows=limit, meta=meta)
 
 
+@traced("use_case")
 def fetch_list_industries(data_source: FinancialDataSource, *, date: Optional[str], format: str) -> str:
     validate_output_format(format)
     df = data_source.get_stock_industry(code=None, date=date)
@@ -47,6 +57,7 @@ def fetch_list_industries(data_source: FinancialDataSource, *, date: Optional[st
     return format_table_output(out, format=format, max_rows=out.shape[0], meta=meta)
 
 
+@traced("use_case")
 def fetch_industry_members(data_source: FinancialDataSource, *, industry: str, date: Optional[str], limit: int, format: str) -> str:
     validate_output_format(format)
     validate_non_empty_str(industry, "industry")
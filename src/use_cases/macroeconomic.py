@@ -4,8 +4,10 @@ from typing import Optional
 from src.data_source_interface import FinancialDataSource
 from src.formatting.markdown_formatter import format_table_output
 from src.services.validation import validate_output_format, validate_year_type_reserve
+from src.tracing import traced
 
 
+@traced("use_case")
 def fetch_deposit_rate_data(data_source: FinancialDataSource, *, start_date: Optional[str], end_date: Optional[str], limit: int, format: str) -> str:
     validate_output_format(format)
     df = data_source.get_deposit_rate_data(start_date=start_date, end_date=end_date)
@@ -13,6 +15,7 @@ def fetch_deposit_rate_data(data_source: FinancialDataSource, *, start_date: Opt
     return format_table_output(df, format=format, max_rows=limit, meta=meta)
 
 
+@traced("use_case")
 def fetch_loan_rate_data(data_source: FinancialDataSource, *, start_date: Optional[str], end_date: Optional[str], limit: int, format: str) -> str:
     validate_output_format(format)
     df = data_source.get_loan_rate_data(start_date=start_date, end_date=end_date)
@@ -20,6 +23,7 @@ def fetch_loan_rate_data(data_source: FinancialDataSource, *, start_date: Option
     return format_table_output(df, format=format, max_rows=limit, meta=meta)
 
 
+@traced("use_case")
 def fetch_required_reserve_ratio_data(data_source: FinancialDataSource, *, start_date: Optional[str], end_date: Optional[str], year_type: str, limit: int, format: str) -> str:
     validate_output_format(format)
     validate_year_type_reserve(year_type)
@@ -28,6 +32,7 @@ def fetch_required_reserve_ratio_data(data_source: FinancialDataSource, *, start
     return format_table_output(df, format=format, max_rows=limit, meta=meta)
 
 
+@traced("use_case")
 def fetch_money_supply_data_month(data_source: FinancialDataSource, *, start_date: Optional[str], end_date: Optional[str], limit: int, format: str) -> str:
     validate_output_format(format)
     df = data_source.get_money_supply_data_month(start_date=start_date, end_date=end_date)
@@ -35,6 +40,7 @@ def fetch_money_supply_data_month(data_source: FinancialDataSource, *, start_dat
     return format_table_output(df, format=format, max_rows=limit, meta=meta)
 
 
+@traced("use_case")
 def fetch_money_supply_data_year(data_source: FinancialDataSource, *, start_date: Optional[str], end_date: Optional[str], limit: int, format: str) -> str:
     validate_output_format(format)
     df = data_source.get_money_supply_data_year(start_date=start_date, end_date=end_date)
@@ -4,8 +4,10 @@ from typing import Optional
 from src.data_source_interface import FinancialDataSource
 from src.formatting.markdown_formatter import format_table_output
 from src.services.validation import validate_output_format, validate_non_empty_str
+from src.tracing import traced
 
 
+@traced("use_case")
 def fetch_trade_dates(data_source: FinancialDataSource, *, start_date: Optional[str], end_date: Optional[str], limit: int, format: str) -> str:
     validate_output_format(format)
     df = data_source.get_trade_dates(start_date=start_date, end_date=end_date)
@@ -13,13 +15,16 @@ def fetch_trade_dates(data_source: FinancialDataSource, *, start_date: Optional[
     return format_table_output(df, format=format, max_rows=limit, meta=meta)
 
 
+@traced("use_case")
 def fetch_all_stock(data_source: FinancialDataSource, *, date: Optional[str], limit: int, format: str) -> str:
     validate_output_format(format)
-    df = data_source.get_all_stock(date=date)
+    # One row more than shown, so the output can tell whether rows were cut
+    df = data_source.get_all_stock(date=date, limit=limit + 1)
     meta = {"as_of": date or "default"}
-    return format_table_output(df, format=format, max_rows=limit, meta=meta)
+    return format_table_output(df, format=format, max_rows=limit, meta=meta, exact_total=False)
 
 
+@traced("use_case")
 def fetch_search_stocks(data_source: FinancialDataSource, *, keyword: str, date: Optional[str], limit: int, format: str) -> str:
     validate_output_format(format)
     validate_non_empty_str(keyword, "keyword")
@@ -32,6 +37,7 @@ def fetch_search_stocks(data_source: FinancialDataSource, *, keyword: str, date:
     return format_table_output(filtered, format=format, max_rows=limit, meta=meta)
 
 
+@traced("use_case")
 def fetch_suspensions(data_source: FinancialDataSource, *, date: Optional[str], limit: int, format: str) -> str:
     validate_output_format(format)
     df = data_source.get_all_stock(date=date)
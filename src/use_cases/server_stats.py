@@ -0,0 +1,75 @@
+"""Use case for the server statistics report."""
+from typing import Optional
+
+import pandas as pd
+
+from src.data_source_interface import FinancialDataSource
+from src.formatting.markdown_formatter import format_table_output
+from src.formatting.table_renderer import dumps
+from src.services.server_stats import collect_server_stats
+from src.services.trading_calendar import TradingCalendar
+from src.services.validation import validate_output_format
+from src.tracing import traced
+
+
+def _tool_table(tools: dict) -> pd.DataFrame:
+    rows = []
+    for tool, s in tools.items():
+        rows.append({
+            "tool": tool,
+            "calls": s["calls"],
+            "errors": sum(s["errors"].values()),
+            "error_classes": ", ".join(f"{name}={n}" for name, n in sorted(s["errors"].items())),
+            "in_flight": s["in_flight"],
+            "mean_ms": round(s["latency_ms_sum"] / s["calls"], 1) if s["calls"] else None,
+            "p50_ms_le": s["latency_ms_p50_le"],
+            "p95_ms_le": s["latency_ms_p95_le"],
+            "max_ms": round(s["latency_ms_max"], 1),
+        })
+    return pd.DataFrame(rows)
+
+
+def _key_values(title: str, values: dict) -> str:
+    lines = [f"## {title}"]
+    lines += [f"- {key}: {value}" for key, value in values.items()]
+    return "\n".join(lines)
+
+
+@traced("use_case")
+def fetch_server_stats(
+    data_source: Optional[FinancialDataSource],
+    *,
+    trading_calendar: Optional[TradingCalendar] = None,
+    format: str = "markdown",
+) -> str:
+    validate_output_format(format)
+    stats = collect_server_stats(data_source, trading_calendar)
+    if format in ("json", "json_compact"):
+        return dumps(stats)
+
+    tools = _tool_table(stats["tools"])
+    sections = [
+        f"## Tools (in flight: {stats['in_flight']})\n\n"
+        + format_table_output(tools, format=format, max_rows=max(len(tools), 1)).rstrip(),
+    ]
+    upstream = stats["upstream"]
+    sections.append(_key_values("Upstream", {
+        "queries": upstream["query_total"],
+        "rows": upstream["rows_total"],
+        "wire_bytes": upstream["wire_bytes_total"],
+        **{f"queries.{query}": n for query, n in upstream["queries"].items()},
+        **{f"session.{key}": value for key, value in upstream.get("session", {}).items()},
+    }))
+    if stats["caches"]:
+        caches = pd.DataFrame([
+            {"cache": name, "hits": sum(v for k, v in m.items() if k.endswith("hits") and isinstance(v, int)),
+             "misses": m["misses"], "hit_ratio": m["hit_ratio"]}
+            for name, m in stats["caches"].items()
+        ])
+        sections.append("## Caches\n\n" + format_table_output(caches, format=format).rstrip())
+    for name, metrics in stats["data_sources"].items():
+        sections.append(_key_values(name, metrics))
+    if "trading_calendar" in stats:
+        sections.append(_key_values("Trading calendar", stats["trading_calendar"]))
+    sections.append(_key_values("Process", stats["process"]))
+    return "\n\n".join(sections)
@@ -1,19 +1,62 @@
 """Stock market use cases orchestrating data fetch and formatting."""
-from typing import List, Optional
+import logging
+from typing import List, Optional, Tuple
 
 import pandas as pd
 
-from src.data_source_interface import FinancialDataSource
+from src.data_source_interface import DataSourceError, FinancialDataSource, NoDataFoundError
 from src.formatting.markdown_formatter import format_table_output
+from src.services.trading_calendar import TradingCalendar
+from src.kline_batch import KLineBatch
 from src.services.validation import (
     validate_adjust_flag,
+    validate_batch_view,
     validate_frequency,
+    validate_index_key,
     validate_output_format,
+    validate_row_order,
     validate_year,
     validate_year_type,
 )
+from src.tracing import traced
+from src.use_cases.indices import INDEX_MAP, get_index_constituents
 
+logger = logging.getLogger(__name__)
 
+# Upper bound on codes per batch call (the largest index, CSI 500, fits)
+MAX_BATCH_CODES = 500
+
+# Bars per trading day (four trading hours) for the frequencies the calendar can size
+BARS_PER_DAY = {"d": 1, "60": 4, "30": 8, "15": 16, "5": 48}
+
+
+@traced("use_case")
+def narrow_k_window(
+    trading_calendar: TradingCalendar,
+    start_date: str,
+    end_date: str,
+    frequency: str,
+    rows: int,
+    order: str = "first",
+) -> Tuple[str, str]:
+    """
+    Shrinks [start_date, end_date] to the trading days that can hold the first
+    (or latest) `rows` bars. Returns the range unchanged if it is already small
+    enough or the frequency is weekly/monthly.
+    """
+    per_day = BARS_PER_DAY.get(frequency)
+    if per_day is None:
+        return start_date, end_date
+    days = trading_calendar.between(start_date, end_date)
+    needed = -(-rows // per_day)
+    if len(days) <= needed:
+        return start_date, end_date
+    if order == "latest":
+        return days[-needed], end_date
+    return start_date, days[needed - 1]
+
+
+@traced("use_case")
 def fetch_historical_k_data(
     data_source: FinancialDataSource,
     *,
@@ -25,29 +68,146 @@ def fetch_historical_k_data(
     fields: Optional[List[str]] = None,
     limit: int = 250,
     format: str = "markdown",
+    order: str = "first",
+    trading_calendar: Optional[TradingCalendar] = None,
+) -> str:
+    validate_frequency(frequency)
+    validate_adjust_flag(adjust_flag)
+    validate_output_format(format)
+    validate_row_order(order)
+
+    # One bar more than shown, so the output can tell whether rows were cut
+    rows = limit + 1
+    window = (start_date, end_date)
+    if trading_calendar is not None:
+        try:
+            window = narrow_k_window(trading_calendar, start_date, end_date, frequency, rows, order)
+        except DataSourceError as e:
+            logger.warning(f"Trading calendar unavailable, fetching the full K-line range: {e}")
+
+    def fetch(range_start: str, range_end: str) -> pd.DataFrame:
+        return data_source.get_historical_k_data(
+            code=code,
+            start_date=range_start,
+            end_date=range_end,
+            frequency=frequency,
+            adjust_flag=adjust_flag,
+            fields=fields,
+            limit=rows,
+            order=order,
+        )
+
+    if window == (start_date, end_date):
+        df = fetch(start_date, end_date)
+    else:
+        try:
+            df = fetch(*window)
+        except NoDataFoundError:
+            df = None
+        if df is None or len(df) < rows:
+            # Suspensions leave fewer bars than trading days; use the full range
+            df = fetch(start_date, end_date)
+
+    meta = {
+        "code": code,
+        "start_date": start_date,
+        "end_date": end_date,
+        "frequency": frequency,
+        "adjust_flag": adjust_flag,
+    }
+    if order != "first":
+        meta["order"] = order
+    return format_table_output(df, format=format, max_rows=limit, meta=meta, order=order, exact_total=False)
+
+
+def _batch_summary(batch: KLineBatch) -> pd.DataFrame:
+    """One row per requested code: bar count, date span, first/last close and change, or the error."""
+    records = []
+    for code in batch.codes:
+        frame = batch.frames.get(code)
+        record = {"code": code, "rows": 0, "first_date": None, "last_date": None,
+                  "first_close": None, "last_close": None, "change_pct": None,
+                  "error": batch.errors.get(code)}
+        if frame is not None and not frame.empty:
+            record["rows"] = len(frame)
+            if "date" in frame.columns:
+                record["first_date"] = frame["date"].iloc[0]
+                record["last_date"] = frame["date"].iloc[-1]
+            if "close" in frame.columns:
+                close = pd.to_numeric(frame["close"], errors="coerce")
+                first, last = close.iloc[0], close.iloc[-1]
+                record["first_close"], record["last_close"] = first, last
+                if pd.notna(first) and pd.notna(last) and first != 0:
+                    record["change_pct"] = round((last / first - 1) * 100, 2)
+        records.append(record)
+    return pd.DataFrame(records)
+
+
+@traced("use_case")
+def fetch_historical_k_data_batch(
+    data_source: FinancialDataSource,
+    *,
+    codes: Optional[List[str]] = None,
+    index: Optional[str] = None,
+    start_date: str,
+    end_date: str,
+    frequency: str = "d",
+    adjust_flag: str = "3",
+    fields: Optional[List[str]] = None,
+    view: str = "long",
+    limit: int = 250,
+    format: str = "markdown",
+    max_concurrency: Optional[int] = None,
 ) -> str:
     validate_frequency(frequency)
     validate_adjust_flag(adjust_flag)
+    validate_batch_view(view)
     validate_output_format(format)
+    if bool(codes) == bool(index):
+        raise ValueError("Provide exactly one of 'codes' or 'index'.")
 
-    df = data_source.get_historical_k_data(
-        code=code,
+    if index:
+        key = validate_index_key(index, INDEX_MAP)
+        constituents = get_index_constituents(data_source, key)
+        code_list = constituents["code"].tolist()
+    else:
+        # Keep the caller's order, drop blanks and repeats
+        code_list = list(dict.fromkeys(c.strip() for c in codes if c and c.strip()))
+    if not code_list:
+        raise ValueError("No stock codes to fetch.")
+    if len(code_list) > MAX_BATCH_CODES:
+        raise ValueError(f"Too many codes ({len(code_list)}); at most {MAX_BATCH_CODES} per call.")
+
+    batch = data_source.get_historical_k_data_batch(
+        codes=code_list,
         start_date=start_date,
         end_date=end_date,
         frequency=frequency,
         adjust_flag=adjust_flag,
         fields=fields,
+        max_concurrency=max_concurrency,
     )
     meta = {
-        "code": code,
+        "codes": len(code_list),
+        "succeeded": len(batch.frames),
+        "failed": len(batch.errors),
         "start_date": start_date,
         "end_date": end_date,
         "frequency": frequency,
         "adjust_flag": adjust_flag,
     }
-    return format_table_output(df, format=format, max_rows=limit, meta=meta)
+    if index:
+        meta["index"] = key
+
+    if view == "summary":
+        return format_table_output(_batch_summary(batch), format=format, max_rows=limit, meta=meta)
+
+    if batch.errors:
+        meta["errors"] = batch.errors
+    return format_table_output(batch.long_frame(), format=format, max_rows=limit, meta=meta)
 
 
+@traced("use_case")
 def fetch_stock_basic_info(
     data_source: FinancialDataSource,
     *,
@@ -61,6 +221,7 @@ def fetch_stock_basic_info(
     return format_table_output(df, format=format, max_rows=df.shape[0] if df is not None else 0, meta=meta)
 
 
+@traced("use_case")
 def fetch_dividend_data(
     data_source: FinancialDataSource,
     *,
@@ -79,6 +240,7 @@ def fetch_dividend_data(
     return format_table_output(df, format=format, max_rows=limit, meta=meta)
 
 
+@traced("use_case")
 def fetch_adjust_factor_data(
     data_source: FinancialDataSource,
     *,
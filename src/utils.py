@@ -1,10 +1,9 @@
-# Utility functions, including the Baostock login context manager and logging setup
-import baostock as bs
+# Utility functions, including process-level stdout isolation and logging setup
+import io
 import os
 import sys
 import logging
-from contextlib import contextmanager
-from .data_source_interface import LoginError
+import threading
 
 # --- Logging Setup ---
 def setup_logging(level=logging.INFO):
@@ -20,50 +19,77 @@ def setup_logging(level=logging.INFO):
 # Get a logger instance for this module (optional, but good practice)
 logger = logging.getLogger(__name__)
 
-# --- Baostock Context Manager ---
-@contextmanager
-def baostock_login_context():
-    """Context manager to handle Baostock login and logout, suppressing stdout messages."""
-    # Redirect stdout to suppress login/logout messages
-    original_stdout_fd = sys.stdout.fileno()
-    saved_stdout_fd = os.dup(original_stdout_fd)
-    devnull_fd = os.open(os.devnull, os.O_WRONLY)
-
-    os.dup2(devnull_fd, original_stdout_fd)
-    os.close(devnull_fd)
-
-    logger.debug("Attempting Baostock login...")
-    lg = bs.login()
-    logger.debug(f"Login result: code={lg.error_code}, msg={lg.error_msg}")
-
-    # Restore stdout
-    os.dup2(saved_stdout_fd, original_stdout_fd)
-    os.close(saved_stdout_fd)
-
-    if lg.error_code != '0':
-        # Log error before raising
-        logger.error(f"Baostock login failed: {lg.error_msg}")
-        raise LoginError(f"Baostock login failed: {lg.error_msg}")
-
-    logger.info("Baostock login successful.")
-    try:
-        yield  # API calls happen here
-    finally:
-        # Redirect stdout again for logout
-        original_stdout_fd = sys.stdout.fileno()
-        saved_stdout_fd = os.dup(original_stdout_fd)
-        devnull_fd = os.open(os.devnull, os.O_WRONLY)
-
-        os.dup2(devnull_fd, original_stdout_fd)
-        os.close(devnull_fd)
-
-        logger.debug("Attempting Baostock logout...")
-        bs.logout()
-        logger.debug("Logout completed.")
-
-        # Restore stdout
-        os.dup2(saved_stdout_fd, original_stdout_fd)
-        os.close(saved_stdout_fd)
-        logger.info("Baostock logout successful.")
+# --- Stdout Isolation ---
+class _LoggingStdout(io.TextIOBase):
+    """
+    Text stream installed as sys.stdout that turns print() output into log records.
+
+    `buffer` still points at the real stdout channel, so code that writes bytes
+    deliberately (the MCP stdio transport) keeps working.
+    """
+
+    def __init__(self, target_logger: logging.Logger, buffer):
+        super().__init__()
+        self._logger = target_logger
+        self._buffer = buffer
+        self._local = threading.local()
+
+    @property
+    def buffer(self):
+        return self._buffer
+
+    @property
+    def encoding(self):
+        return "utf-8"
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        # Partial lines are kept per thread so concurrent prints don't interleave
+        pending = getattr(self._local, "pending", "") + s
+        *lines, rest = pending.split("\n")
+        for line in lines:
+            if line.strip():
+                self._logger.info(line)
+        self._local.pending = rest
+        return len(s)
+
+
+_stdout_isolated = False
+_stdout_isolation_lock = threading.Lock()
+
+
+def isolate_stdout(logger_name: str = "baostock") -> None:
+    """
+    Routes print() output to a logger for the rest of the process.
+
+    Baostock prints banners and errors straight to stdout, which is the JSON-RPC
+    channel under the MCP stdio transport. This swaps the file descriptors once:
+    the real stdout is moved to a private descriptor that only `sys.stdout.buffer`
+    writes to, and fd 1 is pointed at stderr for stray low-level writes. Later
+    calls are no-ops, so there is no per-request syscall and no window in which
+    concurrent requests can see a redirected fd.
+
+    Call it before anything captures `sys.stdout.buffer` (e.g. before
+    `FastMCP.run(transport='stdio')`).
+    """
+    global _stdout_isolated
+    with _stdout_isolation_lock:
+        if _stdout_isolated:
+            return
+        target_logger = logging.getLogger(logger_name)
+        try:
+            stdout_fd = sys.stdout.fileno()
+        except (AttributeError, ValueError, io.UnsupportedOperation):
+            # stdout is not backed by a file descriptor (e.g. captured by a test runner)
+            sys.stdout = _LoggingStdout(target_logger, getattr(sys.stdout, "buffer", None))
+        else:
+            sys.stdout.flush()
+            channel_fd = os.dup(stdout_fd)
+            os.dup2(sys.stderr.fileno(), stdout_fd)
+            sys.stdout = _LoggingStdout(target_logger, os.fdopen(channel_fd, "wb"))
+        _stdout_isolated = True
+        logger.debug("Stdout isolated; print() output now goes to logger '%s'.", logger_name)
 
 # You can add other utility functions or classes here if needed
@@ -0,0 +1,80 @@
+# Stand-ins for the upstream data source, counting every call that reaches it
+import threading
+import time
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from src.data_source_interface import NoDataFoundError
+from src.forwarding_data_source import ForwardingDataSource
+
+
+class StubDataSource(ForwardingDataSource):
+    """
+    Answers interface calls with `handlers[method](**kwargs)` and records
+    every call as (method, kwargs). Methods without a handler raise
+    NoDataFoundError.
+    """
+
+    def __init__(self, **handlers: Callable[..., pd.DataFrame]):
+        super().__init__(None)
+        self.handlers: Dict[str, Callable[..., pd.DataFrame]] = handlers
+        self.calls: List[Tuple[str, dict]] = []
+        self._lock = threading.Lock()
+
+    def _forward(self, method: str, **kwargs) -> pd.DataFrame:
+        with self._lock:
+            self.calls.append((method, kwargs))
+        handler = self.handlers.get(method)
+        if handler is None:
+            raise NoDataFoundError(f"Stub has no data for {method}.")
+        return handler(**kwargs)
+
+    def count(self, method: Optional[str] = None) -> int:
+        with self._lock:
+            return sum(1 for name, _ in self.calls if method is None or name == method)
+
+
+class FakeClock:
+    """A clock for `clock=` parameters that only moves when told to."""
+
+    def __init__(self, start: float = 1_000_000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def weekdays(start: str, end: str, holidays: Iterable[str] = ()) -> List[str]:
+    """Every Monday to Friday in [start, end] minus `holidays`, as 'YYYY-MM-DD'."""
+    closed = set(holidays)
+    day, last = date.fromisoformat(start), date.fromisoformat(end)
+    days = []
+    while day <= last:
+        if day.weekday() < 5 and day.isoformat() not in closed:
+            days.append(day.isoformat())
+        day += timedelta(days=1)
+    return days
+
+
+def trade_dates_handler(start: str, end: str, holidays: Iterable[str] = ()):
+    """A get_trade_dates handler for a calendar of weekdays minus `holidays`."""
+    trading = set(weekdays(start, end, holidays))
+    days = pd.date_range(start, end, freq="D").strftime("%Y-%m-%d")
+    frame = pd.DataFrame({"calendar_date": days, "is_trading_day": ["1" if d in trading else "0" for d in days]})
+
+    def get_trade_dates(start_date=None, end_date=None):
+        return frame
+    return get_trade_dates
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 5.0) -> None:
+    """Polls `condition` until it holds; fails the test after `timeout` seconds."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
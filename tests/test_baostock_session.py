@@ -0,0 +1,103 @@
+import atexit
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import src.baostock_session as session_module
+from src.baostock_session import BaostockSessionManager
+from src.data_source_interface import LoginError
+
+
+LOGIN_SECONDS = 0.005
+
+
+class FakeSocket:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def logins(monkeypatch):
+    """Patches bs.login; each login gets a fresh socket, and the results returned are popped from the list."""
+    results = []
+    sockets = []
+
+    def login():
+        time.sleep(LOGIN_SECONDS)
+        socket = FakeSocket()
+        sockets.append(socket)
+        monkeypatch.setattr(session_module.bs_context, "default_socket", socket, raising=False)
+        return results.pop(0) if results else SimpleNamespace(error_code="0", error_msg="success")
+
+    monkeypatch.setattr(session_module.bs, "login", login)
+    # Neither the process' stdout nor its exit handlers belong to a test
+    monkeypatch.setattr(session_module, "isolate_stdout", lambda: None)
+    monkeypatch.setattr(atexit, "register", lambda func: func)
+    return SimpleNamespace(results=results, sockets=sockets)
+
+
+def _query(*error_codes):
+    """A query function answering with the given error codes in turn, counting its calls."""
+    codes = list(error_codes)
+
+    def query_history_k_data_plus(code):
+        query_history_k_data_plus.calls.append(code)
+        return SimpleNamespace(error_code=codes.pop(0), error_msg="", code=code)
+    query_history_k_data_plus.calls = []
+    return query_history_k_data_plus
+
+
+def test_an_expired_session_logs_in_again_and_retries_once(logins):
+    manager = BaostockSessionManager(heartbeat_interval=0)
+    query = _query("10001001", "0")
+
+    rs = manager.query(query, "sh.600000")
+
+    assert rs.error_code == "0"
+    assert query.calls == ["sh.600000", "sh.600000"]
+    # The socket of the first login was closed before the second one opened its own
+    assert len(logins.sockets) == 2
+    assert logins.sockets[0].closed and not logins.sockets[1].closed
+    metrics = manager.metrics()
+    assert metrics["login_count"] == 2 and metrics["relogin_count"] == 1
+    assert metrics["relogin_ms_total"] >= LOGIN_SECONDS * 1000
+    assert metrics["relogin_ms_max"] == metrics["relogin_ms_total"] == metrics["last_login_ms"]
+    assert metrics["logged_in"]
+
+
+def test_the_retry_happens_only_once(logins):
+    manager = BaostockSessionManager(heartbeat_interval=0)
+    query = _query("10002007", "10002007")
+
+    rs = manager.query(query, "sh.600000")
+
+    # The second failure goes back to the caller, which reports it as a data source error
+    assert rs.error_code == "10002007"
+    assert len(query.calls) == 2
+    assert manager.metrics()["relogin_count"] == 1
+
+
+def test_other_errors_are_returned_without_a_relogin(logins):
+    manager = BaostockSessionManager(heartbeat_interval=0)
+    query = _query("10004011")
+
+    assert manager.query(query, "sh.600000").error_code == "10004011"
+    assert manager.metrics()["login_count"] == 1 and manager.metrics()["relogin_count"] == 0
+
+
+def test_a_failed_relogin_raises_and_leaves_the_session_logged_out(logins):
+    manager = BaostockSessionManager(heartbeat_interval=0)
+    manager.query(_query("0"), "sh.600000")
+    logins.results.append(SimpleNamespace(error_code="10001002", error_msg="bad password"))
+
+    with pytest.raises(LoginError):
+        manager.query(_query("10001001"), "sh.600000")
+
+    assert not manager.metrics()["logged_in"] and manager.metrics()["relogin_count"] == 0
+    # The next query logs in from scratch
+    assert manager.query(_query("0"), "sh.600000").error_code == "0"
+    assert manager.metrics()["login_count"] == 2
@@ -0,0 +1,31 @@
+import pytest
+
+from src.services.trading_calendar import TradingCalendar
+from src.use_cases import date_utils
+from tests.stubs import StubDataSource, trade_dates_handler
+
+
+@pytest.fixture
+def calendar():
+    # 2024-06-10 was the Dragon Boat Festival holiday
+    return TradingCalendar(StubDataSource(
+        get_trade_dates=trade_dates_handler("2024-01-01", "2024-12-31", holidays=["2024-06-10"])))
+
+
+def test_is_trading_day_answers_from_the_calendar(calendar):
+    assert date_utils.is_trading_day(calendar, date="2024-06-28") == "是"
+    assert date_utils.is_trading_day(calendar, date="2024-06-29") == "否"
+    assert date_utils.is_trading_day(calendar, date="2024-06-10") == "否"
+    assert date_utils.is_trading_day(calendar, date="2030-01-02") == "未知"
+
+
+@pytest.mark.parametrize("malformed", ["20240628", "2024-6-28", "2024/06/28", "2024-06-31", ""])
+def test_date_tools_reject_malformed_dates(calendar, malformed):
+    for use_case in (date_utils.is_trading_day, date_utils.previous_trading_day, date_utils.next_trading_day):
+        with pytest.raises(ValueError):
+            use_case(calendar, date=malformed)
+
+
+def test_previous_and_next_skip_weekends_and_holidays(calendar):
+    assert date_utils.previous_trading_day(calendar, date="2024-06-11") == "2024-06-07"
+    assert date_utils.next_trading_day(calendar, date="2024-06-07") == "2024-06-11"
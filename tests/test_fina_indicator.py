@@ -0,0 +1,84 @@
+import threading
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.data_source_interface import NoDataFoundError
+from src.fina_indicator import FINA_INDICATOR_SOURCES, aggregate_fina_indicator, fina_quarters
+from tests.stubs import StubDataSource
+
+
+def test_fina_quarters_lists_the_range_in_order():
+    assert fina_quarters("2022-05-01", "2023-04-15", today=date(2024, 6, 1)) == [
+        (2022, 1), (2022, 2), (2022, 3), (2022, 4), (2023, 1), (2023, 2)]
+
+
+def test_fina_quarters_skips_quarters_that_have_not_ended():
+    # Q2 2024 ends on 30 June, so on that day only Q1 can have a report
+    assert fina_quarters("2024-01-01", "2024-12-31", today=date(2024, 6, 30)) == [(2024, 1)]
+    # Q1 has ended but is still within its deadline: it may already be out
+    assert fina_quarters("2024-01-01", "2024-12-31", today=date(2024, 4, 2)) == [(2024, 1)]
+    assert fina_quarters("2024-01-01", "2024-12-31", today=date(2024, 3, 31)) == []
+    assert fina_quarters("2024-01-01", "2024-12-31", today=date(2025, 1, 1))[-1] == (2024, 4)
+
+
+def test_fina_quarters_rejects_malformed_dates():
+    with pytest.raises(ValueError):
+        fina_quarters("2024/01/01", "2024-12-31")
+
+
+def _report_handlers(on_call):
+    def handler(prefix):
+        def fetch(code, year, quarter):
+            on_call(prefix, int(year), quarter)
+            if (int(year), quarter) == (2023, 3):
+                raise NoDataFoundError(f"No {prefix} data for {code} {year}Q{quarter}")
+            return pd.DataFrame({"code": [code], "value": [f"{prefix}-{year}Q{quarter}"]})
+        return fetch
+    return {method: handler(prefix) for prefix, method in FINA_INDICATOR_SOURCES}
+
+
+def test_aggregate_merges_every_report_into_one_row_per_quarter():
+    upstream = StubDataSource(**_report_handlers(lambda *_: None))
+
+    df = aggregate_fina_indicator(upstream, "sh.600000", "2023-01-01", "2023-12-31")
+
+    # 2023 Q3 had no reports at all, so it has no row
+    assert list(zip(df["year"], df["quarter"])) == [("2023", 1), ("2023", 2), ("2023", 4)]
+    assert df.loc[0, "profit_value"] == "profit-2023Q1" and df.loc[2, "dupont_value"] == "dupont-2023Q4"
+    assert upstream.count() == 4 * len(FINA_INDICATOR_SOURCES)
+
+
+def test_aggregate_keeps_quarter_order_when_queries_finish_out_of_order():
+    later_done = threading.Event()
+    finished = []
+    lock = threading.Lock()
+
+    def on_call(prefix, year, quarter):
+        # Q3 queries only return once every Q4 query has
+        if (year, quarter) == (2022, 3):
+            assert later_done.wait(5)
+        with lock:
+            finished.append((year, quarter))
+            if finished.count((2022, 4)) == len(FINA_INDICATOR_SOURCES):
+                later_done.set()
+
+    upstream = StubDataSource(**_report_handlers(on_call))
+
+    df = aggregate_fina_indicator(upstream, "sh.600000", "2022-07-01", "2022-12-31",
+                                  max_concurrency=2 * len(FINA_INDICATOR_SOURCES))
+
+    assert finished.index((2022, 4)) < finished.index((2022, 3))
+    assert list(zip(df["year"], df["quarter"])) == [("2022", 1), ("2022", 2), ("2022", 3), ("2022", 4)]
+    assert df["profit_value"].tolist() == ["profit-2022Q1", "profit-2022Q2", "profit-2022Q3", "profit-2022Q4"]
+
+
+def test_aggregate_without_any_report_raises_no_data():
+    def empty(**_):
+        raise NoDataFoundError("empty")
+
+    upstream = StubDataSource(**{method: empty for _, method in FINA_INDICATOR_SOURCES})
+
+    with pytest.raises(NoDataFoundError):
+        aggregate_fina_indicator(upstream, "sh.600000", "2023-01-01", "2023-06-30")
@@ -0,0 +1,190 @@
+import json
+
+import pandas as pd
+import pytest
+
+from src.data_source_interface import DataSourceError, NoDataFoundError
+from src.ingest import read_result_set
+from src.services.trading_calendar import TradingCalendar
+from src.use_cases.stock_market import fetch_historical_k_data, narrow_k_window
+from tests.stubs import StubDataSource, trade_dates_handler, weekdays
+
+# National Day week 2024: the exchanges close from 1 to 7 October
+HOLIDAYS = weekdays("2024-10-01", "2024-10-07")
+# Weekdays the stock did not trade although the exchange was open
+SUSPENDED = set(weekdays("2024-11-11", "2024-11-22"))
+
+
+class FakeResultSet:
+    """Pages of rows served like a Baostock ResultData, counting next() calls."""
+
+    def __init__(self, fields, pages, page_bytes=100):
+        self.fields = fields
+        self._pages = list(pages)
+        self.data = self._pages.pop(0) if self._pages else []
+        self.cur_row_num = 0
+        self.msg_body_length = page_bytes
+        self.next_calls = 0
+
+    def next(self):
+        self.next_calls += 1
+        if self.cur_row_num < len(self.data):
+            self.cur_row_num += 1
+            return True
+        if not self._pages:
+            return False
+        self.data = self._pages.pop(0)
+        self.cur_row_num = 0
+        return True
+
+
+def _pages(count, size=10):
+    return [[[f"2024-01-{page + 1:02d}", str(page * size + i)] for i in range(size)] for page in range(count)]
+
+
+def test_read_result_set_reads_every_page_without_a_limit():
+    rs = FakeResultSet(["date", "close"], _pages(3))
+
+    df = read_result_set(rs)
+
+    assert len(df) == 30
+    assert df["close"].tolist() == [float(i) for i in range(30)]
+    assert rs.next_calls == 3
+
+
+def test_read_result_set_stops_paging_once_the_first_rows_are_in():
+    rs = FakeResultSet(["date", "close"], _pages(5))
+
+    df = read_result_set(rs, limit=15)
+
+    assert df["close"].tolist() == [float(i) for i in range(15)]
+    # The second page completes the limit, so the third to fifth are never requested
+    assert rs.next_calls == 1
+    assert len(rs._pages) == 3
+
+
+def test_read_result_set_stops_on_an_exact_page_boundary():
+    rs = FakeResultSet(["date", "close"], _pages(3))
+
+    df = read_result_set(rs, limit=10)
+
+    assert len(df) == 10 and rs.next_calls == 0
+
+
+def test_read_result_set_keeps_the_latest_rows_after_reading_every_page():
+    rs = FakeResultSet(["date", "close"], _pages(4))
+
+    df = read_result_set(rs, limit=5, order="latest")
+
+    assert df["close"].tolist() == [35.0, 36.0, 37.0, 38.0, 39.0]
+    assert rs.next_calls == 4 and not rs._pages
+
+
+def test_read_result_set_limit_above_the_row_count_returns_everything():
+    rs = FakeResultSet(["date", "close"], _pages(2))
+
+    assert len(read_result_set(rs, limit=100)) == 20
+    assert len(read_result_set(FakeResultSet(["date", "close"], _pages(2)), limit=100, order="latest")) == 20
+
+
+def test_read_result_set_skips_rows_already_consumed_from_the_first_page():
+    rs = FakeResultSet(["date", "close"], _pages(2))
+    rs.cur_row_num = 4
+
+    df = read_result_set(rs, limit=3)
+
+    assert df["close"].tolist() == [4.0, 5.0, 6.0]
+
+
+def test_read_result_set_returns_the_columns_of_an_empty_result():
+    df = read_result_set(FakeResultSet(["date", "code", "close"], []), limit=5, order="latest")
+
+    assert df.empty and list(df.columns) == ["date", "code", "close"]
+
+
+@pytest.fixture
+def calendar():
+    return TradingCalendar(StubDataSource(get_trade_dates=trade_dates_handler("2024-01-01", "2025-12-31", HOLIDAYS)))
+
+
+def test_narrow_k_window_first_rows_straddle_a_holiday(calendar):
+    # 27 and 30 September, then the exchange reopens on 8 October
+    assert narrow_k_window(calendar, "2024-09-27", "2024-12-31", "d", 3) == ("2024-09-27", "2024-10-08")
+
+
+def test_narrow_k_window_latest_rows_straddle_a_holiday(calendar):
+    assert narrow_k_window(calendar, "2024-01-01", "2024-10-09", "d", 3, "latest") == ("2024-09-30", "2024-10-09")
+
+
+def test_narrow_k_window_counts_intraday_bars_per_trading_day(calendar):
+    # Thirteen 60-minute bars need four trading days, four 5-minute ones need one
+    assert narrow_k_window(calendar, "2024-09-26", "2024-12-31", "60", 13) == ("2024-09-26", "2024-10-08")
+    assert narrow_k_window(calendar, "2024-01-01", "2024-10-08", "5", 4, "latest") == ("2024-10-08", "2024-10-08")
+
+
+def test_narrow_k_window_leaves_short_and_weekly_ranges_alone(calendar):
+    # Only three trading days between 27 September and 8 October
+    assert narrow_k_window(calendar, "2024-09-27", "2024-10-08", "d", 5) == ("2024-09-27", "2024-10-08")
+    assert narrow_k_window(calendar, "2024-01-01", "2024-12-31", "w", 3) == ("2024-01-01", "2024-12-31")
+    assert narrow_k_window(calendar, "2024-01-01", "2024-12-31", "m", 3, "latest") == ("2024-01-01", "2024-12-31")
+
+
+def _k_data(code, start_date, end_date, frequency="d", adjust_flag="3", fields=None, limit=None, order="first"):
+    days = [day for day in weekdays(start_date, end_date, HOLIDAYS) if day not in SUSPENDED]
+    if not days:
+        raise NoDataFoundError(f"No historical data found for {code} in range (empty result set from Baostock).")
+    if limit is not None:
+        days = days[-limit:] if order == "latest" else days[:limit]
+    return pd.DataFrame({"date": days, "code": code, "close": [10.0 + i / 100 for i in range(len(days))]})
+
+
+def _history(upstream, calendar, start, end, limit, order="first"):
+    output = fetch_historical_k_data(upstream, code="sh.600000", start_date=start, end_date=end, limit=limit,
+                                     format="json_compact", order=order, trading_calendar=calendar)
+    return [row[0] for row in json.loads(output)["rows"]]
+
+
+def _fetched_ranges(upstream):
+    return [(kwargs["start_date"], kwargs["end_date"], kwargs["limit"])
+            for name, kwargs in upstream.calls if name == "get_historical_k_data"]
+
+
+def test_fetch_history_asks_only_for_the_narrowed_window(calendar):
+    upstream = StubDataSource(get_historical_k_data=_k_data)
+
+    dates = _history(upstream, calendar, "2024-09-25", "2024-12-31", limit=5)
+
+    assert dates == ["2024-09-25", "2024-09-26", "2024-09-27", "2024-09-30", "2024-10-08"]
+    assert _fetched_ranges(upstream) == [("2024-09-25", "2024-10-09", 6)]
+
+
+def test_fetch_history_falls_back_to_the_full_range_when_a_suspension_shortens_the_window(calendar):
+    upstream = StubDataSource(get_historical_k_data=_k_data)
+
+    dates = _history(upstream, calendar, "2024-01-01", "2024-11-26", limit=4, order="latest")
+
+    # The narrowed window (20 to 26 November) holds only the two bars after the suspension
+    assert _fetched_ranges(upstream) == [("2024-11-20", "2024-11-26", 5), ("2024-01-01", "2024-11-26", 5)]
+    assert dates == ["2024-11-07", "2024-11-08", "2024-11-25", "2024-11-26"]
+
+
+def test_fetch_history_falls_back_when_the_narrowed_window_has_no_bars(calendar):
+    upstream = StubDataSource(get_historical_k_data=_k_data)
+
+    dates = _history(upstream, calendar, "2024-11-11", "2024-12-31", limit=3)
+
+    assert _fetched_ranges(upstream) == [("2024-11-11", "2024-11-14", 4), ("2024-11-11", "2024-12-31", 4)]
+    assert dates == ["2024-11-25", "2024-11-26", "2024-11-27"]
+
+
+def test_fetch_history_uses_the_full_range_without_a_calendar():
+    def unavailable(**_):
+        raise DataSourceError("calendar down")
+
+    calendar = TradingCalendar(StubDataSource(get_trade_dates=unavailable))
+    upstream = StubDataSource(get_historical_k_data=_k_data)
+
+    dates = _history(upstream, calendar, "2024-09-25", "2024-12-31", limit=2)
+
+    assert _fetched_ranges(upstream) == [("2024-09-25", "2024-12-31", 3)]
+    assert dates == ["2024-09-25", "2024-09-26"]
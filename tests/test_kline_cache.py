@@ -0,0 +1,157 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.baostock_data_source import DEFAULT_K_FIELDS
+from src.caching import CachedKLineDataSource, KLineCache
+from src.data_source_interface import NoDataFoundError
+from tests.stubs import StubDataSource, weekdays
+
+SUSPENDED = set(weekdays("2024-03-11", "2024-03-22"))
+
+
+def _k_data(code, start_date, end_date, frequency="d", adjust_flag="3", fields=None, limit=None, order="first"):
+    days = [day for day in weekdays(start_date, end_date) if day not in SUSPENDED]
+    if not days:
+        raise NoDataFoundError(f"No historical data found for {code} in range (empty result set from Baostock).")
+    dates = pd.to_datetime(days)
+    close = 10 + (dates.dayofyear.to_numpy() % 7) / 10
+    frame = pd.DataFrame({name: np.zeros(len(days)) for name in DEFAULT_K_FIELDS})
+    frame["date"] = dates
+    frame["code"] = code
+    frame["close"] = close
+    frame["preclose"] = close
+    frame["volume"] = np.arange(len(days), dtype=np.int64) * 100
+    for name in ("adjustflag", "tradestatus", "isST"):
+        frame[name] = pd.Categorical([adjust_flag if name == "adjustflag" else "1"] * len(days))
+    return frame[list(fields or DEFAULT_K_FIELDS)]
+
+
+@pytest.fixture
+def upstream():
+    return StubDataSource(get_historical_k_data=_k_data)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return KLineCache(str(tmp_path))
+
+
+def _bars(source, start, end, **kwargs):
+    return source.get_historical_k_data(code="sh.600000", start_date=start, end_date=end, **kwargs)
+
+
+def _fetched_ranges(upstream):
+    return [(kwargs["start_date"], kwargs["end_date"]) for _, kwargs in upstream.calls]
+
+
+def test_a_cached_range_is_served_without_the_upstream(upstream, cache):
+    klines = CachedKLineDataSource(upstream, cache)
+
+    first = _bars(klines, "2024-01-01", "2024-01-31")
+    second = _bars(klines, "2024-01-08", "2024-01-19", fields=["date", "close"])
+
+    assert upstream.count() == 1
+    assert len(first) == 23 and len(second) == 10
+    assert second["close"].tolist() == first["close"].iloc[5:15].tolist()
+    assert cache.metrics()["misses"] == 1 and cache.metrics()["hits"] == 1
+
+
+def test_only_the_missing_tail_and_head_are_fetched(upstream, cache):
+    klines = CachedKLineDataSource(upstream, cache)
+
+    _bars(klines, "2024-02-01", "2024-02-29")
+    _bars(klines, "2024-02-01", "2024-04-30")
+    wider = _bars(klines, "2024-01-01", "2024-04-30")
+
+    assert _fetched_ranges(upstream) == [("2024-02-01", "2024-02-29"), ("2024-03-01", "2024-04-30"),
+                                         ("2024-01-01", "2024-01-31")]
+    assert wider["date"].is_monotonic_increasing
+    assert len(wider) == len(weekdays("2024-01-01", "2024-04-30")) - len(SUSPENDED)
+    assert cache.metrics()["partial_hits"] == 2
+
+
+def test_a_suspension_is_remembered_as_covered(upstream, cache):
+    klines = CachedKLineDataSource(upstream, cache)
+
+    _bars(klines, "2024-03-01", "2024-03-08")
+    with pytest.raises(NoDataFoundError):
+        _bars(klines, "2024-03-11", "2024-03-22")
+    with pytest.raises(NoDataFoundError):
+        _bars(klines, "2024-03-11", "2024-03-22")
+
+    assert upstream.count() == 2
+
+
+def test_unsettled_bars_are_fetched_every_time(upstream, cache):
+    klines = CachedKLineDataSource(upstream, cache)
+    today = date.today()
+    start = (today - timedelta(days=20)).isoformat()
+
+    _bars(klines, start, today.isoformat())
+    _bars(klines, start, today.isoformat())
+
+    # Daily bars settle the day after; today's is fetched again, nothing before it
+    assert _fetched_ranges(upstream) == [(start, today.isoformat()), (today.isoformat(), today.isoformat())]
+    assert cache.coverage("sh.600000", "d", "3")[1] == (today - timedelta(days=1)).isoformat()
+
+
+def test_limits_apply_to_the_assembled_bars(upstream, cache):
+    klines = CachedKLineDataSource(upstream, cache)
+
+    _bars(klines, "2024-01-01", "2024-01-31")
+    latest = _bars(klines, "2024-01-01", "2024-02-29", limit=3, order="latest", fields=["date"])
+
+    assert latest["date"].dt.strftime("%Y-%m-%d").tolist() == ["2024-02-27", "2024-02-28", "2024-02-29"]
+    # The limit is not pushed down: the whole gap is fetched so it can be stored
+    assert upstream.calls[-1][1]["limit"] is None
+
+
+def test_fields_outside_the_cached_columns_bypass_the_cache(upstream, cache):
+    klines = CachedKLineDataSource(upstream, cache)
+
+    _bars(klines, "2024-01-01", "2024-01-31", frequency="w", fields=["date", "peTTM"])
+    _bars(klines, "2024-01-01", "2024-01-31", frequency="w", fields=["date", "peTTM"])
+
+    assert upstream.count() == 2
+    assert cache.metrics()["bypassed"] == 2
+    assert cache.status()["entries"] == []
+
+
+def test_entries_survive_a_restart(upstream, cache):
+    _bars(CachedKLineDataSource(upstream, cache), "2024-01-01", "2024-01-31")
+    restarted = CachedKLineDataSource(upstream, KLineCache(cache.root_dir))
+
+    assert len(_bars(restarted, "2024-01-02", "2024-01-05")) == 4
+    assert upstream.count() == 1
+
+
+def test_invalidate_filters_by_code_frequency_and_adjust_flag(upstream, cache):
+    klines = CachedKLineDataSource(upstream, cache)
+    for code in ("sh.600000", "sz.000001"):
+        for frequency in ("d", "w"):
+            klines.get_historical_k_data(code=code, start_date="2024-01-01", end_date="2024-01-31",
+                                         frequency=frequency, fields=["date", "close"])
+
+    assert cache.invalidate(code="sz.000001", frequency="w") == 1
+    assert cache.invalidate(frequency="d") == 2
+    assert cache.invalidate(adjust_flag="2") == 0
+    assert [(e["code"], e["frequency"]) for e in cache.status()["entries"]] == [("sh.600000", "w")]
+    assert cache.metrics()["invalidations"] == 3
+
+    calls = upstream.count()
+    _bars(klines, "2024-01-01", "2024-01-31")
+    assert upstream.count() == calls + 1
+
+
+def test_adjusted_bars_are_cached_per_mode_by_default(upstream, cache):
+    klines = CachedKLineDataSource(upstream, cache)
+
+    for adjust_flag in ("1", "2", "1"):
+        _bars(klines, "2024-01-01", "2024-01-31", adjust_flag=adjust_flag)
+
+    assert [kwargs["adjust_flag"] for _, kwargs in upstream.calls] == ["1", "2"]
+    assert sorted(cache.coverage("sh.600000", "d", flag) is not None for flag in "123") == [False, True, True]
+
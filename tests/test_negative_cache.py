@@ -0,0 +1,122 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.caching.response_cache import DAY, MINUTE, ResponseCacheDataSource
+from src.data_source_interface import NoDataFoundError
+from tests.stubs import FakeClock, StubDataSource, wait_for
+
+
+def _no_profit(**kwargs):
+    raise NoDataFoundError(f"No profit data for {kwargs['code']} {kwargs['year']}Q{kwargs['quarter']}.")
+
+
+def _open_quarter() -> dict:
+    today = date.today()
+    return dict(code="sh.600000", year=str(today.year), quarter=(today.month - 1) // 3 + 1)
+
+
+SETTLED_QUARTER = dict(code="sh.600000", year="2020", quarter=1)
+
+
+def test_no_data_is_replayed_without_an_upstream_call():
+    upstream = StubDataSource(get_profit_data=_no_profit)
+    cache = ResponseCacheDataSource(upstream, clock=FakeClock())
+
+    for _ in range(3):
+        with pytest.raises(NoDataFoundError, match="No profit data for sh.600000"):
+            cache.get_profit_data(**SETTLED_QUARTER)
+
+    assert upstream.count() == 1
+    assert cache.metrics()["negative_stores"] == 1
+    assert cache.metrics()["negative_hits"] == 2
+
+
+def test_open_periods_forget_no_data_after_15_minutes():
+    clock = FakeClock()
+    upstream = StubDataSource(get_profit_data=_no_profit)
+    cache = ResponseCacheDataSource(upstream, clock=clock)
+
+    with pytest.raises(NoDataFoundError):
+        cache.get_profit_data(**_open_quarter())
+    clock.advance(15 * MINUTE - 1)
+    with pytest.raises(NoDataFoundError):
+        cache.get_profit_data(**_open_quarter())
+    assert upstream.count() == 1
+
+    # The report got published in the meantime
+    upstream.handlers["get_profit_data"] = lambda **kwargs: pd.DataFrame({"code": [kwargs["code"]]})
+    clock.advance(2)
+    assert cache.get_profit_data(**_open_quarter())["code"].tolist() == ["sh.600000"]
+    assert upstream.count() == 2
+    assert cache.metrics()["negative_expirations"] == 1
+
+
+def test_settled_periods_remember_no_data_for_7_days():
+    clock = FakeClock()
+    upstream = StubDataSource(get_profit_data=_no_profit)
+    cache = ResponseCacheDataSource(upstream, clock=clock)
+
+    with pytest.raises(NoDataFoundError):
+        cache.get_profit_data(**SETTLED_QUARTER)
+    clock.advance(7 * DAY - 1)
+    with pytest.raises(NoDataFoundError):
+        cache.get_profit_data(**SETTLED_QUARTER)
+    assert upstream.count() == 1
+
+    clock.advance(2)
+    with pytest.raises(NoDataFoundError):
+        cache.get_profit_data(**SETTLED_QUARTER)
+    assert upstream.count() == 2
+
+
+def test_negative_entries_are_bounded_lru():
+    upstream = StubDataSource(get_profit_data=_no_profit)
+    cache = ResponseCacheDataSource(upstream, clock=FakeClock(), max_negative_entries=2)
+
+    for code in ("sh.600000", "sh.600001", "sh.600000", "sh.600002", "sh.600000", "sh.600001"):
+        with pytest.raises(NoDataFoundError):
+            cache.get_profit_data(code=code, year="2020", quarter=1)
+
+    # sh.600001 was the least recently used when sh.600002 came in
+    assert upstream.count() == 4
+    assert cache.metrics()["negative_entries"] == 2
+
+
+def test_coalesced_followers_get_the_no_data_error_too():
+    release = threading.Event()
+
+    def slow_no_profit(**kwargs):
+        release.wait(5)
+        _no_profit(**kwargs)
+
+    upstream = StubDataSource(get_profit_data=slow_no_profit)
+    cache = ResponseCacheDataSource(upstream)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(cache.get_profit_data, **SETTLED_QUARTER)]
+        wait_for(lambda: upstream.count() == 1)
+        futures += [pool.submit(cache.get_profit_data, **SETTLED_QUARTER) for _ in range(3)]
+        wait_for(lambda: cache.metrics()["coalesced"] == 3)
+        release.set()
+        for future in futures:
+            with pytest.raises(NoDataFoundError):
+                future.result(5)
+
+    assert upstream.count() == 1
+
+
+def test_clear_drops_negative_entries():
+    upstream = StubDataSource(get_profit_data=_no_profit)
+    cache = ResponseCacheDataSource(upstream, clock=FakeClock())
+
+    with pytest.raises(NoDataFoundError):
+        cache.get_profit_data(**SETTLED_QUARTER)
+    cache.clear()
+    with pytest.raises(NoDataFoundError):
+        cache.get_profit_data(**SETTLED_QUARTER)
+
+    assert upstream.count() == 2
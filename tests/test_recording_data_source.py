@@ -0,0 +1,150 @@
+import os
+import zipfile
+
+import pandas as pd
+import pytest
+
+from src.data_source_interface import DataSourceError, LoginError, NoDataFoundError
+from src.recording_data_source import RecordingDataSource, ReplayDataSource
+from tests.stubs import StubDataSource, weekdays
+
+SUSPENDED = set(weekdays("2024-02-05", "2024-02-09"))
+
+
+def _k_data(code, start_date, end_date, fields=None, limit=None, order="first", **_):
+    days = [day for day in weekdays(start_date, end_date) if day not in SUSPENDED]
+    if not days:
+        raise NoDataFoundError(f"No historical data found for {code} in range (empty result set from Baostock).")
+    if limit is not None:
+        days = days[-limit:] if order == "latest" else days[:limit]
+    frame = pd.DataFrame({"date": pd.to_datetime(days), "code": code,
+                          "close": [10.0 + i / 100 for i in range(len(days))], "volume": 100})
+    return frame[list(fields)] if fields else frame
+
+
+def _profit(code, year, quarter):
+    return pd.DataFrame({"code": [code], "statDate": [f"{year}-03-31"], "roeAvg": [0.1]})
+
+
+def _record(tmp_path, upstream, calls):
+    path = str(tmp_path / "session.zip")
+    recorder = RecordingDataSource(upstream, path)
+    for call in calls:
+        try:
+            call(recorder)
+        except Exception:
+            pass
+    recorder.close()
+    return path
+
+
+def _quarter(code="sh.600000", year="2023", quarter=1):
+    return lambda source: source.get_profit_data(code=code, year=year, quarter=quarter)
+
+
+def _bars(start, end, **kwargs):
+    return lambda source: source.get_historical_k_data(code="sh.600000", start_date=start, end_date=end, **kwargs)
+
+
+def test_recorded_calls_are_replayed_without_the_upstream(tmp_path):
+    upstream = StubDataSource(get_profit_data=_profit, get_historical_k_data=_k_data)
+    path = _record(tmp_path, upstream, [_quarter(), _bars("2024-01-01", "2024-01-31")])
+    replay = ReplayDataSource(path)
+
+    profit = _quarter()(replay)
+    bars = _bars("2024-01-01", "2024-01-31")(replay)
+
+    pd.testing.assert_frame_equal(profit, _profit("sh.600000", "2023", 1))
+    pd.testing.assert_frame_equal(bars, _k_data("sh.600000", "2024-01-01", "2024-01-31"))
+    assert replay.metrics()["hits"] == 2 and replay.metrics()["misses"] == 0
+
+
+def test_k_data_inside_a_recorded_range_is_cut_from_it(tmp_path):
+    upstream = StubDataSource(get_historical_k_data=_k_data)
+    path = _record(tmp_path, upstream, [_bars("2024-01-01", "2024-03-31")])
+    replay = ReplayDataSource(path)
+
+    first = _bars("2024-01-08", "2024-01-31", fields=["date", "close"], limit=3)(replay)
+    latest = _bars("2024-01-08", "2024-01-31", fields=["date", "close"], limit=3, order="latest")(replay)
+
+    assert first["date"].dt.strftime("%Y-%m-%d").tolist() == ["2024-01-08", "2024-01-09", "2024-01-10"]
+    assert latest["date"].dt.strftime("%Y-%m-%d").tolist() == ["2024-01-29", "2024-01-30", "2024-01-31"]
+    assert list(first.columns) == ["date", "close"]
+    expected = _k_data("sh.600000", "2024-01-01", "2024-03-31").set_index("date")["close"]
+    assert latest["close"].tolist() == expected.loc["2024-01-29":"2024-01-31"].tolist()
+    assert replay.metrics()["range_hits"] == 2
+
+
+def test_a_cut_without_bars_raises_no_data_and_uncovered_ranges_miss(tmp_path):
+    upstream = StubDataSource(get_historical_k_data=_k_data)
+    path = _record(tmp_path, upstream, [_bars("2024-01-01", "2024-03-31"),
+                                        _bars("2024-04-01", "2024-06-30", limit=5)])
+    replay = ReplayDataSource(path)
+
+    with pytest.raises(NoDataFoundError):
+        _bars("2024-02-05", "2024-02-09", fields=["date", "close"])(replay)
+    # Past the end of the full recording; the limited April call can't be cut from;
+    # fields the recording doesn't have (the default K-line fields)
+    for start, end, fields in (("2024-03-01", "2024-04-15", ["date", "close"]),
+                               ("2024-04-01", "2024-04-05", ["date", "close"]),
+                               ("2024-01-08", "2024-01-31", None)):
+        with pytest.raises(DataSourceError):
+            _bars(start, end, fields=fields)(replay)
+    assert replay.metrics()["misses"] == 3
+
+
+def test_recorded_errors_are_raised_again_with_their_type(tmp_path):
+    errors = {"2020": NoDataFoundError("no 2020 report"), "2021": LoginError("login failed"),
+              "2022": ValueError("bad quarter"), "2023": KeyError("unexpected")}
+
+    def failing(code, year, quarter):
+        raise errors[year]
+
+    path = _record(tmp_path, StubDataSource(get_profit_data=failing), [_quarter(year=year) for year in errors])
+    replay = ReplayDataSource(path)
+
+    for year, error_type in (("2020", NoDataFoundError), ("2021", LoginError), ("2022", ValueError)):
+        with pytest.raises(error_type, match=str(errors[year])):
+            _quarter(year=year)(replay)
+    # Other exceptions come back as a DataSourceError carrying the message
+    with pytest.raises(DataSourceError, match="unexpected"):
+        _quarter(year="2023")(replay)
+
+
+def test_identical_results_are_stored_once(tmp_path):
+    upstream = StubDataSource(get_profit_data=lambda **_: _profit("sh.600000", "2023", 1))
+    path = str(tmp_path / "session.zip")
+    recorder = RecordingDataSource(upstream, path)
+
+    for quarter in (1, 2, 3):
+        _quarter(quarter=quarter)(recorder)
+    _quarter(code="sh.600001")(recorder)
+    metrics = recorder.metrics()
+    recorder.close()
+
+    assert metrics["calls"] == 4 and metrics["frames"] == 1
+    with zipfile.ZipFile(path) as archive:
+        assert len([name for name in archive.namelist() if name.startswith("frames/")]) == 1
+    # Every call still replays, from the one shared frame
+    replay = ReplayDataSource(path)
+    assert _quarter(quarter=3)(replay) is _quarter(code="sh.600001")(replay)
+
+
+def test_the_archive_only_appears_once_closed(tmp_path):
+    upstream = StubDataSource(get_profit_data=_profit)
+    path = str(tmp_path / "session.zip")
+    recorder = RecordingDataSource(upstream, path)
+
+    _quarter()(recorder)
+    # Until close() everything goes to a temporary file next to the archive
+    assert not os.path.exists(path)
+    temporary = [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+    assert len(temporary) == 1
+
+    recorder.close()
+    recorder.close()
+    _quarter(year="2024")(recorder)
+
+    assert os.listdir(tmp_path) == ["session.zip"]
+    replay = ReplayDataSource(path)
+    assert replay.metrics()["recorded_calls"] == 1
@@ -0,0 +1,65 @@
+from datetime import date
+
+import pytest
+
+from src.services.report_periods import ReportPeriodIndex
+from tests.stubs import FakeClock
+
+TTL = 3600.0
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def index(clock):
+    return ReportPeriodIndex(ttl=TTL, max_lookback=6, clock=clock)
+
+
+@pytest.mark.parametrize("today,expected", [
+    # Q2 is past its 31 August deadline: it must be out, nothing older is needed
+    (date(2024, 9, 15), [(2024, 2)]),
+    # Q2 may be out already; Q1 is past its deadline
+    (date(2024, 8, 15), [(2024, 2), (2024, 1)]),
+    # Q1 and the annual report both run until 30 April
+    (date(2024, 4, 15), [(2024, 1), (2023, 4), (2023, 3)]),
+])
+def test_candidates_run_newest_first_to_the_newest_quarter_past_its_deadline(index, today, expected):
+    assert index.candidates("sh.600000", today) == expected
+
+
+def test_fallback_walks_back_past_the_empty_candidates(index):
+    today = date(2024, 8, 15)
+    tried = index.candidates("sh.600000", today)
+
+    assert index.fallback("sh.600000", tried, today) == [(2023, 4), (2023, 3), (2023, 2), (2023, 1)]
+    # A late filer found further back is asked for directly from then on
+    index.remember("sh.600000", (2023, 3))
+    assert index.candidates("sh.600000", today) == [(2023, 3)]
+    assert index.fallback("sh.600000", [(2023, 3)], today) == []
+
+
+def test_a_remembered_quarter_expires_after_the_ttl(index, clock):
+    today = date(2024, 8, 15)
+    index.remember("sh.600000", (2024, 2))
+
+    clock.advance(TTL - 1)
+    assert index.candidates("sh.600000", today) == [(2024, 2)]
+    clock.advance(1)
+    assert index.candidates("sh.600000", today) == [(2024, 2), (2024, 1)]
+    assert index.fallback("sh.600000", [(2024, 2), (2024, 1)], today)[0] == (2023, 4)
+    assert index.metrics() == {"codes": 1, "hits": 1, "misses": 1}
+
+
+def test_no_report_within_the_lookback_is_remembered_too(index, clock):
+    today = date(2024, 8, 15)
+    index.remember("bj.430047", None)
+
+    assert index.candidates("bj.430047", today) == []
+    assert index.fallback("bj.430047", [], today) == []
+    # Other codes are unaffected, and the answer is probed again once stale
+    assert index.candidates("sh.600000", today) == [(2024, 2), (2024, 1)]
+    clock.advance(TTL)
+    assert index.candidates("bj.430047", today) == [(2024, 2), (2024, 1)]
@@ -0,0 +1,200 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.caching.response_cache import DAY, DEFAULT_POLICIES, HOUR, CachePolicy, ResponseCacheDataSource
+from src.data_source_interface import DataSourceError
+from tests.stubs import FakeClock, StubDataSource, wait_for
+
+
+def _profit(code, year, quarter):
+    return pd.DataFrame({"code": [code], "statDate": [f"{year}-03-31"], "roeAvg": [0.1]})
+
+
+def test_scalar_arguments_are_keyed_as_text():
+    upstream = StubDataSource(get_profit_data=_profit)
+    cache = ResponseCacheDataSource(upstream)
+
+    cache.get_profit_data(code="sh.600000", year=2023, quarter=1)
+    cache.get_profit_data(code="sh.600000", year="2023", quarter="1")
+
+    assert upstream.count("get_profit_data") == 1
+    assert cache.metrics()["memory_hits"] == 1
+
+
+def test_callers_cannot_corrupt_the_cached_frame():
+    upstream = StubDataSource(get_profit_data=_profit)
+    cache = ResponseCacheDataSource(upstream)
+
+    first = cache.get_profit_data(code="sh.600000", year="2023", quarter=1)
+    first["roeAvg"] = first["roeAvg"] * 100
+    first.drop(columns="statDate", inplace=True)
+    second = cache.get_profit_data(code="sh.600000", year="2023", quarter=1)
+
+    assert list(second.columns) == ["code", "statDate", "roeAvg"]
+    assert second["roeAvg"].tolist() == [0.1]
+    assert second is not first
+
+
+def _index_members(date=None):
+    return pd.DataFrame({"updateDate": [date], "code": ["sh.600000"]})
+
+
+def _cached(upstream, clock, **kwargs):
+    return ResponseCacheDataSource(upstream, clock=clock, **kwargs)
+
+
+def test_open_period_results_expire_after_the_policy_ttl():
+    clock = FakeClock()
+    upstream = StubDataSource(get_profit_data=_profit)
+    cache = _cached(upstream, clock)
+    this_quarter = (date.today().year, (date.today().month - 1) // 3 + 1)
+    call = dict(code="sh.600000", year=str(this_quarter[0]), quarter=this_quarter[1])
+
+    cache.get_profit_data(**call)
+    clock.advance(HOUR - 1)
+    cache.get_profit_data(**call)
+    assert upstream.count() == 1
+
+    clock.advance(2)
+    cache.get_profit_data(**call)
+    assert upstream.count() == 2
+    assert cache.metrics()["expirations"] == 1
+
+
+def test_settled_periods_are_kept_forever():
+    clock = FakeClock()
+    upstream = StubDataSource(get_profit_data=_profit)
+    cache = _cached(upstream, clock)
+
+    cache.get_profit_data(code="sh.600000", year="2020", quarter=4)
+    clock.advance(365 * DAY)
+    cache.get_profit_data(code="sh.600000", year="2020", quarter=4)
+
+    assert upstream.count() == 1
+    assert cache.metrics()["memory_hits"] == 1
+
+
+def test_settle_days_delay_the_switch_to_immutable():
+    quarterly = DEFAULT_POLICIES["get_profit_data"]
+    q4_2023 = {"year": "2023", "quarter": 4}
+    # Annual reports may come out until the end of April
+    assert quarterly.ttl_for(q4_2023, date(2024, 4, 28)) == HOUR
+    assert quarterly.ttl_for(q4_2023, date(2024, 4, 30)) is None
+    constituents = DEFAULT_POLICIES["get_hs300_stocks"]
+    assert constituents.ttl_for({"date": "2024-06-03"}, date(2024, 6, 10)) == HOUR
+    assert constituents.ttl_for({"date": "2024-06-03"}, date(2024, 6, 11)) is None
+    # Today's list is never settled, whatever the date argument
+    assert constituents.ttl_for({"date": None}, date(2024, 6, 11)) == HOUR
+
+
+def test_methods_without_a_policy_pass_through():
+    upstream = StubDataSource(get_stock_industry=lambda **_: _index_members())
+    cache = ResponseCacheDataSource(upstream, policies={})
+
+    cache.get_stock_industry(code="sh.600000")
+    cache.get_stock_industry(code="sh.600000")
+
+    assert upstream.count() == 2
+    assert cache.metrics()["misses"] == 0
+
+
+def test_a_ttl_of_zero_disables_caching():
+    upstream = StubDataSource(get_trade_dates=lambda start_date=None, end_date=None: _index_members())
+    cache = ResponseCacheDataSource(upstream, policies={"get_trade_dates": CachePolicy(ttl=0)})
+
+    cache.get_trade_dates(start_date="2024-01-01", end_date="2024-12-31")
+    cache.get_trade_dates(start_date="2024-01-01", end_date="2024-12-31")
+
+    assert upstream.count() == 2
+
+
+def test_concurrent_identical_calls_make_one_upstream_call():
+    release = threading.Event()
+
+    def slow_profit(**kwargs):
+        release.wait(5)
+        return _profit(**kwargs)
+
+    upstream = StubDataSource(get_profit_data=slow_profit)
+    cache = ResponseCacheDataSource(upstream)
+    call = dict(code="sh.600000", year="2020", quarter=1)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        leader = pool.submit(cache.get_profit_data, **call)
+        wait_for(lambda: upstream.count() == 1)
+        followers = [pool.submit(cache.get_profit_data, **call) for _ in range(7)]
+        wait_for(lambda: cache.metrics()["coalesced"] == 7)
+        release.set()
+        frames = [leader.result(5)] + [future.result(5) for future in followers]
+
+    assert upstream.count() == 1
+    assert all(frame.equals(frames[0]) for frame in frames)
+    assert cache.metrics()["misses"] == 1
+
+
+def test_other_errors_are_not_cached():
+    failures = iter([DataSourceError("socket reset")])
+
+    def flaky_profit(**kwargs):
+        error = next(failures, None)
+        if error is not None:
+            raise error
+        return _profit(**kwargs)
+
+    upstream = StubDataSource(get_profit_data=flaky_profit)
+    cache = ResponseCacheDataSource(upstream)
+    call = dict(code="sh.600000", year="2020", quarter=1)
+
+    with pytest.raises(DataSourceError):
+        cache.get_profit_data(**call)
+    assert cache.get_profit_data(**call)["roeAvg"].tolist() == [0.1]
+    assert upstream.count() == 2
+
+
+def test_disk_tier_survives_a_restart(tmp_path):
+    upstream = StubDataSource(get_profit_data=_profit)
+    call = dict(code="sh.600000", year="2020", quarter=1)
+
+    ResponseCacheDataSource(upstream, disk_dir=str(tmp_path)).get_profit_data(**call)
+    restarted = ResponseCacheDataSource(upstream, disk_dir=str(tmp_path))
+    frame = restarted.get_profit_data(**call)
+
+    assert upstream.count() == 1
+    assert restarted.metrics()["disk_hits"] == 1
+    assert frame["code"].tolist() == ["sh.600000"]
+
+
+def test_a_disk_hit_keeps_its_stored_expiry_in_memory(tmp_path):
+    clock = FakeClock()
+    upstream = StubDataSource(get_profit_data=_profit)
+    this_quarter = (date.today().year, (date.today().month - 1) // 3 + 1)
+    call = dict(code="sh.600000", year=str(this_quarter[0]), quarter=this_quarter[1])
+
+    _cached(upstream, clock, disk_dir=str(tmp_path)).get_profit_data(**call)
+    clock.advance(HOUR - 10)
+    restarted = _cached(upstream, clock, disk_dir=str(tmp_path))
+    restarted.get_profit_data(**call)
+    assert restarted.metrics()["disk_hits"] == 1
+
+    # Ten seconds were left when it was read from disk, not a whole hour
+    clock.advance(20)
+    restarted.get_profit_data(**call)
+    assert upstream.count() == 2
+    assert restarted.metrics()["expirations"] == 1
+
+
+def test_memory_tier_evicts_least_recently_used_past_its_budget():
+    upstream = StubDataSource(get_profit_data=_profit)
+    one_frame = int(_profit("sh.600000", "2020", 1).memory_usage(index=True, deep=True).sum())
+    cache = ResponseCacheDataSource(upstream, memory_budget_bytes=2 * one_frame + one_frame // 2)
+
+    for code in ("sh.600000", "sh.600001", "sh.600000", "sh.600002"):
+        cache.get_profit_data(code=code, year="2020", quarter=1)
+    cache.get_profit_data(code="sh.600000", year="2020", quarter=1)
+
+    assert cache.metrics()["evictions"] == 1
+    assert upstream.count() == 3  # sh.600001 went, the recently used sh.600000 stayed
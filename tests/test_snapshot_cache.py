@@ -0,0 +1,116 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import pandas as pd
+
+from src.caching.snapshot_cache import SnapshotDataSource
+from tests.stubs import FakeClock, StubDataSource, wait_for
+
+TODAY = date.today().isoformat()
+PAST = (date.today() - timedelta(days=30)).isoformat()
+
+
+def _all_stock(date=None, **_):
+    return pd.DataFrame({"code": [f"sh.60000{i}" for i in range(8)], "tradeStatus": ["1"] * 8,
+                         "day": [date] * 8})
+
+
+def _industry(code=None, date=None, **_):
+    table = pd.DataFrame({"code": ["sh.600000", "sh.600004"], "industry": ["J66货币金融服务", "G56航空运输业"]})
+    return table if code is None else table[table["code"] == code].reset_index(drop=True)
+
+
+def test_past_dates_never_expire_and_evict_lru():
+    clock = FakeClock()
+    upstream = StubDataSource(get_all_stock=_all_stock)
+    snapshots = SnapshotDataSource(upstream, max_entries=2, clock=clock)
+    days = [(date.today() - timedelta(days=n)).isoformat() for n in (10, 11, 12)]
+
+    snapshots.get_all_stock(date=days[0])
+    clock.advance(365 * 86400)
+    snapshots.get_all_stock(date=days[0])
+    assert upstream.count() == 1
+
+    snapshots.get_all_stock(date=days[1])
+    snapshots.get_all_stock(date=days[0])
+    snapshots.get_all_stock(date=days[2])  # evicts days[1], the least recently used
+    snapshots.get_all_stock(date=days[0])
+    snapshots.get_all_stock(date=days[1])
+
+    assert upstream.count() == 4
+    assert snapshots.metrics()["evictions"] == 2
+
+
+def test_today_and_current_expire_after_the_ttl():
+    clock = FakeClock()
+    upstream = StubDataSource(get_all_stock=_all_stock)
+    snapshots = SnapshotDataSource(upstream, current_ttl=600, clock=clock)
+
+    for day in (None, TODAY):
+        snapshots.get_all_stock(date=day)
+        clock.advance(599)
+        snapshots.get_all_stock(date=day)
+    assert upstream.count() == 2
+
+    clock.advance(2)
+    snapshots.get_all_stock(date=None)
+    snapshots.get_all_stock(date=TODAY)
+    assert upstream.count() == 4
+    assert snapshots.metrics()["expirations"] == 2
+
+
+def test_concurrent_loads_of_one_snapshot_make_one_upstream_call():
+    release = threading.Event()
+
+    def slow_all_stock(**kwargs):
+        release.wait(5)
+        return _all_stock(**kwargs)
+
+    upstream = StubDataSource(get_all_stock=slow_all_stock)
+    snapshots = SnapshotDataSource(upstream)
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        futures = [pool.submit(snapshots.get_all_stock, date=PAST) for _ in range(6)]
+        wait_for(lambda: upstream.count() == 1)
+        release.set()
+        frames = [future.result(5) for future in futures]
+
+    assert upstream.count() == 1
+    assert all(len(frame) == 8 for frame in frames)
+    assert snapshots.metrics()["misses"] == 1
+
+
+def test_row_limits_are_cut_from_the_whole_snapshot():
+    upstream = StubDataSource(get_all_stock=_all_stock)
+    snapshots = SnapshotDataSource(upstream)
+
+    first = snapshots.get_all_stock(date=PAST, limit=3)
+    latest = snapshots.get_all_stock(date=PAST, limit=2, order="latest")
+
+    assert first["code"].tolist() == ["sh.600000", "sh.600001", "sh.600002"]
+    assert latest["code"].tolist() == ["sh.600006", "sh.600007"]
+    assert upstream.calls == [("get_all_stock", {"date": PAST, "limit": None, "order": "first"})]
+
+
+def test_industry_lookups_use_the_loaded_table():
+    upstream = StubDataSource(get_stock_industry=_industry)
+    snapshots = SnapshotDataSource(upstream)
+
+    # Before the table is loaded, a single code goes upstream
+    assert snapshots.get_stock_industry(code="sh.600004", date=PAST)["industry"].tolist() == ["G56航空运输业"]
+    snapshots.get_stock_industry(date=PAST)
+    assert snapshots.get_stock_industry(code="sh.600000", date=PAST)["industry"].tolist() == ["J66货币金融服务"]
+    # Codes missing from the table still ask upstream
+    assert snapshots.get_stock_industry(code="sz.000001", date=PAST).empty
+
+    assert [kwargs["code"] for _, kwargs in upstream.calls] == ["sh.600004", None, "sz.000001"]
+
+
+def test_callers_cannot_corrupt_the_snapshot():
+    snapshots = SnapshotDataSource(StubDataSource(get_all_stock=_all_stock))
+
+    frame = snapshots.get_all_stock(date=PAST)
+    frame.drop(columns="tradeStatus", inplace=True)
+
+    assert "tradeStatus" in snapshots.get_all_stock(date=PAST).columns
@@ -0,0 +1,116 @@
+import json
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.formatting.markdown_formatter import format_df_to_markdown, format_table_output
+
+
+def _legacy_display_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """The display frame the tabulate / to_csv / to_dict renderers were fed before table_renderer."""
+    display = df.copy()
+    for col in display.columns:
+        series = display[col]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            has_time = (series.dropna() != series.dropna().dt.normalize()).any()
+            display[col] = series.dt.strftime("%Y-%m-%d %H:%M:%S" if has_time else "%Y-%m-%d")
+    display = display.astype(object)
+    return display.where(display.notna(), None)
+
+
+def _cells(markdown: str) -> list:
+    """The stripped cells of a pipe table, header first, without the alignment row."""
+    lines = markdown.split("\n")
+    return [[cell.strip() for cell in re.split(r"(?<!\\)\|", line)[1:-1]] for line in lines[:1] + lines[2:]]
+
+
+@pytest.fixture
+def bars():
+    """Typed columns as they come out of the ingest step, with gaps in each kind."""
+    return pd.DataFrame({
+        "date": pd.to_datetime(["2024-06-11", "2024-06-12", None, "2024-06-14"]),
+        "time": pd.to_datetime(["2024-06-11 09:35:00", "2024-06-12 15:00:00", None, "2024-06-14 10:00:00"]),
+        "code": ["sh.600000", "sh.600000", None, "sz.000001"],
+        "code_name": ["浦发银行", "浦发银行", "", "平安银行"],
+        "close": [10.5, np.nan, 9.75, 11.25],
+        "volume": np.array([1200, 0, 3400, 56000], dtype=np.int64),
+        "adjustflag": pd.Categorical(["3", "3", None, "1"]),
+        "isST": pd.Categorical(["0", "1", "0", "0"]),
+    })
+
+
+def test_markdown_cells_match_the_previous_renderer(bars):
+    legacy = _legacy_display_frame(bars).to_markdown(index=False)
+
+    assert _cells(format_df_to_markdown(bars)) == _cells(legacy)
+    # Missing values of every dtype come out as empty cells
+    assert _cells(format_df_to_markdown(bars))[3] == ["", "", "", "", "9.75", "3400", "", "0"]
+
+
+def test_floats_keep_every_digit_where_tabulate_rounded_them():
+    df = pd.DataFrame({"amount": [123456.789, 11.0]})
+
+    assert _cells(_legacy_display_frame(df).to_markdown(index=False))[1:] == [["123457"], ["11"]]
+    assert _cells(format_df_to_markdown(df))[1:] == [["123456.789"], ["11.0"]]
+
+
+def test_markdown_escapes_pipes_and_newlines():
+    df = pd.DataFrame({"name|alias": ["A|B", "line one\nline two", "plain"], "value": [1, 2, 3]})
+
+    table = format_df_to_markdown(df)
+
+    assert table.split("\n") == [
+        "| name\\|alias | value |",
+        "|:---|---:|",
+        "| A\\|B | 1 |",
+        "| line one line two | 2 |",
+        "| plain | 3 |",
+    ]
+    # tabulate split these into extra columns and rows; every row keeps its two cells now
+    assert all(len(row) == 2 for row in _cells(table))
+
+
+def test_csv_and_json_match_the_previous_renderer(bars):
+    display = _legacy_display_frame(bars)
+
+    assert format_table_output(bars, format="csv") == display.to_csv(index=False)
+    payload = json.loads(format_table_output(bars, format="json"))
+    assert payload["data"] == json.loads(json.dumps(display.to_dict(orient="records"), ensure_ascii=False))
+    assert payload["meta"]["columns"] == list(bars.columns)
+
+
+def test_json_compact_rows_hold_the_json_records_in_column_order(bars):
+    compact = json.loads(format_table_output(bars, format="json_compact"))
+    records = json.loads(format_table_output(bars, format="json"))["data"]
+
+    assert compact["columns"] == list(bars.columns)
+    assert compact["rows"] == [[record[name] for name in compact["columns"]] for record in records]
+    assert compact["rows"][2] == [None, None, None, "", 9.75, 3400, None, "0"]
+    assert compact["meta"] == {"total_rows": 4, "returned_rows": 4, "truncated": False}
+
+
+@pytest.mark.parametrize("fmt", ["json", "json_compact"])
+def test_truncation_keeps_the_requested_end_and_reports_the_total(bars, fmt):
+    def payload(**kwargs):
+        return json.loads(format_table_output(bars, format=fmt, max_rows=2, **kwargs))
+
+    def dates(result):
+        return [row[0] for row in result["rows"]] if fmt == "json_compact" else [r["date"] for r in result["data"]]
+
+    assert dates(payload()) == ["2024-06-11", "2024-06-12"]
+    assert dates(payload(order="latest")) == [None, "2024-06-14"]
+    assert payload()["meta"]["total_rows"] == 4 and payload()["meta"]["truncated"] is True
+    # A result already cut at the data source doesn't know its full length
+    assert payload(exact_total=False)["meta"]["total_rows"] is None
+    whole = json.loads(format_table_output(bars, format=fmt, exact_total=False))
+    assert whole["meta"]["total_rows"] == 4
+
+
+def test_markdown_keeps_the_requested_end_after_the_meta_header(bars):
+    output = format_table_output(bars, max_rows=2, order="latest", meta={"code": "sh.600000"})
+
+    header, table = output.split("\n\n")
+    assert header == "Meta:\n- code: sh.600000"
+    assert [row[0] for row in _cells(table)[1:]] == ["", "2024-06-14"]
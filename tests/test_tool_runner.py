@@ -0,0 +1,22 @@
+from src.data_source_interface import NoDataFoundError
+from src.services.tool_runner import PROFILE_SEPARATOR, run_tool_with_handling
+
+
+def test_a_requested_profile_is_appended_to_the_output():
+    result = run_tool_with_handling(lambda: "| code |\n|---|", "get_stock_basic_info:sh.600000", profile=True)
+
+    assert isinstance(result, str)
+    output, report = result.split(f"\n\n{PROFILE_SEPARATOR}\n")
+    assert output == "| code |\n|---|"
+    assert report.startswith("Profile of get_stock_basic_info:sh.600000:")
+    assert "calling thread only" in report
+
+
+def test_errors_are_returned_as_text_with_or_without_a_profile():
+    def missing():
+        raise NoDataFoundError("nothing for sh.600000")
+
+    assert run_tool_with_handling(missing, "get_profit_data:sh.600000", profile=False) == \
+        "Error: nothing for sh.600000"
+    assert run_tool_with_handling(missing, "get_profit_data:sh.600000", profile=True).startswith(
+        f"Error: nothing for sh.600000\n\n{PROFILE_SEPARATOR}\n")